@@ -29,6 +29,19 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Tam metin arama altyapısı (PostgreSQL 'search_vector' kolonu, SQLite FTS5
+    tabloları) migration ile elle yönetilir; autogenerate bunlara dokunmasın.
+    """
+    if type_ == "column" and name == "search_vector":
+        return False
+    # FTS5 sanal tablosu ve gölge tabloları (notes_fts, notes_fts_data, ...)
+    if type_ == "table" and ("_fts" in name):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -53,6 +66,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -81,7 +95,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,30 @@
+"""Add note updated_at and keyset index
+
+Revision ID: 5b1e7c9d2a44
+Revises: 2c8c6f31a115
+Create Date: 2026-10-19 10:12:31.104522
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c9d2a44'
+down_revision: Union[str, Sequence[str], None] = '2c8c6f31a115'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notes', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_notes_user_id_id', 'notes', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notes_user_id_id', table_name='notes')
+    op.drop_column('notes', 'updated_at')
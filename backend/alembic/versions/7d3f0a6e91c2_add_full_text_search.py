@@ -0,0 +1,89 @@
+"""Add full text search indexes for notes and tasks
+
+Revision ID: 7d3f0a6e91c2
+Revises: 5b1e7c9d2a44
+Create Date: 2026-10-19 11:02:47.391870
+
+PostgreSQL: STORED üretilmiş 'search_vector' (tsvector) kolonu + GIN indeksi.
+SQLite: FTS5 external-content tabloları + senkronizasyon trigger'ları.
+İki durumda da indeks her yazmada veritabanı tarafından artımlı güncellenir.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3f0a6e91c2'
+down_revision: Union[str, Sequence[str], None] = '5b1e7c9d2a44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (tablo, başlık kolonu, metin kolonu)
+SEARCH_TABLES = [
+    ("notes", "title", "content"),
+    ("tasks", "title", "description"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    for table, title_col, body_col in SEARCH_TABLES:
+        if dialect == "postgresql":
+            op.execute(f"""
+                ALTER TABLE {table} ADD COLUMN search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple', coalesce({title_col}, '')), 'A') ||
+                    setweight(to_tsvector('simple', coalesce({body_col}, '')), 'B')
+                ) STORED
+            """)
+            op.execute(f"CREATE INDEX ix_{table}_search_vector ON {table} USING GIN (search_vector)")
+
+        elif dialect == "sqlite":
+            fts = f"{table}_fts"
+            op.execute(f"""
+                CREATE VIRTUAL TABLE {fts} USING fts5(
+                    {title_col}, {body_col}, content='{table}', content_rowid='id'
+                )
+            """)
+            op.execute(f"""
+                CREATE TRIGGER {table}_fts_ai AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts}(rowid, {title_col}, {body_col})
+                    VALUES (new.id, new.{title_col}, new.{body_col});
+                END
+            """)
+            op.execute(f"""
+                CREATE TRIGGER {table}_fts_ad AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {title_col}, {body_col})
+                    VALUES ('delete', old.id, old.{title_col}, old.{body_col});
+                END
+            """)
+            # Sadece aranan kolonlar değiştiğinde indeksi yeniden yaz
+            op.execute(f"""
+                CREATE TRIGGER {table}_fts_au AFTER UPDATE OF {title_col}, {body_col} ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {title_col}, {body_col})
+                    VALUES ('delete', old.id, old.{title_col}, old.{body_col});
+                    INSERT INTO {fts}(rowid, {title_col}, {body_col})
+                    VALUES (new.id, new.{title_col}, new.{body_col});
+                END
+            """)
+            op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    for table, _, _ in SEARCH_TABLES:
+        if dialect == "postgresql":
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.drop_column(table, "search_vector")
+
+        elif dialect == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
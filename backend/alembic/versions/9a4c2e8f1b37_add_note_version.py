@@ -0,0 +1,28 @@
+"""Add note version for delta updates
+
+Revision ID: 9a4c2e8f1b37
+Revises: 7d3f0a6e91c2
+Create Date: 2026-10-19 11:48:05.227614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4c2e8f1b37'
+down_revision: Union[str, Sequence[str], None] = '7d3f0a6e91c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notes', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('notes', 'version')
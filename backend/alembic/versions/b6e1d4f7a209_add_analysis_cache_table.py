@@ -0,0 +1,39 @@
+"""Add analysis cache table
+
+Revision ID: b6e1d4f7a209
+Revises: 9a4c2e8f1b37
+Create Date: 2026-10-19 12:31:52.806193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1d4f7a209'
+down_revision: Union[str, Sequence[str], None] = '9a4c2e8f1b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('analysis_cache',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('result', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('project_id')
+    )
+    op.create_index(op.f('ix_analysis_cache_id'), 'analysis_cache', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_analysis_cache_id'), table_name='analysis_cache')
+    op.drop_table('analysis_cache')
@@ -0,0 +1,53 @@
+"""Add analysis history and task updated_at
+
+Revision ID: c4f82a1e6d53
+Revises: b6e1d4f7a209
+Create Date: 2026-10-19 15:20:13.663091
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f82a1e6d53'
+down_revision: Union[str, Sequence[str], None] = 'b6e1d4f7a209'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_analyses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('risk_score', sa.Integer(), nullable=False),
+    sa.Column('performance_score', sa.Integer(), nullable=False),
+    sa.Column('sentiment', sa.String(), nullable=True),
+    sa.Column('summary', sa.Text(), nullable=False),
+    sa.Column('recommendations', sa.Text(), nullable=False),
+    sa.Column('task_ids', sa.Text(), nullable=False),
+    sa.Column('incremental', sa.Boolean(), nullable=False),
+    sa.Column('prompt_chars', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_project_analyses_id'), 'project_analyses', ['id'], unique=False)
+    op.create_index('ix_project_analyses_project_id_id', 'project_analyses', ['project_id', 'id'], unique=False)
+
+    op.add_column('tasks', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_tasks_project_id_updated_at', 'tasks', ['project_id', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_project_id_updated_at', table_name='tasks')
+    op.drop_column('tasks', 'updated_at')
+
+    op.drop_index('ix_project_analyses_project_id_id', table_name='project_analyses')
+    op.drop_index(op.f('ix_project_analyses_id'), table_name='project_analyses')
+    op.drop_table('project_analyses')
@@ -0,0 +1,41 @@
+"""Add project activity feed
+
+Revision ID: e5a7c3b90d12
+Revises: c4f82a1e6d53
+Create Date: 2026-10-19 18:42:07.215390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c3b90d12'
+down_revision: Union[str, Sequence[str], None] = 'c4f82a1e6d53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_activities',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('actor_id', sa.Integer(), nullable=True),
+    sa.Column('event', sa.String(length=40), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=True),
+    sa.Column('details', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_project_activities_project_id_id', 'project_activities', ['project_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_activities_project_id_id', table_name='project_activities')
+    op.drop_table('project_activities')
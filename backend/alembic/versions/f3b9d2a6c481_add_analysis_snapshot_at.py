@@ -0,0 +1,28 @@
+"""Add snapshot_at to project analyses
+
+Revision ID: f3b9d2a6c481
+Revises: e5a7c3b90d12
+Create Date: 2026-10-19 21:05:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d2a6c481'
+down_revision: Union[str, Sequence[str], None] = 'e5a7c3b90d12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('project_analyses', sa.Column('snapshot_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('project_analyses', 'snapshot_at')
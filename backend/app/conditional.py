@@ -0,0 +1,74 @@
+# backend/app/conditional.py
+"""
+Koşullu GET yanıtları (ETag / Last-Modified).
+
+ETag, kaynakların app/events.py'deki sürümlerinden üretilir; veritabanına gidilmeden
+hesaplanır. Sürümler invalidation bus ile worker'lar arasında aynı değeri taşıdığından
+bir worker'ın verdiği ETag diğerinde de eşleşir. Etiket kaynak anahtarlarını da içerir (örn. ("user", 5)), böylece
+aynı sürümdeki iki farklı kullanıcının kaynakları aynı ETag'i almaz; yanıtlar
+'Vary: Authorization' ile paylaşılan tarayıcı önbelleğinde de kullanıcıya göre ayrılır. Handler'lar yetki kontrolünden sonra, ana sorgudan ÖNCE
+check_not_modified() çağırır ve 304 dönerse onu döndürür.
+"""
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request, Response, status
+from typing import Optional
+
+from app.events import change_registry, ResourceKey
+
+
+def build_validators(*keys: ResourceKey) -> tuple[str, float]:
+    """Kaynak anahtarları ve sürümlerinden (zayıf) ETag ve son değişiklik zamanını üretir."""
+    versions = [change_registry.version(key) for key in keys]
+    tag = "-".join(f"{version:x}" for version, _ in versions)
+    # Kimlik: hangi kaynaklar (ve dolayısıyla hangi kullanıcı/proje) için üretildiği
+    identity = hashlib.blake2b(repr(keys).encode("utf-8"), digest_size=6).hexdigest()
+    last_modified = max(modified_at for _, modified_at in versions)
+    return f'W/"{identity}-{tag}"', last_modified
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Zayıf karşılaştırma: W/ öneki yok sayılır
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: float) -> bool:
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(last_modified) <= since
+
+
+def check_not_modified(request: Request, response: Response, *keys: ResourceKey) -> Optional[Response]:
+    """
+    Yanıta ETag/Last-Modified başlıklarını ekler. İstemcinin elindeki sürüm güncelse
+    gövdesiz 304 yanıtı döndürür, değilse None (handler normal devam eder).
+    If-None-Match varsa If-Modified-Since yok sayılır (RFC 9110).
+    """
+    etag, last_modified = build_validators(*keys)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        # Tarayıcı yanıtı saklayabilir ama her seferinde doğrulamalıdır
+        "Cache-Control": "private, no-cache",
+        # Yanıt istekteki kullanıcıya bağlıdır; paylaşılan tarayıcıda başka oturuma verilmemeli
+        "Vary": "Authorization",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        fresh = if_modified_since is not None and _not_modified_since(if_modified_since, last_modified)
+
+    if fresh:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    vary = headers.pop("Vary")
+    response.headers.update(headers)
+    response.headers.append("Vary", vary)
+    return None
@@ -0,0 +1,141 @@
+# backend/app/config.py
+
+import os
+from dotenv import load_dotenv
+
+# .env dosyasındaki değişkenleri yükler
+load_dotenv()
+
+# --- Çalıştırma ---
+# Uvicorn worker sayısı (Dockerfile'daki başlatma komutu da bunu kullanır)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# --- Not Otomatik Kaydetme ---
+# PATCH ile gelen not değişiklikleri bu süre (saniye) boyunca bellekte birleştirilip
+# tek seferde veritabanına yazılır. 0 verilirse her istek anında yazılır.
+# Birden fazla worker varsa varsayılan 0'dır: bir worker'ın belleğindeki değişikliği
+# diğerleri göremez (art arda PATCH'ler farklı worker'lara düşüp 409 alır).
+NOTE_AUTOSAVE_COALESCE_SECONDS = float(os.getenv("NOTE_AUTOSAVE_COALESCE_SECONDS", "2" if WEB_CONCURRENCY == 1 else "0"))
+
+# --- AI Analiz Önbelleği ---
+# Proje verisi (parmak izi) değişmediyse Gemini tekrar çağrılmaz.
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "256"))
+AI_CACHE_TTL_SECONDS = int(os.getenv("AI_CACHE_TTL_SECONDS", "3600"))
+# Açıksa sonuçlar 'analysis_cache' tablosuna da yazılır (yeniden başlatmada kaybolmaz)
+AI_CACHE_PERSIST = os.getenv("AI_CACHE_PERSIST", "false").lower() in ("1", "true", "yes")
+
+# --- Asenkron Analiz İşleri ---
+# Aynı anda yapılabilecek en fazla LLM çağrısı (işçi havuzu boyutu da budur)
+AI_MAX_CONCURRENT_CALLS = int(os.getenv("AI_MAX_CONCURRENT_CALLS", "4"))
+# Tamamlanan işlerin sonuçları bu süre (saniye) boyunca sorgulanabilir
+AI_JOB_TTL_SECONDS = int(os.getenv("AI_JOB_TTL_SECONDS", "900"))
+# Senkron analiz isteği, gateway'in en kötü çağrı süresine ek olarak bu kadar (kuyruk, DB) bekler; sonra 504
+AI_JOB_WAIT_MARGIN_SECONDS = float(os.getenv("AI_JOB_WAIT_MARGIN_SECONDS", "15"))
+
+# --- AI Prompt Boyutu ---
+# Proje verisi bu kadar token'ı (yaklaşık 4 karakter = 1 token) aşarsa düşük
+# öncelikli görevler tek tek gönderilmez, özet istatistik olarak gönderilir.
+AI_PROMPT_TOKEN_BUDGET = int(os.getenv("AI_PROMPT_TOKEN_BUDGET", "6000"))
+# Portföy analizinde tek istekte analiz edilebilecek en fazla proje
+AI_PORTFOLIO_MAX_PROJECTS = int(os.getenv("AI_PORTFOLIO_MAX_PROJECTS", "100"))
+
+# --- AI Sağlayıcı ---
+# 'gemini' (varsayılan) veya 'stub' (ağ kullanmayan, deterministik yerel sahte sağlayıcı)
+AI_PROVIDER = os.getenv("AI_PROVIDER", "gemini").lower()
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+# Stub sağlayıcının her çağrıda bekleyeceği süre (yük testleri için)
+AI_STUB_LATENCY_MS = int(os.getenv("AI_STUB_LATENCY_MS", "0"))
+
+# --- Artımlı (Incremental) Analiz ---
+# Son analizden beri değişen görevlerin oranı bunun altındaysa sadece değişenler
+# ve önceki özet gönderilir; üstündeyse tüm proje yeniden gönderilir.
+AI_INCREMENTAL_MAX_CHANGED_RATIO = float(os.getenv("AI_INCREMENTAL_MAX_CHANGED_RATIO", "0.5"))
+
+# --- AI Gateway (Hız Sınırı, Devre Kesici, Zaman Aşımı, Tekrar Deneme) ---
+AI_CALL_TIMEOUT_SECONDS = float(os.getenv("AI_CALL_TIMEOUT_SECONDS", "30"))
+AI_RATE_LIMIT_GLOBAL_PER_MINUTE = int(os.getenv("AI_RATE_LIMIT_GLOBAL_PER_MINUTE", "60"))
+AI_RATE_LIMIT_PROJECT_PER_MINUTE = int(os.getenv("AI_RATE_LIMIT_PROJECT_PER_MINUTE", "6"))
+# Hız sınırına takılan çağrı en fazla bu kadar bekler, sonra yedek yanıta düşer
+AI_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("AI_RATE_LIMIT_MAX_WAIT_SECONDS", "5"))
+# Art arda bu kadar hata olursa devre açılır ve çağrılar AI_BREAKER_RESET_SECONDS boyunca hemen reddedilir
+AI_BREAKER_FAILURE_THRESHOLD = int(os.getenv("AI_BREAKER_FAILURE_THRESHOLD", "5"))
+AI_BREAKER_RESET_SECONDS = float(os.getenv("AI_BREAKER_RESET_SECONDS", "30"))
+# Çağrı başına en fazla deneme; tekrar denemeler toplam çağrıların bu oranını aşamaz
+AI_RETRY_MAX_ATTEMPTS = int(os.getenv("AI_RETRY_MAX_ATTEMPTS", "2"))
+AI_RETRY_BUDGET_RATIO = float(os.getenv("AI_RETRY_BUDGET_RATIO", "0.2"))
+AI_RETRY_BACKOFF_SECONDS = float(os.getenv("AI_RETRY_BACKOFF_SECONDS", "0.5"))
+
+# --- Servis Önbelleği ---
+# "memory" (süreç içi LRU/TTL) veya "redis" (paylaşımlı; 'redis' paketi ve SERVICE_CACHE_REDIS_URL gerekir)
+SERVICE_CACHE_BACKEND = os.getenv("SERVICE_CACHE_BACKEND", "memory")
+SERVICE_CACHE_REDIS_URL = os.getenv("SERVICE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+SERVICE_CACHE_MAX_ENTRIES = int(os.getenv("SERVICE_CACHE_MAX_ENTRIES", "10000"))
+SERVICE_CACHE_DEFAULT_TTL_SECONDS = int(os.getenv("SERVICE_CACHE_DEFAULT_TTL_SECONDS", "300"))
+
+# --- Worker'lar Arası Önbellek Geçersiz Kılma ---
+# "auto": PostgreSQL'de LISTEN/NOTIFY, diğer veritabanlarında süreç içi; "postgres", "local" veya "off"
+INVALIDATION_BUS = os.getenv("INVALIDATION_BUS", "auto")
+INVALIDATION_BUS_CHANNEL = os.getenv("INVALIDATION_BUS_CHANNEL", "pm_invalidation")
+
+# --- Hızlı JSON ---
+# Büyük liste endpoint'leri (görevler, projeler) satırları doğrudan kolon tuple'larından
+# üretip orjson ile yazar. 'false' verilirse response_model (Pydantic) yoluna dönülür.
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "true").lower() == "true"
+
+# --- Yanıt Sıkıştırma ---
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+# Bu boyutun (bayt) altındaki yanıtlar sıkıştırılmaz (küçük gövdelerde kazanç yok, CPU maliyeti var)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# 1 (hızlı) - 9 (küçük); brotli kuruluysa onun için de aynı seviye kullanılır (0-11)
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+# Sıkıştırılacak içerik tipleri (virgülle). SSE/NDJSON akışları listede yoktur ve hiçbir zaman tamponlanmaz.
+COMPRESSION_CONTENT_TYPES = [
+    t.strip() for t in os.getenv(
+        "COMPRESSION_CONTENT_TYPES", "application/json,text/plain,text/html,text/css,application/javascript"
+    ).split(",") if t.strip()
+]
+# ETag'li yanıtların sıkıştırılmış hali bu boyuta (bayt) kadar bellekte tutulur
+COMPRESSION_CACHE_MAX_BYTES = int(os.getenv("COMPRESSION_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# --- Metrikler ---
+# GET /metrics (Prometheus metin formatı). Token verilirse 'Authorization: Bearer <token>' istenir;
+# verilmezse endpoint sadece sistem yöneticilerinin (ADMIN_EMAILS) JWT'siyle açılır.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# --- İstek Profilleme ---
+# Kapalıyken middleware hiç eklenmez (sıfır maliyet)
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+# 'X-Profile: <token>' başlığı taşıyan istekler profillenir (boşsa başlıkla tetikleme kapalı)
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+# İsteklerin bu oranı (0.0 - 1.0) rastgele profillenir
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+PROFILING_DIR = os.getenv("PROFILING_DIR", "profiles")
+# En fazla bu kadar profil saklanır; eskiler silinir
+PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", "200"))
+# Sistem yöneticileri (virgülle e-posta listesi): profil listeleme/indirme gibi yönetim endpoint'leri
+ADMIN_EMAILS = [e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()]
+
+# --- Hız Sınırlama ---
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# Kurallar ';' ile ayrılır: '<METODLAR> <YOL> <kapsam>=<istek>/<saniye> ...'
+#   METODLAR: virgüllü liste (POST,PUT), WRITE (POST,PUT,PATCH,DELETE) veya *
+#   YOL: tam yol ya da '*' ile biten önek; kapsam: ip veya user (JWT'deki kullanıcı)
+# İsteğe uyan ilk kural uygulanır; kuraldaki tüm kapsamların kovasında jeton olmalıdır.
+RATE_LIMIT_RULES = os.getenv(
+    "RATE_LIMIT_RULES",
+    "POST /api/auth/login ip=10/60; POST /api/auth/register ip=5/300; WRITE /api/* user=120/60 ip=600/60",
+)
+# "memory" (süreç içi; worker başına ayrı sayaç) veya "redis" (tüm worker'lar ortak; 'redis' paketi gerekir)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", SERVICE_CACHE_REDIS_URL)
+# Bellekte en fazla bu kadar kova tutulur; dolmuş (boşta) kovalar periyodik olarak silinir
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+RATE_LIMIT_SWEEP_SECONDS = float(os.getenv("RATE_LIMIT_SWEEP_SECONDS", "60"))
+# 'true' ise istemci IP'si X-Forwarded-For'un ilk değerinden alınır (sadece güvenilir bir proxy arkasında)
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+# Sınırlanmayan istemci adresleri (virgülle), örn. testlerde Starlette TestClient'ın adresi 'testclient'
+RATE_LIMIT_EXEMPT_CLIENTS = [
+    c.strip() for c in os.getenv("RATE_LIMIT_EXEMPT_CLIENTS", "").split(",") if c.strip()
+]
@@ -5,6 +5,8 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
+from app.events import change_registry
+from app.metrics import install_engine_metrics
 
 # .env dosyasındaki değişkenleri yükler
 load_dotenv()
@@ -16,8 +18,14 @@ if SQLALCHEMY_DATABASE_URL is None:
 
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
+# SQL ifade sayısı/süresi ve havuz durumu /metrics'te görünür
+install_engine_metrics(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Commit edilen değişiklikler kaynak sürümlerini (ETag) artırır, bkz. app/events.py
+change_registry.install(SessionLocal)
+
 Base = declarative_base()
 
 # Dependency: Her request için DB session'ı sağlar
@@ -0,0 +1,156 @@
+# backend/app/events.py
+"""
+Değişiklik kaydı (change registry).
+
+Her kaynak için (örn. ("project", 5), ("project_tasks", 5), ("user_notes", 3))
+bir sürüm sayacı tutar. Sayaçlar SQLAlchemy olaylarıyla güncellenir:
+  - after_flush   : session'daki yeni/değişen/silinen nesnelerden etkilenen kaynaklar toplanır,
+  - after_commit  : toplanan kaynakların sürümü artırılır ve aboneler bilgilendirilir,
+  - after_rollback: toplanan kaynaklar atılır.
+Toplu (query.update) yazmalar flush olayı üretmez; bunlar için mark() kullanılır.
+
+Sürümler sayaç değil, değişikliğin zaman sıralı ve benzersiz kimliğidir. Invalidation bus
+değişikliği aynı sürüm değeriyle diğer worker'lara taşır (apply); böylece aynı veri her
+worker'da aynı ETag'i üretir.
+"""
+import secrets
+import threading
+import time
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+ResourceKey = Tuple[str, int]
+
+# Tüm kullanıcı profilleri için tek anahtar: proje/üye yanıtları kullanıcı bilgisi içerir
+ALL_USERS: ResourceKey = ("users", 0)
+
+_SESSION_KEY = "changed_resources"
+
+
+def _new_version() -> int:
+    """Zaman sıralı, worker'lar arasında çakışmayan sürüm: nanosaniye zamanı + rastgele bitler."""
+    return (time.time_ns() << 16) | secrets.randbits(16)
+
+
+def _resources_for(obj) -> List[ResourceKey]:
+    """Bir ORM nesnesindeki değişikliğin hangi kaynakları etkilediğini döndürür."""
+    table = getattr(obj, "__tablename__", None)
+    if table == "projects":
+        return [("project", obj.id)]
+    if table == "project_members":
+        return [("project", obj.project_id), ("user_projects", obj.user_id)]
+    if table == "tasks":
+        return [("project_tasks", obj.project_id)]
+    if table == "users":
+        return [("user", obj.id), ALL_USERS]
+    if table == "notes":
+        return [("user_notes", obj.user_id), ("note", obj.id)]
+    if table == "project_activities":
+        return [("project_activity", obj.project_id)]
+    return []
+
+
+class ChangeRegistry:
+    """
+    Kaynak sürümleri. Bu süreçte veya (bus üzerinden) başka bir worker'da değişen kaynak,
+    değişikliğin sürüm değerini taşır. Hiç değişmemiş kaynakların sürümü worker'a özgü
+    'base' değeridir; açılışta ve mesaj kaçmış olabileceğinde (reset) yenilenir, böylece
+    o aradaki değişiklikleri görmemiş eski ETag'ler eşleşmez.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.base = _new_version()
+        self._lock = threading.Lock()
+        # kaynak -> (sürüm, değişiklik zamanı)
+        self._versions: Dict[ResourceKey, Tuple[int, float]] = {}
+        self._subscribers: List[Callable[[Set[ResourceKey]], None]] = []
+
+    def version(self, key: ResourceKey) -> Tuple[int, float]:
+        """(sürüm, son değişiklik zamanı). Hiç değişmemiş kaynaklar için (base, açılış zamanı)."""
+        return self._versions.get(key, (self.base, self.started_at))
+
+    def bump(self, keys: Iterable[ResourceKey], notify: bool = True) -> None:
+        keys = set(keys)
+        if not keys:
+            return
+        now = time.time()
+        with self._lock:
+            version = _new_version()
+            for key in keys:
+                current = self._versions.get(key, (self.base, self.started_at))[0]
+                self._versions[key] = (max(version, current + 1), now)
+            subscribers = list(self._subscribers) if notify else []
+        self._notify(subscribers, keys)
+
+    def apply(self, changes: Iterable[Tuple[ResourceKey, int, float]]) -> None:
+        """
+        Başka bir worker'daki değişiklikleri (kaynak, sürüm, zaman) aynı sürümle uygular.
+        Sadece bilinenden yeni sürümler alınır; mesajlar sırasız gelse de worker'lar
+        aynı son sürümde buluşur.
+        """
+        changed: Set[ResourceKey] = set()
+        with self._lock:
+            for key, version, changed_at in changes:
+                if version > self._versions.get(key, (self.base, self.started_at))[0]:
+                    self._versions[key] = (version, changed_at)
+                    changed.add(key)
+            subscribers = list(self._subscribers) if changed else []
+        self._notify(subscribers, changed)
+
+    def reset(self) -> None:
+        """Tüm ETag'leri geçersiz kılar (kaçırılmış olabilecek değişiklikler için)."""
+        with self._lock:
+            self._versions.clear()
+            self.base = _new_version()
+            self.started_at = time.time()
+
+    def subscribe(self, callback: Callable[[Set[ResourceKey]], None]) -> None:
+        """Commit sonrası değişen kaynak kümesiyle çağrılacak fonksiyonu kaydeder."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def mark(self, session: Session, *keys: ResourceKey) -> None:
+        """Flush olayı üretmeyen yazmalar için kaynakları commit sonrası artırılmak üzere işaretler."""
+        session.info.setdefault(_SESSION_KEY, set()).update(keys)
+
+    @staticmethod
+    def _notify(subscribers: List[Callable[[Set[ResourceKey]], None]], keys: Set[ResourceKey]) -> None:
+        for callback in subscribers:
+            try:
+                callback(keys)
+            except Exception as e:
+                print(f"Değişiklik aboneliği hatası: {e}")
+
+    # --- SQLAlchemy olayları ---
+
+    def install(self, session_factory) -> None:
+        event.listen(session_factory, "after_flush", self._after_flush)
+        event.listen(session_factory, "after_commit", self._after_commit)
+        event.listen(session_factory, "after_rollback", self._after_rollback)
+
+    def _after_flush(self, session: Session, flush_context) -> None:
+        changed: Set[ResourceKey] = session.info.setdefault(_SESSION_KEY, set())
+        for obj in session.new:
+            changed.update(_resources_for(obj))
+        for obj in session.deleted:
+            changed.update(_resources_for(obj))
+        for obj in session.dirty:
+            if session.is_modified(obj, include_collections=False):
+                changed.update(_resources_for(obj))
+                # Görev başka projeye taşındıysa eski projenin listesi de değişir
+                if getattr(obj, "__tablename__", None) == "tasks":
+                    previous = inspect(obj).attrs.project_id.history.deleted
+                    changed.update(("project_tasks", pid) for pid in previous if pid is not None)
+
+    def _after_commit(self, session: Session) -> None:
+        changed: Optional[Set[ResourceKey]] = session.info.pop(_SESSION_KEY, None)
+        if changed:
+            self.bump(changed)
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(_SESSION_KEY, None)
+
+
+change_registry = ChangeRegistry()
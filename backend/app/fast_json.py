@@ -0,0 +1,126 @@
+# backend/app/fast_json.py
+"""
+Büyük liste yanıtları için hızlı JSON yolu.
+
+Normal yolda FastAPI, ORM nesnelerini response_model (Pydantic) ile doğrular ve
+standart json ile yazar. Bu modülle endpoint'ler (isteğe bağlı olarak) satırları
+doğrudan SQLAlchemy kolon tuple'larından sözlük olarak üretir ve orjson ile yazar.
+Çıktı response_model çıktısıyla aynıdır (alan adları ve sırası şemadan alınır).
+orjson kurulu değilse standart json kullanılır.
+
+Liste endpoint'leri 'fields=id,title,status' sorgu parametresiyle alan seçimini destekler
+(select_fields): hem SELECT edilen kolonlar hem de yanıt sadece istenen alanlarla sınırlanır.
+"""
+import enum
+import json
+from datetime import date, datetime
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from typing import Any, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple, Type
+
+from app.config import FAST_JSON_RESPONSES
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - requirements.txt içinde var
+    orjson = None
+
+# Endpoint'ler bu bayrağa bakar (testlerde/karşılaştırmada kapatılabilir)
+enabled = FAST_JSON_RESPONSES
+
+
+def _default(value: Any):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemiyor")
+
+
+def dumps(data: Any) -> bytes:
+    """Veriyi kompakt UTF-8 JSON'a çevirir (Starlette JSONResponse ile aynı biçim)."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(data: Any, response: Optional[Response] = None) -> FastJSONResponse:
+    """
+    Hazır veriyi doğrudan döndürür (response_model doğrulaması atlanır).
+    'response' verilirse handler'da ona eklenen başlıklar (örn. ETag) taşınır.
+    """
+    result = FastJSONResponse(data)
+    if response is not None:
+        for key, value in response.headers.items():
+            if key != "content-length":
+                result.headers[key] = value
+    return result
+
+
+class ColumnProjection:
+    """
+    Bir Pydantic şemasının alanlarını SQLAlchemy kolonlarına eşler.
+    Alan adı model kolonuyla aynıysa otomatik bulunur; farklıysa 'overrides' ile verilir.
+    """
+
+    def __init__(self, schema: Type[BaseModel], model, exclude: Sequence[str] = (), **overrides):
+        self.schema = schema
+        self.fields = tuple(name for name in schema.model_fields if name not in exclude)
+        self.columns = tuple(overrides.get(name, getattr(model, name, None)) for name in self.fields)
+        missing = [name for name, column in zip(self.fields, self.columns) if column is None]
+        if missing:
+            raise ValueError(f"{schema.__name__} için kolon bulunamadı: {missing}")
+        self._subsets = {}
+
+    def subset(self, fields: Iterable[str]) -> "ColumnProjection":
+        """
+        Sadece verilen alanları (şema sırasında) içeren projeksiyon. 'id' her zaman dahildir
+        (istemci listeleri id ile anahtarlar). Aynı alan kümesi için aynı nesne döner.
+        """
+        key = frozenset(fields) | ({"id"} & set(self.fields))
+        unknown = key - set(self.fields)
+        if unknown:
+            raise ValueError(f"Bilinmeyen alan(lar): {', '.join(sorted(unknown))}")
+        projection = self._subsets.get(key)
+        if projection is None:
+            projection = object.__new__(ColumnProjection)
+            projection.schema = self.schema
+            pairs = [(name, column) for name, column in zip(self.fields, self.columns) if name in key]
+            projection.fields = tuple(name for name, _ in pairs)
+            projection.columns = tuple(column for _, column in pairs)
+            projection._subsets = {}
+            self._subsets[key] = projection
+        return projection
+
+    def to_dicts(self, rows: Iterable[Sequence]) -> List[dict]:
+        """Sorgu satırlarını (bu projeksiyonun kolonlarıyla başlayan) şema sırasında sözlüklere çevirir."""
+        names = self.fields
+        return [dict(zip(names, row)) for row in rows]
+
+
+def select_fields(projection: ColumnProjection, fields: Optional[str],
+                  extra: Sequence[str] = ()) -> Tuple[ColumnProjection, Set[str]]:
+    """
+    'fields' sorgu parametresini (virgülle alan listesi) çözer.
+    (kolon projeksiyonu, istenen ek alanlar) döndürür; 'extra' kolon olmayan, ayrı
+    yüklenen alanlardır (örn. projelerde 'memberships'). Parametre yoksa tüm alanlar.
+    Bilinmeyen alan adında 400 döner.
+    """
+    if fields is None:
+        return projection, set(extra)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    extras = requested & set(extra)
+    try:
+        return projection.subset(requested - extras), extras
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{e}. Geçerli alanlar: {', '.join(projection.fields + tuple(extra))}",
+        )
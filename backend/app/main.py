@@ -1,5 +1,6 @@
 # backend/app/main.py
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 # CORS Middleware'ini import ediyoruz
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,9 +9,40 @@ from fastapi.middleware.cors import CORSMiddleware
 # YENİ: 'analysis' buraya eklendi
 from app.routers import auth, projects, tasks, users, notes, analysis 
 
-from app.routers import auth, projects, tasks, users, notes, analysis, notifications
+from app.routers import auth, projects, tasks, users, notes, analysis, notifications, search, system, metrics
 
-app = FastAPI(title="Proje Yönetim Sistemi API")
+from app.services.note_service import note_write_buffer
+from app.services.analysis_jobs import analysis_jobs
+from app.services.invalidation_bus import invalidation_bus
+from app.middleware.compression import CompressionMiddleware, response_compressor
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware, rate_limiter
+from app.middleware.profiling import ProfilingMiddleware, profile_store
+from app.config import PROFILING_ENABLED
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Diğer worker'lardaki commit'ler bu worker'ın önbelleklerini/ETag'lerini geçersiz kılar
+    invalidation_bus.start()
+    yield
+    invalidation_bus.stop()
+    # Kapanışta bellekte birleştirilmiş (henüz yazılmamış) not değişikliklerini kaybetme
+    note_write_buffer.flush_all()
+    analysis_jobs.shutdown()
+
+
+app = FastAPI(title="Proje Yönetim Sistemi API", lifespan=lifespan)
+
+# Büyük JSON yanıtları (görev/proje listeleri, notlar) sıkıştırılır; ayarlar config.py'de
+app.add_middleware(CompressionMiddleware, compressor=response_compressor)
+# Giriş/kayıt ve yazma istekleri için hız sınırı; 429'lar sıkıştırma ve uygulama işine girmez
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+# Sıkıştırmanın dışında: süre ölçümü sıkıştırma dahil yanıtın tamamını kapsar
+app.add_middleware(MetricsMiddleware)
+# İsteğe bağlı profilleme; kapalıyken hiç eklenmez
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, store=profile_store)
 
 # --- YENİ EKLENEN BÖLÜM: CORS YAPILANDIRMASI ---
 
@@ -39,6 +71,9 @@ app.include_router(users.router)    # /api/users/... endpoint'leri
 app.include_router(notes.router)    # /api/notes/... endpoint'leri
 app.include_router(analysis.router) # YENİ: /api/projects/{id}/analyze endpoint'i
 app.include_router(notifications.router)
+app.include_router(search.router)    # /api/search endpoint'i
+app.include_router(system.router)    # /api/system/... (metrikler)
+app.include_router(metrics.router)   # /metrics (Prometheus)
 
 # Ana karşılama endpoint'i
 @app.get("/")
@@ -0,0 +1,393 @@
+# backend/app/metrics.py
+"""
+Prometheus metin formatında metrikler (harici bağımlılık yok).
+
+Sayaçlar/histogramlar etiket değerleri başına bir "child" nesnesi tutar. Kayıt sırasında
+kilit alınmaz: her thread kendi shard'ına yazar, değerler okuma anında toplanır.
+Çıktı GET /metrics ile alınır (bkz. app/routers/metrics.py).
+"""
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Saniye cinsinden varsayılan histogram sınırları (HTTP/DB/LLM süreleri için)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+# --- METRİK TİPLERİ ---
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Metriğin Prometheus metin satırları (HELP/TYPE başlığı dahil)."""
+
+
+class _LabeledMetric(_Metric):
+    """Etiket değerleri başına bir child tutan metrikler (Counter, Gauge, Histogram)."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[LabelValues, object] = {}
+        # Verildiği haliyle etiket tuple'ı -> child (örn. status=200 int olarak verilse de)
+        self._lookup: Dict[tuple, object] = {}
+
+    def labels(self, *values) -> object:
+        child = self._lookup.get(values)
+        if child is None:
+            child = self._create_child(values)
+        return child
+
+    def _create_child(self, values: tuple) -> object:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name}: {len(self.labelnames)} etiket bekleniyor, {len(values)} verildi")
+        key = tuple(str(v) for v in values)
+        with self._lock:
+            child = self._children.setdefault(key, self._new_child())
+            self._lookup[values] = child
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> object:
+        ...
+
+    def _default(self):
+        # Etiketsiz metrikler için tek child
+        return self.labels()
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for values, child in sorted(list(self._children.items())):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: LabelValues, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.get())}"]
+
+
+class _ShardOwner:
+    """Thread-local'de shard'ın yanında tutulur; thread bitince toplanır ve shard emekliye ayrılır."""
+    __slots__ = ("__weakref__",)
+
+
+class _Sharded:
+    """
+    Her thread kendi sayaç listesine (shard) yazar; kilit yalnızca thread'in ilk
+    kaydında alınır. Okuma (scrape) anında tüm shard'lar toplanır.
+    Thread sonlanınca (Timer, AI akışı, boşta kapanan havuz thread'leri) shard'ı ortak
+    tabana eklenip listeden çıkarılır; shard sayısı yaşayan thread sayısıyla sınırlı kalır.
+    """
+    __slots__ = ("_local", "_shards", "_base", "_lock", "_width")
+
+    def __init__(self, width: int):
+        self._local = threading.local()
+        # id(shard) -> shard
+        self._shards: Dict[int, list] = {}
+        self._base = [0] * width
+        self._lock = threading.Lock()
+        self._width = width
+
+    def _new_shard(self) -> list:
+        shard = [0] * self._width
+        owner = _ShardOwner()
+        with self._lock:
+            self._shards[id(shard)] = shard
+        weakref.finalize(owner, self._retire, shard)
+        self._local.owner = owner
+        self._local.shard = shard
+        return shard
+
+    def _retire(self, shard: list) -> None:
+        with self._lock:
+            if self._shards.pop(id(shard), None) is not None:
+                for i, value in enumerate(shard):
+                    self._base[i] += value
+
+    def _totals(self) -> list:
+        with self._lock:
+            shards = list(self._shards.values())
+            totals = list(self._base)
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class _ValueChild(_Sharded):
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[0] += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def get(self) -> float:
+        return self._totals()[0]
+
+
+class Counter(_LabeledMetric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _ValueChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+
+class Gauge(_LabeledMetric):
+    """Artırılıp azaltılan gauge (örn. işlenen istek sayısı). Okunan değerler için GaugeFunction."""
+    kind = "gauge"
+
+    def _new_child(self):
+        return _ValueChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+
+class _HistogramChild(_Sharded):
+    __slots__ = ("_bounds",)
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        # Kovalar + son kova +Inf (sınırların hepsinden büyük değerler) + toplam
+        super().__init__(len(bounds) + 2)
+        self._bounds = bounds
+
+    def observe(self, value: float) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[bisect_left(self._bounds, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        totals = self._totals()
+        return totals[:-1], totals[-1]
+
+
+class Histogram(_LabeledMetric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self, *label_values) -> "_Timer":
+        """'with histogram.time(...):' bloğunun süresini kaydeder."""
+        return _Timer(self.labels(*label_values))
+
+    def _render_child(self, values: LabelValues, child) -> List[str]:
+        counts, total = child.snapshot()
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("_child", "_started")
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._started)
+        return False
+
+
+class GaugeFunction(_Metric):
+    """Değeri okuma anında bir fonksiyondan alınan gauge (örn. bağlantı havuzu)."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 function: Callable[[], Dict[LabelValues, float]]):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        try:
+            values = self.function()
+        except Exception as e:
+            print(f"Metrik okunamadı ({self.name}): {e}")
+            return lines
+        for label_values, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, label_values)} {_format_value(value)}")
+        return lines
+
+
+# --- KAYIT DEFTERİ ---
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = "pm_"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"'{metric.name}' metriği farklı tip/etiketlerle zaten kayıtlı")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register_with_default(Counter(self.prefix + name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register_with_default(Gauge(self.prefix + name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register_with_default(Histogram(self.prefix + name, documentation, labelnames, buckets))
+
+    def _register_with_default(self, metric: _LabeledMetric) -> _LabeledMetric:
+        metric = self._register(metric)
+        # Etiketsiz metrikler hiç kayıt olmasa da 0 değeriyle görünsün
+        if not metric.labelnames:
+            metric.labels()
+        return metric
+
+    def gauge_function(self, name: str, documentation: str, labelnames: Sequence[str],
+                       function: Callable[[], Dict[LabelValues, float]]) -> GaugeFunction:
+        return self._register(GaugeFunction(self.prefix + name, documentation, labelnames, function))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+# --- UYGULAMA METRİKLERİ ---
+
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds", "HTTP istek süresi (route şablonu bazında).", ("method", "route", "status"))
+HTTP_IN_FLIGHT = metrics.gauge("http_requests_in_flight", "İşlenmekte olan HTTP istekleri.", ("method",))
+
+DB_STATEMENTS = metrics.counter("db_statements_total", "Çalıştırılan SQL ifadeleri.", ("operation",))
+DB_STATEMENT_SECONDS = metrics.histogram(
+    "db_statement_duration_seconds", "SQL ifadesi süresi.", ("operation",),
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+
+PASSWORD_HASH_SECONDS = metrics.histogram(
+    "auth_password_hash_duration_seconds", "bcrypt hash/doğrulama süresi.", ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0))
+
+NOTIFICATIONS_CREATED = metrics.counter("notifications_created_total", "Oluşturulan bildirimler.")
+
+LLM_CALL_SECONDS = metrics.histogram(
+    "llm_call_duration_seconds", "Sağlayıcıya yapılan LLM çağrısı süresi (deneme başına).", ("provider", "outcome"))
+LLM_CALLS = metrics.counter(
+    "llm_calls_total", "LLM çağrı sonuçları (success, failure, timeout, rate_limited, short_circuited).",
+    ("provider", "outcome"))
+
+RATE_LIMITED_REQUESTS = metrics.counter(
+    "rate_limited_requests_total", "Hız sınırına takılıp 429 alan istekler.", ("rule", "scope"))
+
+_SQL_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK"})
+
+
+def install_engine_metrics(engine) -> None:
+    """SQL ifade sayısı/süresi ve bağlantı havuzu metriklerini bir engine'e bağlar."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_started"].pop()
+        operation = (statement[:16].split(None, 1) or ("",))[0].upper()
+        if operation not in _SQL_OPERATIONS:
+            operation = "OTHER"
+        DB_STATEMENTS.labels(operation).inc()
+        DB_STATEMENT_SECONDS.labels(operation).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # Hatalı ifadelerde after_cursor_execute çağrılmaz; başlangıç zamanını at
+        conn = context.connection
+        if conn is not None and conn.info.get("metrics_started"):
+            conn.info["metrics_started"].pop()
+
+    def pool_stats() -> Dict[LabelValues, float]:
+        pool = engine.pool
+        data = {}
+        for state in ("size", "checkedin", "checkedout", "overflow"):
+            reader = getattr(pool, state, None)
+            if reader is not None:
+                data[(state,)] = reader()
+        return data
+
+    metrics.gauge_function("db_pool_connections", "Bağlantı havuzu durumu.", ("state",), pool_stats)
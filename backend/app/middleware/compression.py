@@ -0,0 +1,244 @@
+"""
+Yanıt sıkıştırma middleware'i (saf ASGI).
+
+- Sadece izin verilen içerik tipleri ve COMPRESSION_MIN_SIZE üzerindeki gövdeler sıkıştırılır.
+- Tek parça (tamamı bilinen) yanıtlar sıkıştırılır; birden çok parçayla gelen akışlar
+  (SSE, NDJSON, StreamingResponse) tamponlanmadan olduğu gibi iletilir.
+- ETag taşıyan yanıtların sıkıştırılmış hali bellekte tutulur: aynı kaynak aynı
+  sürümdeyken (aynı ETag) tekrar istendiğinde yeniden sıkıştırılmaz.
+- brotli paketi kuruluysa 'br', değilse sadece 'gzip' sunulur.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import (
+    COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE, COMPRESSION_LEVEL,
+    COMPRESSION_CONTENT_TYPES, COMPRESSION_CACHE_MAX_BYTES,
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# (kodlama, ETag, yol, sorgu, kimlik özeti)
+CacheKey = Tuple[str, str, str, bytes, str]
+
+
+class PrecompressedCache:
+    """Sıkıştırılmış gövdeler için toplam bayt sınırlı LRU."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # anahtar -> (ham gövde uzunluğu, sıkıştırılmış gövde)
+        self._entries: "OrderedDict[CacheKey, Tuple[int, bytes]]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: CacheKey, raw_length: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            # Uzunluk kontrolü: aynı ETag'le farklı gövde üretilirse (hata durumu) eski veri dönmesin
+            if entry is None or entry[0] != raw_length:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: CacheKey, raw_length: int, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (raw_length, data)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+class ResponseCompressor:
+    """Sıkıştırma ayarları, kodlama seçimi, önbellek ve sayaçlar (middleware bunu kullanır)."""
+
+    def __init__(self, enabled: bool = COMPRESSION_ENABLED, minimum_size: int = COMPRESSION_MIN_SIZE,
+                 level: int = COMPRESSION_LEVEL, content_types: Iterable[str] = COMPRESSION_CONTENT_TYPES,
+                 cache_max_bytes: int = COMPRESSION_CACHE_MAX_BYTES):
+        self.enabled = enabled
+        self.minimum_size = minimum_size
+        self.level = level
+        self.content_types = frozenset(t.lower() for t in content_types)
+        self.cache = PrecompressedCache(cache_max_bytes)
+        # Tercih sırasına göre (aynı q değerinde ilk gelen seçilir)
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+        self._lock = threading.Lock()
+        self._stats = {
+            "compressed": 0, "skipped_small": 0, "skipped_type": 0,
+            "streamed": 0, "not_accepted": 0, "bytes_in": 0, "bytes_out": 0,
+        }
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        """Accept-Encoding başlığından (q değerleriyle) desteklenen en iyi kodlamayı seçer."""
+        weights: Dict[str, float] = {}
+        for part in accept_encoding.lower().split(","):
+            name, _, params = part.strip().partition(";")
+            name, q = name.strip(), 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    q = float(params[2:])
+                except ValueError:
+                    q = 0.0
+            if name:
+                weights[name] = q
+
+        best, best_q = None, 0.0
+        for encoding in self.encodings:
+            q = weights.get(encoding, weights.get("*", 0.0))
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def is_compressible(self, content_type: Optional[str]) -> bool:
+        if not content_type:
+            return False
+        return content_type.split(";", 1)[0].strip().lower() in self.content_types
+
+    def compress(self, body: bytes, encoding: str, cache_key: Optional[CacheKey] = None) -> bytes:
+        data = self.cache.get(cache_key, len(body)) if cache_key is not None else None
+        if data is None:
+            if encoding == "br":
+                data = brotli.compress(body, quality=min(self.level, 11))
+            else:
+                # mtime=0: aynı gövde her zaman aynı çıktıyı verir
+                data = gzip.compress(body, compresslevel=self.level, mtime=0)
+            if cache_key is not None:
+                self.cache.put(cache_key, len(body), data)
+        with self._lock:
+            self._stats["compressed"] += 1
+            self._stats["bytes_in"] += len(body)
+            self._stats["bytes_out"] += len(data)
+        return data
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._stats)
+        data["ratio"] = round(data["bytes_out"] / data["bytes_in"], 4) if data["bytes_in"] else 0.0
+        data["enabled"] = self.enabled
+        data["encodings"] = list(self.encodings)
+        data["cache"] = self.cache.stats()
+        return data
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, compressor: ResponseCompressor):
+        self.app = app
+        self.compressor = compressor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.compressor.enabled:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self.compressor, scope, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Tek bir isteğin yanıtını ilk gövde parçası gelene kadar bekletip karar verir."""
+
+    def __init__(self, compressor: ResponseCompressor, scope: Scope, send: Send):
+        self.compressor = compressor
+        self.scope = scope
+        self.downstream = send
+        self.start_message: Optional[Message] = None
+        self.decided = False
+
+    async def send(self, message: Message) -> None:
+        if self.decided:
+            await self.downstream(message)
+            return
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        self.decided = True
+        start = self.start_message
+        headers = MutableHeaders(scope=start)
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if (start["status"] < 200 or start["status"] in (204, 304)
+                or "content-encoding" in headers):
+            pass
+        elif not self.compressor.is_compressible(headers.get("content-type")):
+            self.compressor.count("skipped_type")
+        elif more_body:
+            # Akış: parçalar geldikçe iletilmeli, tamponlanmaz
+            self.compressor.count("streamed")
+        elif len(body) < self.compressor.minimum_size:
+            self.compressor.count("skipped_small")
+        else:
+            headers.add_vary_header("Accept-Encoding")
+            request_headers = Headers(scope=self.scope)
+            encoding = self.compressor.choose_encoding(request_headers.get("accept-encoding", ""))
+            if encoding is None:
+                self.compressor.count("not_accepted")
+            else:
+                body = self.compressor.compress(body, encoding, self._cache_key(encoding, headers, request_headers))
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                message = {"type": "http.response.body", "body": body}
+
+        await self.downstream(start)
+        await self.downstream(message)
+
+    def _cache_key(self, encoding: str, headers: MutableHeaders, request_headers: Headers) -> Optional[CacheKey]:
+        etag = headers.get("etag")
+        if not etag or self.scope.get("method") != "GET" or "no-store" in headers.get("cache-control", ""):
+            return None
+        # ETag'ler kullanıcıya özel kaynak sürümlerinden üretilir; farklı kullanıcıların
+        # gövdeleri karışmasın diye anahtara kimlik bilgisinin özeti eklenir
+        credential = hashlib.blake2b(
+            request_headers.get("authorization", "").encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return (encoding, etag, self.scope["path"], self.scope.get("query_string", b""), credential)
+
+
+response_compressor = ResponseCompressor()
@@ -0,0 +1,43 @@
+"""
+HTTP metrik middleware'i (saf ASGI): işlenen istek sayısı ve route şablonu bazında süre.
+
+Etiket olarak gerçek yol değil route şablonu kullanılır (/api/projects/{project_id}),
+böylece her proje id'si için ayrı seri oluşmaz. Eşleşmeyen istekler 'unmatched' olur.
+Süre, uygulama yanıtı tamamen gönderene kadar ölçülür (akışlar dahil).
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            # Router eşleşen route'u scope'a yazar (FastAPI: scope["route"])
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.labels(method, template, status_code).observe(time.perf_counter() - started)
@@ -0,0 +1,217 @@
+"""
+İsteğe bağlı istek profilleme (istatistiksel örnekleme, sadece standart kütüphane).
+
+Bir istek iki yolla profillenir:
+  - 'X-Profile: <PROFILING_TOKEN>' başlığıyla (yönetici tetiklemesi),
+  - PROFILING_SAMPLE_RATE oranında rastgele.
+Profil süresince bir örnekleyici thread PROFILING_INTERVAL_MS aralıkla tüm thread'lerin
+yığınlarını (sys._current_frames) okur; boşta bekleyen thread'ler atlanır. Sonuç
+flamegraph araçlarının (flamegraph.pl, speedscope, inferno) okuduğu "folded stack"
+formatında PROFILING_DIR altına yazılır; yanında route/istek bilgisini taşıyan bir
+.json dosyası bulunur. Aynı anda tek profil çalışır (örnekleme süreç genelidir,
+eşzamanlı istekler de profilde görünebilir; yığınlar thread adıyla başlar).
+
+PROFILING_ENABLED kapalıyken middleware uygulamaya eklenmez.
+"""
+import json
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import (
+    PROFILING_TOKEN, PROFILING_SAMPLE_RATE, PROFILING_INTERVAL_MS,
+    PROFILING_DIR, PROFILING_MAX_FILES,
+)
+
+# Profil kimlikleri dosya adı olarak kullanılır; sadece bu biçim kabul edilir
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{6}_[0-9a-f]{8}$")
+
+# Bu fonksiyonlardan birinde duran thread boşta kabul edilir (kuyruk/selector/kilit beklemesi)
+_IDLE_FUNCTIONS = frozenset({"wait", "select", "poll", "get", "_wait_for_tstate_lock"})
+_IDLE_MODULES = ("threading.py", "queue.py", "selectors.py")
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return code.co_name in _IDLE_FUNCTIONS and code.co_filename.endswith(_IDLE_MODULES)
+
+
+def _frame_label(code) -> str:
+    # 'fonksiyon (dosya.py:satır)'; folded formatında ';' ayırıcıdır, boşluk serbesttir
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler:
+    """Arka plan thread'inde periyodik yığın örnekleri toplar."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            self.sample(own_id)
+
+    def sample(self, skip_thread_id: Optional[int] = None) -> None:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == skip_thread_id or _is_idle(frame):
+                continue
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}").replace(";", ":"))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Profil dosyalarını (.folded + .json) bir klasörde saklar, listeler ve sınırlar."""
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def new_id(self) -> str:
+        return f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}_{secrets.token_hex(4)}"
+
+    def save(self, profile_id: str, folded: str, meta: dict) -> None:
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.folded_path(profile_id), "w", encoding="utf-8") as f:
+                f.write(folded)
+            with open(self._meta_path(profile_id), "w", encoding="utf-8") as f:
+                json.dump({"id": profile_id, **meta}, f, ensure_ascii=False)
+            self._prune()
+
+    def list(self, limit: int = 50) -> List[dict]:
+        """En yeniden eskiye profil bilgileri."""
+        if not os.path.isdir(self.directory):
+            return []
+        items = []
+        for profile_id in sorted(self._ids(), reverse=True)[:limit]:
+            try:
+                with open(self._meta_path(profile_id), encoding="utf-8") as f:
+                    items.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return items
+
+    def folded_path(self, profile_id: str) -> str:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            raise ValueError("Geçersiz profil kimliği.")
+        return os.path.join(self.directory, f"{profile_id}.folded")
+
+    def _meta_path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.json")
+
+    def _ids(self) -> List[str]:
+        return [name[:-5] for name in os.listdir(self.directory)
+                if name.endswith(".json") and PROFILE_ID_PATTERN.match(name[:-5])]
+
+    def _prune(self) -> None:
+        ids = sorted(self._ids())
+        for profile_id in ids[:max(0, len(ids) - self.max_files)]:
+            for path in (self.folded_path(profile_id), self._meta_path(profile_id)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, store: "ProfileStore", token: str = PROFILING_TOKEN,
+                 sample_rate: float = PROFILING_SAMPLE_RATE, interval_ms: float = PROFILING_INTERVAL_MS):
+        self.app = app
+        self.store = store
+        self.token = token.encode("latin-1") if token else None
+        self.sample_rate = sample_rate
+        self.interval_seconds = interval_ms / 1000
+        # Örnekleme süreç geneli olduğu için aynı anda tek profil
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wanted(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._profile(scope, receive, send)
+        finally:
+            self._busy.release()
+
+    def _wanted(self, scope: Scope) -> bool:
+        if self.token is not None:
+            for name, value in scope["headers"]:
+                if name == b"x-profile":
+                    return secrets.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profile_id = self.store.new_id()
+        request_id = Headers(scope=scope).get("x-request-id") or profile_id
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Profile-Id"] = profile_id
+            await send(message)
+
+        sampler = StackSampler(self.interval_seconds)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            # Thread.join ve dosya yazımı event loop'u bloklamasın diye thread havuzunda çalışır
+            await run_in_threadpool(sampler.stop)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            meta = {
+                "request_id": request_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route,
+                "status": status_code,
+                "duration_ms": round(duration * 1000, 2),
+                "samples": sampler.samples,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            }
+            await run_in_threadpool(self._save, profile_id, sampler, meta)
+
+    def _save(self, profile_id: str, sampler: StackSampler, meta: dict) -> None:
+        try:
+            self.store.save(profile_id, sampler.folded(), meta)
+        except OSError as e:
+            print(f"Profil yazılamadı: {e}")
+
+
+profile_store = ProfileStore(PROFILING_DIR, PROFILING_MAX_FILES)
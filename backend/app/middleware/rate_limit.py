@@ -0,0 +1,344 @@
+"""
+Route bazında hız sınırlama (saf ASGI, token bucket).
+
+Kurallar config.py'deki RATE_LIMIT_RULES metninden okunur; her kural bir metod/yol
+eşleşmesi ve bir veya daha fazla kapsam (ip, user) için 'istek/saniye' sınırı taşır.
+Örn. 'POST /api/auth/login ip=10/60': IP başına dakikada 10 giriş denemesi (bcrypt
+doğrulaması CPU'yu kilitlemesin). Sınır aşılınca istek uygulamaya hiç ulaşmadan
+429 + Retry-After döner.
+
+'user' kapsamı Authorization başlığındaki JWT'den okunur (imza doğrulanır); token yoksa
+veya geçersizse sadece IP kapsamı uygulanır (endpoint zaten 401 döner).
+
+Backend'ler:
+  - memory: süreç içi sözlük, kova başına (jeton, güncelleme zamanı, dolma zamanı) tuple'ı.
+    Dolmuş kovalar RATE_LIMIT_SWEEP_SECONDS'ta bir silinir; sınır her worker'da ayrıdır.
+    Kova sayısı RATE_LIMIT_MAX_KEYS'e ulaşırsa en uzun süredir kullanılmayan kovalar
+    (LRU) bir alt seviyeye kadar toplu olarak atılır.
+  - redis: tüm worker'lar ortak; kontrol + düşüm tek bir Lua script'iyle atomiktir.
+    Redis'e ulaşılamazsa istekler sınırlanmaz (fail-open).
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from jose import JWTError, jwt
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import (
+    RATE_LIMIT_ENABLED, RATE_LIMIT_RULES, RATE_LIMIT_BACKEND, RATE_LIMIT_REDIS_URL,
+    RATE_LIMIT_MAX_KEYS, RATE_LIMIT_SWEEP_SECONDS, RATE_LIMIT_TRUST_PROXY, RATE_LIMIT_EXEMPT_CLIENTS,
+)
+from app.metrics import RATE_LIMITED_REQUESTS
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+SCOPES = ("ip", "user")
+
+# (kova anahtarı, saniyede dolan jeton, kapasite)
+BucketSpec = Tuple[str, float, float]
+
+
+# --- KURALLAR ---
+
+class RateLimitRule:
+    def __init__(self, name: str, methods: Optional[frozenset], path: str, limits: Dict[str, Tuple[int, float]]):
+        self.name = name
+        # None: tüm metodlar
+        self.methods = methods
+        self.prefix = path[:-1] if path.endswith("*") else None
+        self.path = path
+        # kapsam -> (istek sayısı, pencere saniyesi)
+        self.limits = limits
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods is not None and method not in self.methods:
+            return False
+        return path.startswith(self.prefix) if self.prefix is not None else path == self.path
+
+
+def parse_rules(text: str) -> List[RateLimitRule]:
+    """'POST /api/auth/login ip=10/60; WRITE /api/* user=120/60 ip=600/60' biçimini çözer."""
+    rules = []
+    for part in text.split(";"):
+        tokens = part.split()
+        if not tokens:
+            continue
+        if len(tokens) < 3:
+            raise ValueError(f"Geçersiz hız sınırı kuralı: '{part.strip()}'")
+        method_text, path, limit_texts = tokens[0].upper(), tokens[1], tokens[2:]
+        if method_text == "*":
+            methods = None
+        elif method_text == "WRITE":
+            methods = WRITE_METHODS
+        else:
+            methods = frozenset(m for m in method_text.split(",") if m)
+        limits = {}
+        for limit_text in limit_texts:
+            scope, _, value = limit_text.partition("=")
+            count, _, seconds = value.partition("/")
+            if scope not in SCOPES or not count.isdigit() or int(count) < 1:
+                raise ValueError(f"Geçersiz hız sınırı: '{limit_text}' (örn. ip=10/60)")
+            limits[scope] = (int(count), float(seconds or 1))
+        rules.append(RateLimitRule(f"{method_text} {path}", methods, path, limits))
+    return rules
+
+
+# --- BACKEND'LER ---
+
+class MemoryRateLimitBackend:
+    name = "memory"
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS, sweep_seconds: float = RATE_LIMIT_SWEEP_SECONDS,
+                 low_water_ratio: float = 0.9):
+        self.max_keys = max_keys
+        # Sınıra ulaşınca kova sayısı bu seviyeye indirilir; tam süpürme böylece her istekte
+        # değil, ancak (max_keys - low_water) yeni anahtar geldikten sonra tekrar çalışır
+        self.low_water = max(0, min(int(max_keys * low_water_ratio), max_keys - 1))
+        self.sweep_seconds = sweep_seconds
+        self._lock = threading.Lock()
+        # anahtar -> (jeton, güncelleme zamanı, kovanın yeniden dolacağı zaman);
+        # sıra son kullanıma göredir (en eski başta)
+        self._buckets: "OrderedDict[str, Tuple[float, float, float]]" = OrderedDict()
+        self._next_sweep = time.monotonic() + sweep_seconds
+        self.evictions = 0
+
+    def hit(self, specs: Sequence[BucketSpec]) -> Tuple[float, int]:
+        """
+        Tüm kovalarda jeton varsa birer jeton düşer ve (0, -1) döner; yoksa hiçbirine
+        dokunmadan (beklenmesi gereken süre, en uzun bekleten kovanın sırası).
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._next_sweep or len(self._buckets) >= self.max_keys:
+                self._sweep(now)
+            states = []
+            wait, limited = 0.0, -1
+            for index, (key, rate, capacity) in enumerate(specs):
+                state = self._buckets.get(key)
+                if state is not None:
+                    # Sınıra takılan istek de kovayı "son kullanılan" yapar; saldırı altındaki
+                    # bir giriş kovası LRU tahliyesiyle sıfırlanmaz
+                    self._buckets.move_to_end(key)
+                tokens = capacity if state is None else min(capacity, state[0] + (now - state[1]) * rate)
+                if tokens < 1 and (1 - tokens) / rate > wait:
+                    wait, limited = (1 - tokens) / rate, index
+                states.append(tokens)
+            if wait:
+                return wait, limited
+            for (key, rate, capacity), tokens in zip(specs, states):
+                tokens -= 1
+                self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+            return 0.0, -1
+
+    def _sweep(self, now: float) -> None:
+        # Dolmuş kovalar yeni oluşturulanla aynıdır; silmek davranışı değiştirmez
+        idle = [key for key, state in self._buckets.items() if state[2] <= now]
+        for key in idle:
+            del self._buckets[key]
+        # Hâlâ sınırdaysa en uzun süredir kullanılmayan kovalar alt seviyeye kadar atılır
+        # (o istemciler dolu kovayla yeniden başlar)
+        overflow = 0
+        if len(self._buckets) >= self.max_keys:
+            overflow = len(self._buckets) - self.low_water
+            for _ in range(overflow):
+                self._buckets.popitem(last=False)
+        self.evictions += len(idle) + overflow
+        self._next_sweep = now + self.sweep_seconds
+
+    def size(self) -> int:
+        return len(self._buckets)
+
+
+# MemoryRateLimitBackend.hit ile aynı mantık; sonuç 'bekleme|kova sırası' (0 tabanlı)
+_REDIS_SCRIPT = """
+local now = tonumber(ARGV[1])
+local wait = 0
+local limited = -1
+local states = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2])
+    local capacity = tonumber(ARGV[i * 2 + 1])
+    local state = redis.call('HMGET', key, 't', 'u')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    if now > updated then
+        tokens = math.min(capacity, tokens + (now - updated) * rate)
+    end
+    if tokens < 1 and (1 - tokens) / rate > wait then
+        wait = (1 - tokens) / rate
+        limited = i - 1
+    end
+    states[i] = {tokens, rate, capacity}
+end
+if wait > 0 then
+    return tostring(wait) .. '|' .. limited
+end
+for i, key in ipairs(KEYS) do
+    local tokens = states[i][1] - 1
+    redis.call('HSET', key, 't', tostring(tokens), 'u', tostring(now))
+    redis.call('PEXPIRE', key, math.ceil((states[i][3] - tokens) / states[i][2] * 1000) + 1000)
+end
+return '0|-1'
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Tüm worker'ların paylaştığı kovalar. 'redis' paketi sadece bu sınıf oluşturulduğunda
+    import edilir. Kovalar dolunca Redis TTL'i ile kendiliğinden silinir.
+    """
+    name = "redis"
+
+    def __init__(self, url: str, key_prefix: str = "pm:ratelimit:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.key_prefix = key_prefix
+        self._script = self.client.register_script(_REDIS_SCRIPT)
+        self.evictions = 0
+
+    def hit(self, specs: Sequence[BucketSpec]) -> Tuple[float, int]:
+        args = [time.time()]
+        for _, rate, capacity in specs:
+            args += [rate, capacity]
+        try:
+            result = self._script(keys=[self.key_prefix + key for key, _, _ in specs], args=args)
+        except Exception as e:
+            print(f"Hız sınırı backend'i (redis) hatası, istek sınırlanmadan geçiriliyor: {e}")
+            return 0.0, -1
+        wait, _, limited = (result.decode() if isinstance(result, bytes) else result).partition("|")
+        return float(wait), int(limited)
+
+    def size(self) -> int:
+        return -1
+
+
+def create_backend(name: str = RATE_LIMIT_BACKEND):
+    if name == "memory":
+        return MemoryRateLimitBackend()
+    if name == "redis":
+        return RedisRateLimitBackend(RATE_LIMIT_REDIS_URL)
+    raise ValueError(f"Bilinmeyen RATE_LIMIT_BACKEND: '{name}' (geçerli değerler: memory, redis)")
+
+
+# --- SINIRLAYICI ---
+
+class RateLimiter:
+    def __init__(self, rules: List[RateLimitRule], backend=None, enabled: bool = RATE_LIMIT_ENABLED,
+                 trust_proxy: bool = RATE_LIMIT_TRUST_PROXY, exempt_clients: Sequence[str] = RATE_LIMIT_EXEMPT_CLIENTS):
+        self.rules = rules
+        self.enabled = enabled and bool(rules)
+        self.trust_proxy = trust_proxy
+        self.exempt_clients = frozenset(exempt_clients)
+        self._backend = backend
+        self._lock = threading.Lock()
+        self._stats = {"checked": 0, "limited": 0}
+
+    @property
+    def backend(self):
+        # Redis bağlantısı ilk kullanımda kurulur
+        if self._backend is None:
+            self._backend = create_backend()
+        return self._backend
+
+    def match(self, method: str, path: str) -> Optional[RateLimitRule]:
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule
+        return None
+
+    def check(self, rule: RateLimitRule, scope: Scope) -> Tuple[float, Optional[str]]:
+        """(bekleme süresi, sınıra takılan kapsam); süre 0 ise istek geçer."""
+        headers = Headers(scope=scope)
+        client_ip = self._client_ip(scope, headers)
+        if client_ip in self.exempt_clients:
+            return 0.0, None
+        identities = []
+        if "ip" in rule.limits:
+            identities.append(("ip", client_ip))
+        if "user" in rule.limits:
+            user = _token_subject(headers.get("authorization"))
+            if user is not None:
+                identities.append(("user", user))
+        if not identities:
+            return 0.0, None
+
+        specs = []
+        for name, identity in identities:
+            count, seconds = rule.limits[name]
+            specs.append((f"{rule.name}|{name}|{identity}", count / seconds, float(count)))
+        wait, limited = self.backend.hit(specs)
+        with self._lock:
+            self._stats["checked"] += 1
+            if wait:
+                self._stats["limited"] += 1
+        return (wait, identities[limited][0]) if wait else (0.0, None)
+
+    def _client_ip(self, scope: Scope, headers: Headers) -> str:
+        if self.trust_proxy:
+            forwarded = headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._stats)
+        backend = self.backend if self.enabled else None
+        data.update({
+            "enabled": self.enabled,
+            "backend": backend.name if backend else None,
+            "rules": [rule.name for rule in self.rules],
+            "tracked_keys": backend.size() if backend else 0,
+            "evictions": backend.evictions if backend else 0,
+        })
+        return data
+
+
+def _token_subject(authorization: Optional[str]) -> Optional[str]:
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    return _decode_subject(authorization[7:])
+
+
+# İstemciler aynı token'ı tekrar tekrar gönderir; imza doğrulaması token başına bir kez yapılır.
+# Süresi dolmuş bir token önbellekten dönse de sadece kova anahtarı olur, endpoint yine 401 verir.
+@lru_cache(maxsize=4096)
+def _decode_subject(token: str) -> Optional[str]:
+    from app.services.auth_service import SECRET_KEY, ALGORITHM
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+
+class RateLimitMiddleware:
+    def __init__(self, app: ASGIApp, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.limiter.enabled:
+            await self.app(scope, receive, send)
+            return
+        rule = self.limiter.match(scope["method"], scope["path"])
+        if rule is not None:
+            wait, limited_scope = self.limiter.check(rule, scope)
+            if wait:
+                RATE_LIMITED_REQUESTS.labels(rule.name, limited_scope).inc()
+                response = JSONResponse(
+                    {"detail": "Çok fazla istek gönderildi. Lütfen biraz sonra tekrar deneyin."},
+                    status_code=429, headers={"Retry-After": str(math.ceil(wait))},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+rate_limiter = RateLimiter(parse_rules(RATE_LIMIT_RULES))
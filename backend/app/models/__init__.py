@@ -6,4 +6,7 @@ from .project_member_model import ProjectMember, ProjectRole
 from .notification_model import Notification
 
 # YENİ EKLENDİ (Alembic'in görmesi için):
-from .note_model import Note
\ No newline at end of file
+from .note_model import Note
+from .analysis_cache_model import AnalysisCacheEntry
+from .analysis_record_model import ProjectAnalysisRecord
+from .activity_model import ProjectActivity
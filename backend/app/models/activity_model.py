@@ -0,0 +1,36 @@
+# backend/app/models/activity_model.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, event
+from datetime import datetime
+from app.database import Base
+
+class ProjectActivity(Base):
+    """
+    Projedeki görev, üye ve proje olaylarının sadece eklenen (append-only) kaydı.
+    Olayı üreten değişiklikle aynı transaction'da yazılır; sonradan güncellenmez.
+    Akış (project_id, id) indeksiyle en yeniden eskiye keyset sayfalanarak okunur.
+    """
+    __tablename__ = "project_activities"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    # İşlemi yapan kullanıcı (kullanıcı silinirse kayıt kalır)
+    actor_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    # Örn. 'task.created', 'task.updated', 'member.added' (bkz. activity_service)
+    event = Column(String(40), nullable=False)
+    # Görev silinse de geçmiş kalsın diye yabancı anahtar değil
+    task_id = Column(Integer, nullable=True)
+    # Olay ayrıntıları (JSON): görev başlığı, değişen alanların eski/yeni değerleri vb.
+    details = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    __table_args__ = (Index("ix_project_activities_project_id_id", "project_id", "id"),)
+
+
+@event.listens_for(ProjectActivity, "before_update")
+def _reject_update(mapper, connection, target):
+    raise ValueError("Proje aktivite kayıtları değiştirilemez.")
+
+
+@event.listens_for(ProjectActivity, "before_delete")
+def _reject_delete(mapper, connection, target):
+    raise ValueError("Proje aktivite kayıtları silinemez.")
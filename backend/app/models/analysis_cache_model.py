@@ -0,0 +1,21 @@
+# backend/app/models/analysis_cache_model.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from datetime import datetime
+from app.database import Base
+
+class AnalysisCacheEntry(Base):
+    """
+    AI analiz önbelleğinin kalıcı kopyası (AI_CACHE_PERSIST açıkken kullanılır).
+    Her proje için tek satır tutulur: son analiz ve üretildiği verinin parmak izi.
+    """
+    __tablename__ = "analysis_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, unique=True)
+
+    # _prepare_project_data çıktısının normalize edilmiş SHA-256 özeti
+    fingerprint = Column(String(64), nullable=False)
+
+    # ProjectAnalysis JSON olarak
+    result = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
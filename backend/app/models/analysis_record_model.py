@@ -0,0 +1,39 @@
+# backend/app/models/analysis_record_model.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
+from datetime import datetime
+from app.database import Base
+
+class ProjectAnalysisRecord(Base):
+    """
+    Projenin geçmiş AI analizleri. Skor trendleri ve artımlı (incremental)
+    yeniden analiz için saklanır: bir sonraki analiz sadece bu kayıttan sonra
+    değişen görevleri ve bu kaydın özetini gönderir.
+    """
+    __tablename__ = "project_analyses"
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    # Analize giren verinin okunmaya başlandığı an. Artımlı analiz "bundan sonra değişen
+    # görevleri" bu değere göre seçer; created_at AI çağrısından SONRA yazıldığı için
+    # çağrı sürerken yapılan değişiklikleri kaçırırdı. Eski kayıtlarda None.
+    snapshot_at = Column(DateTime, nullable=True)
+
+    # Analiz edilen verinin parmak izi (bkz. analysis_cache.fingerprint_project_data)
+    fingerprint = Column(String(64), nullable=False)
+
+    risk_score = Column(Integer, nullable=False)
+    performance_score = Column(Integer, nullable=False)
+    sentiment = Column(String, nullable=True)
+    summary = Column(Text, nullable=False)
+    recommendations = Column(Text, nullable=False) # JSON listesi
+
+    # Analiz anındaki görev ID'leri (JSON listesi): sonradan silinen görevleri bulmak için
+    task_ids = Column(Text, nullable=False)
+
+    # Bu analiz artımlı prompt ile mi üretildi?
+    incremental = Column(Boolean, nullable=False, default=False)
+    prompt_chars = Column(Integer, nullable=True)
+
+    # Proje geçmişini (project_id, id) sırasıyla okumak için
+    __table_args__ = (Index("ix_project_analyses_project_id_id", "project_id", "id"),)
@@ -1,7 +1,8 @@
 # backend/app/models/note_model.py
 
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
+from datetime import datetime
 from app.database import Base
 
 class Note(Base):
@@ -15,6 +16,15 @@ class Note(Base):
     
     # Bu notun SAHİBİ kim? (users.id'ye bağlar)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    # Son güncelleme zamanı (Kenar çubuğunda listeleme için)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    # Her içerik değişikliğinde artar (PATCH ile gelen delta'ların eski sürüme uygulanmasını engeller)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     
     # İlişki: Bu notun sahibinin (User nesnesi) kim olduğunu belirtir
-    owner = relationship("User", back_populates="notes")
\ No newline at end of file
+    owner = relationship("User", back_populates="notes")
+
+    # Keyset sayfalama (user_id + id) için bileşik indeks
+    __table_args__ = (Index("ix_notes_user_id_id", "user_id", "id"),)
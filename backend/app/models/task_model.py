@@ -1,6 +1,6 @@
 # backend/app/models/task_model.py
 
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Text, DateTime
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 import enum
@@ -40,6 +40,7 @@ class Task(Base):
     status = Column(Enum(TaskStatus), nullable=False, default=TaskStatus.beklemede)
     due_date = Column(DateTime, nullable=True)          # Son teslim tarihi
     completed_at = Column(DateTime, nullable=True)      # YENİ: Gerçekleşen bitiş tarihi (Hız analizi için)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now) # Artımlı AI analizi için
     
     # YENİ: Analiz İçin Kritik Veriler
     priority = Column(Enum(TaskPriority), nullable=False, default=TaskPriority.orta) # Öncelik
@@ -51,4 +52,7 @@ class Task(Base):
     project = relationship("Project", back_populates="tasks")
     
     assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    assignee = relationship("User", back_populates="tasks")
\ No newline at end of file
+    assignee = relationship("User", back_populates="tasks")
+
+    # Bir projede belirli bir tarihten sonra değişen görevleri bulmak için
+    __table_args__ = (Index("ix_tasks_project_id_updated_at", "project_id", "updated_at"),)
@@ -1,17 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.config import AI_JOB_WAIT_MARGIN_SECONDS, WEB_CONCURRENCY
 
 # Modeller ve Şemalar
 from app.models.user_model import User
-from app.schemas.analysis_schemas import AnalysisResponse
+from app.schemas.analysis_schemas import (
+    AnalysisResponse, AnalysisCacheStats, AnalysisJobDisplay, PromptSizeStats, ProjectScores,
+    AnalysisHistoryItem, ScoreTrend, AIGatewayStats
+)
 
 # --- DEĞİŞİKLİK 1: get_project_admin yerine get_project_membership import et ---
 # Eski: from app.services.auth_service import get_project_admin
-from app.services.auth_service import get_project_membership 
+from app.services.auth_service import get_project_membership, get_current_user, get_system_admin
 
-# Oluşturduğumuz AI Servisi
+# Oluşturduğumuz AI Servisi (işler üzerinden çağrılır)
+from app.services.analysis_cache import analysis_cache
+from app.services.analysis_history import analysis_history
+from app.services.analytics_service import analytics_service
+from app.services.portfolio_service import portfolio_service
 from app.services.ai_service import ai_service
+from app.services.ai_gateway import ai_gateway
+from app.services.analysis_jobs import analysis_jobs, AnalysisJob
+from app.services.project_service import project_service
+from app.services.project_snapshot import project_snapshot_builder
 
 router = APIRouter(
     prefix="/api",
@@ -26,6 +41,7 @@ router = APIRouter(
 )
 def analyze_project_endpoint(
     project_id: int,
+    force_refresh: bool = Query(False, description="Önbelleği atla ve analizi yeniden üret"),
     db: Session = Depends(get_db),
     # --- DEĞİŞİKLİK 2: Admin zorunluluğunu kaldır, Üye olmak yetsin ---
     # Eski: current_user: User = Depends(get_project_admin)
@@ -34,22 +50,224 @@ def analyze_project_endpoint(
     """
     Belirtilen projenin verilerini (görevler, üyeler, durumlar) toplar,
     Gemini AI servisine gönderir ve yapılandırılmış bir analiz raporu döndürür.
+    Proje verisi son analizden beri değişmediyse önbellekteki sonuç döner.
     """
     try:
-        # Servisimizi çağırıyoruz
-        analysis_result = ai_service.analyze_project(db, project_id)
-        
-        # Sonucu API formatına uygun döndür
-        return AnalysisResponse(
-            project_id=project_id,
-            analysis=analysis_result
-        )
+        # İş kuyruğu üzerinden çalıştırıp bekliyoruz; aynı projeye eşzamanlı
+        # gelen istekler tek bir Gemini çağrısını paylaşır.
+        job = analysis_jobs.submit(db, project_id, force_refresh=force_refresh)
+        # Gateway her çağrıyı zaman aşımı ve deneme sayısıyla sınırlar; iş bu süreyi (pay ile)
+        # aşarsa istek bekletilmez, iş arka planda sürer ve sonucu işler üzerinden alınabilir
+        if not job.wait(ai_gateway.max_call_seconds() + AI_JOB_WAIT_MARGIN_SECONDS):
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=_timeout_detail(job))
+        if job.error:
+            raise RuntimeError(job.error)
+        return job.result
 
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Analiz Endpoint Hatası: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Analiz hatası: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+def _timeout_detail(job: AnalysisJob) -> str:
+    # İşler süreç içinde tutulur; birden fazla worker varken sorgu başka bir worker'a
+    # düşebileceği için iş adresi sadece tek worker'da verilir
+    if WEB_CONCURRENCY == 1:
+        return f"Analiz zamanında tamamlanamadı. Sonuç hazır olunca GET /api/analysis-jobs/{job.id} ile alınabilir."
+    return "Analiz zamanında tamamlanamadı. Lütfen biraz sonra tekrar deneyin."
+
+# --- AKIŞLI (STREAMING) ANALİZ ---
+
+@router.post(
+    "/projects/{project_id}/analyze/stream",
+    summary="Proje analizini Server-Sent Events ile akıt",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}}
+)
+def analyze_project_stream(
+    project_id: int,
+    force_refresh: bool = Query(False, description="Önbelleği atla ve analizi yeniden üret"),
+    db: Session = Depends(get_db),
+    membership = Depends(get_project_membership)
+):
+    """
+    Analizi beklemeden göstermek için: önce yerel skorlar ('scores'), sonra AI özeti
+    geldikçe parça parça ('summary'), en sonda doğrulanmış tam sonuç ('result') gönderilir.
+    """
+    try:
+        events = ai_service.stream_analysis(db, project_id, force_refresh=force_refresh)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# --- YEREL SKORLAR (ANLIK) ---
+
+@router.get(
+    "/projects/{project_id}/scores",
+    response_model=ProjectScores,
+    summary="Risk ve performans skorlarını yerelde (AI olmadan) hesapla"
+)
+def get_project_scores(
+    project_id: int,
+    db: Session = Depends(get_db),
+    membership = Depends(get_project_membership)
+):
+    """
+    Risk, performans, iş yükü dengesi ve kategori darboğazlarını doğrudan görev
+    verisinden hesaplar. Deterministiktir ve milisaniyeler içinde döner;
+    analiz sayfası AI yorumu gelmeden önce bunu gösterebilir.
+    """
+    return analytics_service.compute_scores(db, project_id)
+
+# --- ANALİZ GEÇMİŞİ VE SKOR TRENDLERİ ---
+
+@router.get(
+    "/projects/{project_id}/analysis/history",
+    response_model=List[AnalysisHistoryItem],
+    summary="Projenin saklanan AI analizlerini listele"
+)
+def get_analysis_history(
+    project_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    before_id: Optional[int] = Query(None, description="Önceki sayfanın son analiz ID'si"),
+    db: Session = Depends(get_db),
+    membership = Depends(get_project_membership)
+):
+    """Projenin geçmiş analizlerini yeniden eskiye döndürür (sayfalı)."""
+    return analysis_history.list_history(db, project_id, limit=limit, before_id=before_id)
+
+@router.get(
+    "/projects/{project_id}/analysis/trends",
+    response_model=ScoreTrend,
+    summary="Risk ve performans skorlarının zaman içindeki değişimi"
+)
+def get_score_trends(
+    project_id: int,
+    limit: int = Query(100, ge=1, le=500, description="En fazla kaç analiz noktası"),
+    db: Session = Depends(get_db),
+    membership = Depends(get_project_membership)
+):
+    """
+    Saklanan analiz satırlarından doğrudan skor trendi üretir; AI çağrılmaz.
+    Noktalar eskiden yeniye sıralıdır.
+    """
+    return analysis_history.score_trend(db, project_id, limit=limit)
+
+# --- PORTFÖY (TOPLU) ANALİZ ---
+
+@router.post(
+    "/analysis/portfolio",
+    summary="Kullanıcının tüm projelerini toplu analiz et (NDJSON akışı)",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}}
+)
+def analyze_portfolio(
+    force_refresh: bool = Query(False, description="Önbelleği atla ve tüm projeleri yeniden analiz et"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Kullanıcının üyesi olduğu tüm projeleri analiz eder ve satır satır JSON döndürür:
+    1. 'overview': yerel skorlarla anında risk sıralaması,
+    2. 'result': her proje analizi bittikçe (değişmeyen projeler önbellekten, hemen),
+    3. 'done': son sıralama ve özet sayılar.
+    """
+    run = portfolio_service.start(db, current_user.id, force_refresh=force_refresh)
+    return StreamingResponse(portfolio_service.stream(run), media_type="application/x-ndjson")
+
+# --- ASENKRON ANALİZ İŞLERİ ---
+
+@router.post(
+    "/projects/{project_id}/analysis-jobs",
+    response_model=AnalysisJobDisplay,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Proje analizini arka planda başlat"
+)
+def start_analysis_job(
+    project_id: int,
+    force_refresh: bool = Query(False, description="Önbelleği atla ve analizi yeniden üret"),
+    db: Session = Depends(get_db),
+    membership = Depends(get_project_membership)
+):
+    """
+    Analizi arka planda başlatır ve iş kimliğini hemen döndürür.
+    Aynı proje için süren bir iş varsa yenisi açılmaz, o iş döner.
+    Sonuç GET /api/analysis-jobs/{job_id} ile alınır.
+    """
+    try:
+        return analysis_jobs.submit(db, project_id, force_refresh=force_refresh).to_display()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+def get_job_for_user(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> AnalysisJob:
+    """İşi bulur ve kullanıcının işin projesine üye olduğunu doğrular."""
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analiz işi bulunamadı.")
+    project_service.get_project_by_id(db, job.project_id, current_user.id)
+    return job
+
+@router.get(
+    "/analysis-jobs/{job_id}",
+    response_model=AnalysisJobDisplay,
+    summary="Analiz işinin durumunu ve sonucunu getir"
+)
+async def get_analysis_job(
+    wait: float = Query(0, ge=0, le=30, description="İş bitene kadar en fazla bu kadar saniye bekle (long-poll)"),
+    job: AnalysisJob = Depends(get_job_for_user)
+):
+    """
+    İşin durumunu, ilerlemesini ve tamamlandıysa sonucunu döndürür.
+    'wait' verilirse iş bitene kadar (thread tutmadan) beklenir.
+    """
+    deadline = asyncio.get_running_loop().time() + wait
+    while not job.finished and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.1)
+    return job.to_display()
+
+# Süreç geneli metrikler: /api/system/* gibi sadece sistem yöneticilerine açık
+@router.get(
+    "/analysis/cache-stats",
+    response_model=AnalysisCacheStats,
+    summary="AI analiz önbelleği isabet metrikleri",
+    dependencies=[Depends(get_system_admin)]
+)
+def get_analysis_cache_stats():
+    """Önbellek isabet/ıska sayıları, isabet oranı ve tahliye sayıları."""
+    return analysis_cache.stats()
+
+
+@router.get(
+    "/analysis/prompt-stats",
+    response_model=PromptSizeStats,
+    summary="AI prompt boyutu metrikleri",
+    dependencies=[Depends(get_system_admin)]
+)
+def get_prompt_size_stats():
+    """Eski format, kompakt format ve token bütçesi sonrası prompt boyutları."""
+    return project_snapshot_builder.stats.snapshot()
+
+
+@router.get(
+    "/analysis/gateway-stats",
+    response_model=AIGatewayStats,
+    summary="AI gateway metrikleri (devre kesici, hız sınırı, gecikme yüzdelikleri)",
+    dependencies=[Depends(get_system_admin)]
+)
+def get_ai_gateway_stats():
+    """Devre kesici durumu, ret/tekrar deneme sayıları ve başarılı çağrıların p50/p95/p99 süreleri."""
+    return ai_gateway.stats()
@@ -0,0 +1,39 @@
+import hmac
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from app.config import METRICS_ENABLED, METRICS_TOKEN
+from app.database import get_db
+from app.metrics import metrics
+from app.services.auth_service import get_current_user, get_system_admin
+
+router = APIRouter(
+    tags=["System"]
+)
+
+# Prometheus metin formatı sürümü
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics", response_class=PlainTextResponse, summary="Prometheus metrikleri")
+def get_metrics(request: Request, db: Session = Depends(get_db)):
+    """
+    HTTP, veritabanı, kimlik doğrulama, bildirim ve LLM metrikleri (Prometheus scrape için).
+    METRICS_TOKEN tanımlıysa o token, değilse sistem yöneticisi oturumu gerekir.
+    """
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrikler kapalı.")
+    supplied = request.headers.get("authorization", "")
+    if METRICS_TOKEN:
+        if not hmac.compare_digest(supplied.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Geçersiz metrik token'ı.")
+    else:
+        scheme, _, token = supplied.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Metrikler için yönetici oturumu veya METRICS_TOKEN gerekir.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        get_system_admin(get_current_user(token, db))
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
 # 1. GEREKLİ MODELLER
@@ -9,18 +9,17 @@ from app.models import user_model, note_model
 from app.schemas import note_schemas
 # 3. GÜVENLİK
 from app.services.auth_service import get_current_user
+from app.services.note_service import note_service, note_write_buffer, NOTE_DISPLAY_COLUMNS
+from app.conditional import check_not_modified
+from app import fast_json
 
 router = APIRouter(
     prefix="/api/notes",
     tags=["Notes"]
 )
 
-# --- YARDIMCI GÜVENLİK FONKSİYONU (Dependency) ---
-def get_note_for_user(
-    note_id: int,
-    db: Session = Depends(get_db),
-    current_user: user_model.User = Depends(get_current_user)
-) -> note_model.Note:
+# --- YARDIMCI GÜVENLİK FONKSİYONLARI (Dependency) ---
+def _find_user_note(db: Session, note_id: int, user_id: int) -> note_model.Note:
     """
     Notu ID ile bulur ve GÜVENLİK KONTROLÜ yapar.
     Not ya bulunamazsa ya da mevcut kullanıcıya ait DEĞİLSE 404 döndürür.
@@ -28,7 +27,7 @@ def get_note_for_user(
     """
     note = db.query(note_model.Note).filter(
         note_model.Note.id == note_id,
-        note_model.Note.user_id == current_user.id # Sadece GİRİŞ YAPAN KULLANICIYA ait notları ara
+        note_model.Note.user_id == user_id # Sadece GİRİŞ YAPAN KULLANICIYA ait notları ara
     ).first()
     
     if not note:
@@ -38,17 +37,83 @@ def get_note_for_user(
         )
     return note
 
+def get_note_for_user(
+    note_id: int,
+    db: Session = Depends(get_db),
+    current_user: user_model.User = Depends(get_current_user)
+) -> note_model.Note:
+    """
+    Okuma/PUT/DELETE için notu getirir.
+    Bellekte bekleyen (PATCH) değişiklikler önce veritabanına yazılır.
+    """
+    note_write_buffer.flush_note(db, note_id)
+    return _find_user_note(db, note_id, current_user.id)
+
+def get_note_for_patch(
+    note_id: int,
+    db: Session = Depends(get_db),
+    current_user: user_model.User = Depends(get_current_user)
+) -> note_model.Note:
+    """
+    PATCH için notu getirir. Bekleyen değişiklikler yazılMAZ,
+    böylece art arda gelen delta'lar bellekte birleştirilebilir.
+    """
+    return _find_user_note(db, note_id, current_user.id)
+
 # --- ENDPOINT 1 (TÜM NOTLARI LİSTELE) ---
 @router.get("/", response_model=List[note_schemas.NoteDisplay])
 def get_my_notes(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Virgülle alan listesi (örn. id,title,version); 'content' istenmezse okunmaz"),
+    db: Session = Depends(get_db),
     current_user: user_model.User = Depends(get_current_user)
 ):
     """
     Giriş yapmış mevcut kullanıcının tüm notlarını listeler.
     user_model.py'deki 'notes' ilişkisi sayesinde bu çok basittir.
+    Notlar değişmediyse (If-None-Match) yüklenmeden 304 döner.
     """
+    projection, _ = fast_json.select_fields(NOTE_DISPLAY_COLUMNS, fields)
+    # Bekleyen değişiklikler önce yazılır ki sürüm (ETag) güncel olsun
+    note_write_buffer.flush_user(db, current_user.id)
+    not_modified = check_not_modified(request, response, ("user_notes", current_user.id))
+    if not_modified:
+        return not_modified
+    if fields is not None:
+        return fast_json.json_response(note_service.get_note_rows(db, current_user.id, projection), response)
     return current_user.notes
 
+# --- ENDPOINT 1.1 (HAFİF NOT LİSTESİ - SAYFALI) ---
+@router.get("/summary", response_model=note_schemas.NotePage)
+def get_my_note_summaries(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    before_id: Optional[int] = Query(None, description="Önceki sayfanın 'next_cursor' değeri"),
+    db: Session = Depends(get_db),
+    current_user: user_model.User = Depends(get_current_user)
+):
+    """
+    Kenar çubuğu için hafif not listesi: id, başlık, önizleme ve güncelleme zamanı.
+    Notun tam içeriği burada yüklenmez, GET /api/notes/{note_id} ile alınır.
+    """
+    note_write_buffer.flush_user(db, current_user.id)
+    not_modified = check_not_modified(request, response, ("user_notes", current_user.id))
+    if not_modified:
+        return not_modified
+    return note_service.list_note_summaries(db, current_user.id, limit=limit, before_id=before_id)
+
+# --- ENDPOINT 1.2 (TEK NOT - TAM İÇERİK) ---
+@router.get("/{note_id}", response_model=note_schemas.NoteDisplay)
+def get_my_note(
+    db_note: note_model.Note = Depends(get_note_for_user)
+):
+    """
+    Kullanıcının SADECE KENDİNE ait tek bir notunu tam içeriğiyle döndürür.
+    """
+    return db_note
+
 # --- ENDPOINT 2 (YENİ NOT OLUŞTUR) ---
 @router.post("/", response_model=note_schemas.NoteDisplay, status_code=status.HTTP_201_CREATED)
 def create_new_note(
@@ -95,12 +160,27 @@ def update_my_note(
 
     for key, value in update_data.items():
         setattr(db_note, key, value)
+    db_note.version += 1
     
     db.add(db_note)
     db.commit()
     db.refresh(db_note)
     return db_note
 
+# --- ENDPOINT 3.1 (DELTA GÜNCELLEME - OTOMATİK KAYDETME) ---
+@router.patch("/{note_id}", response_model=note_schemas.NotePatchResult)
+def patch_my_note(
+    patch: note_schemas.NotePatch,
+    db_note: note_model.Note = Depends(get_note_for_patch),
+    db: Session = Depends(get_db)
+):
+    """
+    Editörün otomatik kaydetmesi için: tüm içerik yerine sadece değişiklikleri (delta) alır.
+    'base_version' sunucudaki sürümle eşleşmezse 409 döner.
+    Art arda gelen değişiklikler bellekte birleştirilip aralıklarla yazılır.
+    """
+    return note_write_buffer.apply_patch(db, db_note, patch)
+
 # --- ENDPOINT 4 (NOT SİL) ---
 @router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_my_note(
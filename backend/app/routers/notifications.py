@@ -1,20 +1,25 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
 from app.models import user_model
 from app.schemas import notification_schemas
 from app.services.auth_service import get_current_user
-from app.services.notification_service import notification_service
+from app.services.notification_service import notification_service, NOTIFICATION_DISPLAY_COLUMNS
+from app import fast_json
 
 router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
 
 @router.get("/", response_model=List[notification_schemas.NotificationDisplay])
 def get_my_notifications(
+    fields: Optional[str] = Query(None, description="Virgülle alan listesi (örn. id,title,is_read); verilmezse tüm alanlar"),
     db: Session = Depends(get_db),
     current_user: user_model.User = Depends(get_current_user)
 ):
+    if fields is not None:
+        projection, _ = fast_json.select_fields(NOTIFICATION_DISPLAY_COLUMNS, fields)
+        return fast_json.json_response(notification_service.get_user_notification_rows(db, current_user.id, projection))
     return notification_service.get_user_notifications(db, current_user.id)
 
 @router.put("/{notif_id}/read")
@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
 from app.models import user_model
+from app.models.project_member_model import ProjectMember
 # Şemalar
-from app.schemas import project_schemas
+from app.schemas import project_schemas, activity_schemas
 from app.schemas.project_member_schemas import ProjectMemberDisplay, ProjectMemberInvite, ProjectMemberUpdate
 # Servisler
-from app.services.auth_service import get_current_user
-from app.services.project_service import project_service # Yeni servisi ekledik
+from app.services.auth_service import get_current_user, get_project_membership
+from app.services.project_service import project_service, PROJECT_DISPLAY_COLUMNS # Yeni servisi ekledik
+from app.services.activity_service import activity_service
+from app.services.project_overview import project_overview_service
+from app.conditional import check_not_modified
+from app.events import ALL_USERS
+from app import fast_json
 
 router = APIRouter(
     prefix="/api/projects",
@@ -20,10 +26,15 @@ router = APIRouter(
 
 @router.get("/", response_model=List[project_schemas.ProjectDisplay])
 def get_my_projects(
+    fields: Optional[str] = Query(None, description="Virgülle alan listesi (örn. id,name); 'memberships' istenmezse üyeler hiç yüklenmez"),
     db: Session = Depends(get_db),
     current_user: user_model.User = Depends(get_current_user)
 ):
     """Kullanıcının projelerini listeler."""
+    projection, extras = fast_json.select_fields(PROJECT_DISPLAY_COLUMNS, fields, extra=("memberships",))
+    if fast_json.enabled or fields is not None:
+        return fast_json.json_response(project_service.get_user_project_rows(
+            db, current_user.id, projection, include_memberships="memberships" in extras))
     return project_service.get_user_projects(db, current_user.id)
 
 @router.post("/", response_model=project_schemas.ProjectDisplay, status_code=status.HTTP_201_CREATED)
@@ -38,11 +49,18 @@ def create_project(
 @router.get("/{project_id}", response_model=project_schemas.ProjectDisplay)
 def get_project_by_id(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: user_model.User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    membership: ProjectMember = Depends(get_project_membership)
 ):
-    """Proje detayını getirir."""
-    return project_service.get_project_by_id(db, project_id, current_user.id)
+    """
+    Proje detayını getirir.
+    İstemcinin ETag'i güncelse proje ve üyeleri hiç yüklenmeden 304 döner.
+    """
+    not_modified = check_not_modified(request, response, ("project", project_id), ALL_USERS)
+    if not_modified:
+        return not_modified
+    return membership.project
 
 @router.put("/{project_id}", response_model=project_schemas.ProjectDisplay)
 def update_project_details(
@@ -63,6 +81,43 @@ def delete_project(
     """Projeyi siler (Admin)."""
     return project_service.delete_project(db, project_id, current_user.id)
 
+@router.get("/{project_id}/overview", response_model=project_schemas.ProjectOverview)
+def get_project_overview(
+    project_id: int,
+    membership: ProjectMember = Depends(get_project_membership),
+    db: Session = Depends(get_db)
+):
+    """
+    Proje, üyeler, pano görevleri ve skorlar tek istekte (tek yetki kontrolü, tek session).
+    Proje detay/analiz sayfalarının ayrı ayrı yaptığı proje + görev isteklerinin yerine geçer.
+    Skorlar zamana bağlı (gecikme) olduğu için bu yanıt ETag ile doğrulanmaz.
+    """
+    overview = project_overview_service.get_overview(db, project_id, membership.role)
+    if fast_json.enabled:
+        return fast_json.json_response(overview)
+    return overview
+
+# --- AKTİVİTE AKIŞI ---
+
+@router.get("/{project_id}/activity", response_model=activity_schemas.ActivityPage)
+def get_project_activity(
+    project_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    before_id: Optional[int] = Query(None, description="Önceki sayfanın 'next_cursor' değeri"),
+    membership: ProjectMember = Depends(get_project_membership),
+    db: Session = Depends(get_db)
+):
+    """
+    Projedeki görev, üye ve proje olayları (en yeni en üstte, keyset sayfalı).
+    Yeni olay yoksa yoklama (polling) istekleri sorgu çalıştırılmadan 304 alır.
+    """
+    not_modified = check_not_modified(request, response, ("project_activity", project_id))
+    if not_modified:
+        return not_modified
+    return activity_service.get_feed(db, project_id, limit=limit, before_id=before_id)
+
 # --- ÜYE YÖNETİMİ ---
 
 @router.post("/{project_id}/members", response_model=ProjectMemberDisplay)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
+
+from app.database import get_db
+from app.models import user_model
+from app.schemas.search_schemas import SearchPage
+from app.services.auth_service import get_current_user
+from app.services.search_service import search_service
+
+router = APIRouter(
+    prefix="/api/search",
+    tags=["Search"]
+)
+
+@router.get("/", response_model=SearchPage)
+def search_notes_and_tasks(
+    q: str = Query(..., min_length=1, max_length=200, description="Aranacak metin"),
+    type: Optional[Literal["note", "task"]] = Query(None, description="Sadece belirli bir türde ara"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: Session = Depends(get_db),
+    current_user: user_model.User = Depends(get_current_user)
+):
+    """
+    Kullanıcının notlarında ve üyesi olduğu projelerin görevlerinde tam metin arama yapar.
+    Sonuçlar alaka düzeyine göre sıralanır, eşleşmeler <mark> ile işaretlenir.
+    """
+    kinds = [type] if type else ["note", "task"]
+    return search_service.search(db, current_user.id, q, kinds, limit=limit, offset=offset)
@@ -0,0 +1,60 @@
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+from typing import List
+
+from app.schemas.system_schemas import ServiceCacheStats, InvalidationBusStats, CompressionStats, ProfileInfo, RateLimitStats
+from app.services.auth_service import get_system_admin
+from app.services.cache import service_cache
+from app.services.invalidation_bus import invalidation_bus
+from app.middleware.compression import response_compressor
+from app.middleware.profiling import profile_store
+from app.middleware.rate_limit import rate_limiter
+
+# Sistem metrikleri ve profiller altyapı ayrıntısı içerir: tüm endpoint'ler sadece
+# sistem yöneticilerine (ADMIN_EMAILS) açıktır
+router = APIRouter(
+    prefix="/api/system",
+    tags=["System"],
+    dependencies=[Depends(get_system_admin)]
+)
+
+@router.get("/cache-stats", response_model=ServiceCacheStats, summary="Servis önbelleği metrikleri")
+def get_service_cache_stats():
+    """Kullanılan backend ve her namespace için isabet/ıska ve geçersiz kılma sayıları."""
+    return service_cache.stats()
+
+@router.get("/invalidation-bus", response_model=InvalidationBusStats, summary="Worker'lar arası geçersiz kılma metrikleri")
+def get_invalidation_bus_stats():
+    """Kullanılan transport ve yayınlanan/alınan mesaj sayıları."""
+    return invalidation_bus.stats()
+
+@router.get("/compression", response_model=CompressionStats, summary="Yanıt sıkıştırma metrikleri")
+def get_compression_stats():
+    """Sıkıştırılan/atlanan yanıt sayıları, sıkıştırma oranı ve ön-sıkıştırılmış önbellek durumu."""
+    return response_compressor.stats()
+
+@router.get("/rate-limit", response_model=RateLimitStats, summary="Hız sınırlama metrikleri")
+def get_rate_limit_stats():
+    """Kurallar, kontrol edilen/429 dönen istek sayıları ve izlenen kova sayısı."""
+    return rate_limiter.stats()
+
+@router.get("/profiles", response_model=List[ProfileInfo], summary="Kaydedilen istek profilleri")
+def list_profiles(
+    limit: int = Query(50, ge=1, le=500)
+):
+    """En yeniden eskiye profil listesi (route, istek kimliği, süre, örnek sayısı)."""
+    return profile_store.list(limit)
+
+@router.get("/profiles/{profile_id}", response_class=FileResponse, summary="Profil dosyasını indir")
+def download_profile(
+    profile_id: str
+):
+    """Folded stack formatında profil (flamegraph.pl, speedscope, inferno ile açılır)."""
+    try:
+        path = profile_store.folded_path(profile_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profil bulunamadı.")
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profil bulunamadı.")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=f"{profile_id}.folded")
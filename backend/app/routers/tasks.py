@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
 from app.models import user_model
@@ -9,7 +9,9 @@ from app.models.project_member_model import ProjectMember
 from app.schemas import task_schemas
 # Servisler
 from app.services.auth_service import get_current_user, get_project_membership
-from app.services.task_service import task_service
+from app.services.task_service import task_service, TASK_DISPLAY_COLUMNS
+from app.conditional import check_not_modified
+from app import fast_json
 
 router = APIRouter(
     prefix="/api", 
@@ -22,9 +24,20 @@ router = APIRouter(
 @router.get("/projects/{project_id}/tasks", response_model=List[task_schemas.TaskDisplay])
 def get_tasks_for_project(
     project_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Virgülle alan listesi (örn. id,title,status,assignee_id); verilmezse tüm alanlar"),
     membership: ProjectMember = Depends(get_project_membership),
     db: Session = Depends(get_db)
 ):
+    projection, _ = fast_json.select_fields(TASK_DISPLAY_COLUMNS, fields)
+    # Görev listesi değişmediyse sorgu çalıştırılmadan 304 döner
+    not_modified = check_not_modified(request, response, ("project_tasks", project_id))
+    if not_modified:
+        return not_modified
+    # Alan seçimi yapılmışsa yanıt şemanın alt kümesidir; response_model yolu kullanılamaz
+    if fast_json.enabled or fields is not None:
+        return fast_json.json_response(task_service.get_task_rows_by_project(db, project_id, projection), response)
     return task_service.get_tasks_by_project(db, project_id)
 
 # 2. Görev Oluşturma
@@ -35,18 +48,23 @@ def create_task_in_project(
     membership: ProjectMember = Depends(get_project_membership),
     db: Session = Depends(get_db)
 ):
-    return task_service.create_task(db, task_data, project_id)
+    return task_service.create_task(db, task_data, project_id, actor_id=membership.user_id)
 
 # --- YENİ ENDPOINT: GÖREVLERİM (DÜZELTİLDİ) ---
 @router.get("/tasks/my-tasks", response_model=List[task_schemas.TaskWithProject])
 def get_my_assigned_tasks(
+    fields: Optional[str] = Query(None, description="Virgülle alan listesi (örn. id,title,due_date,project); verilmezse tüm alanlar"),
     db: Session = Depends(get_db), 
     current_user: user_model.User = Depends(get_current_user) 
 ):
     """
     Giriş yapmış kullanıcının kendisine atanmış TÜM görevleri listeler.
-    Proje detaylarını da içerir.
+    Proje detaylarını da içerir ('fields' içinde 'project' yoksa proje JOIN'i yapılmaz).
     """
+    projection, extras = fast_json.select_fields(TASK_DISPLAY_COLUMNS, fields, extra=("project",))
+    if fast_json.enabled or fields is not None:
+        return fast_json.json_response(task_service.get_assigned_task_rows(
+            db, current_user.id, projection, include_project="project" in extras))
     tasks = task_service.get_assigned_tasks(db, current_user.id)
     return tasks
 # ---------------------------------------------
@@ -72,7 +90,7 @@ def update_task_details(
     update_data = task_data.dict(exclude_unset=True)
     if not update_data:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Güncellenecek veri gönderilmedi.")
-    return task_service.update_task(db, db_task, update_data)
+    return task_service.update_task(db, db_task, update_data, actor_id=current_user.id)
 
 # 5. Görev Silme
 @router.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -82,7 +100,7 @@ def delete_task(
     current_user: user_model.User = Depends(get_current_user)
 ):
     db_task = task_service.verify_task_access(db, task_id, current_user.id)
-    task_service.delete_task(db, db_task)
+    task_service.delete_task(db, db_task, actor_id=current_user.id)
     return None 
 
 # 6. Status Güncelleme
@@ -94,4 +112,4 @@ def update_task_status(
     current_user: user_model.User = Depends(get_current_user)
 ):
     db_task = task_service.verify_task_access(db, task_id, current_user.id)
-    return task_service.update_task(db, db_task, {"status": status_update.status})
\ No newline at end of file
+    return task_service.update_task(db, db_task, {"status": status_update.status}, actor_id=current_user.id)
\ No newline at end of file
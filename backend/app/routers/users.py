@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -11,6 +11,7 @@ from app.schemas import user_schemas
 
 # 3. GÜVENLİK (Giriş yapan kullanıcıyı almak için)
 from app.services.auth_service import get_current_user
+from app.conditional import check_not_modified
 
 router = APIRouter(
     prefix="/api/users", # Yeni prefix'imiz
@@ -20,12 +21,18 @@ router = APIRouter(
 # --- YENİ ENDPOINT 1 (PROFIL BİLGİSİ GETİRME) ---
 @router.get("/me", response_model=user_schemas.UserDisplay)
 def get_current_user_profile(
+    request: Request,
+    response: Response,
     current_user: user_model.User = Depends(get_current_user)
 ):
     """
     Giriş yapmış mevcut kullanıcının profil bilgilerini döndürür.
     (Token'ı çözer ve kullanıcıyı döndürür)
+    Profil değişmediyse (If-None-Match) 304 döner.
     """
+    not_modified = check_not_modified(request, response, ("user", current_user.id))
+    if not_modified:
+        return not_modified
     return current_user
 
 # --- YENİ ENDPOINT 2 (PROFIL BİLGİSİ GÜNCELLEME) ---
@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+class ActivityActor(BaseModel):
+    """Olayı gerçekleştiren kullanıcının kısa bilgisi."""
+    id: int
+    email: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+
+class ActivityDisplay(BaseModel):
+    """
+    Aktivite akışındaki tek bir olay.
+    'details' olaya göre değişir: görev başlığı, üye e-postası veya
+    güncellemelerde {alan: [eski, yeni]} biçiminde 'changes'.
+    """
+    id: int
+    event: str
+    task_id: Optional[int] = None
+    details: Dict[str, Any] = {}
+    created_at: datetime
+    # Kullanıcı silindiyse None
+    actor: Optional[ActivityActor] = None
+
+class ActivityPage(BaseModel):
+    """
+    Keyset sayfalı aktivite akışı.
+    'next_cursor' bir sonraki sayfa için 'before_id' olarak gönderilir (son sayfada None).
+    """
+    items: List[ActivityDisplay]
+    next_cursor: Optional[int] = None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Literal, Optional
+from datetime import datetime
 
 # --- AI Çıktı Formatı ---
 class ProjectAnalysis(BaseModel):
@@ -16,7 +17,176 @@ class ProjectAnalysis(BaseModel):
     
     sentiment: str = Field(..., description="Projenin genel havası: 'Pozitif', 'Nötr' veya 'Negatif'.")
 
+# --- AI Anlatı Formatı (Skorlar yerelde hesaplanır) ---
+class ProjectNarrative(BaseModel):
+    """LLM'den sadece yorum kısmı istenir; risk/performans skorları AnalyticsService'ten gelir."""
+
+    summary: str = Field(..., description="Projenin genel durumu, darboğazlar ve başarıların detaylı özeti.")
+
+    recommendations: List[str] = Field(..., description="Yöneticinin alması gereken 3-5 adet somut, uygulanabilir aksiyon önerisi.")
+
+    sentiment: str = Field(..., description="Projenin genel havası: 'Pozitif', 'Nötr' veya 'Negatif'.")
+
+# --- Yerel (Deterministik) Skorlar ---
+class CategoryBottleneck(BaseModel):
+    category: str
+    open_tasks: int
+    open_points: int
+    overdue_tasks: int
+    share: float # Açık iş puanları içindeki pay (0-1)
+
+class MemberWorkload(BaseModel):
+    user_id: int
+    open_points: int
+
+class ProjectScores(BaseModel):
+    """Görev verisinden doğrudan hesaplanan skorlar (LLM kullanılmaz)."""
+    risk_score: int = Field(..., description="0-100, yüksek = riskli")
+    performance_score: int = Field(..., description="0-100, yüksek = verimli")
+    workload_balance: int = Field(..., description="0-100, 100 = iş yükü üyelere eşit dağılmış")
+    completion_rate: float
+    total_tasks: int
+    open_tasks: int
+    overdue_tasks: int
+    bottlenecks: List[CategoryBottleneck]
+    workload: List[MemberWorkload]
+
 # --- API Yanıt Formatı ---
 class AnalysisResponse(BaseModel):
     project_id: int
-    analysis: ProjectAnalysis
\ No newline at end of file
+    analysis: ProjectAnalysis
+    scores: Optional[ProjectScores] = None # Yerel skor motorunun detaylı çıktısı
+    cached: bool = False # Sonuç önbellekten mi geldi?
+    fingerprint: Optional[str] = None # Analiz edilen verinin parmak izi
+    incremental: bool = False # Sadece son analizden beri değişen görevler mi gönderildi?
+
+# --- Önbellek Metrikleri ---
+class AnalysisCacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    persistent_hits: int
+    evictions: int
+    expirations: int
+    size: int
+
+# --- Asenkron Analiz İşi ---
+class AnalysisJobDisplay(BaseModel):
+    """
+    Arka planda çalışan analiz işinin durumu.
+    status: 'queued' | 'running' | 'done' | 'failed'. Sonuç 'done' olduğunda dolar.
+    """
+    job_id: str
+    project_id: int
+    status: str
+    progress: int = Field(..., description="0-100 arası ilerleme yüzdesi")
+    stage: str
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+# --- Prompt Boyutu Metrikleri ---
+class PromptSizeStats(BaseModel):
+    """Eski (girintili) format ile kompakt format ve bütçe sonrası karakter sayıları."""
+    snapshots: int
+    trimmed_snapshots: int
+    legacy_chars_total: int
+    compact_chars_total: int
+    final_chars_total: int
+    last_legacy_chars: int
+    last_compact_chars: int
+    last_final_chars: int
+    estimated_tokens_saved: int
+    compression_ratio: float
+
+
+# --- Portföy (Toplu) Analiz ---
+class PortfolioProject(BaseModel):
+    """Portföy sıralamasındaki tek bir proje (risk skoruna göre sıralanır)."""
+    project_id: int
+    name: str
+    risk_score: int
+    performance_score: int
+    open_tasks: int
+    overdue_tasks: int
+    status: str = Field(..., description="'unchanged' (önbellekten), 'pending' (AI bekleniyor), 'done', 'failed' veya 'timed_out'")
+
+class PortfolioOverview(BaseModel):
+    """Akışın ilk satırı: yerel skorlarla anında üretilen risk sıralaması."""
+    type: Literal["overview"] = "overview"
+    projects: List[PortfolioProject]
+
+class PortfolioResult(BaseModel):
+    """Her proje analizi tamamlandıkça gönderilen satır."""
+    type: Literal["result"] = "result"
+    project_id: int
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+
+class PortfolioDone(BaseModel):
+    """Akışın son satırı: son durumla risk sıralaması."""
+    type: Literal["done"] = "done"
+    analyzed: int
+    unchanged: int
+    failed: int
+    # Akışın bekleme süresi içinde bitmeyen analizler (arka planda sürebilir)
+    timed_out: int = 0
+    ranking: List[PortfolioProject]
+
+
+# --- Analiz Geçmişi ve Skor Trendleri ---
+class AnalysisHistoryItem(BaseModel):
+    """Saklanan tek bir AI analizi."""
+    id: int
+    created_at: datetime
+    fingerprint: str
+    risk_score: int
+    performance_score: int
+    sentiment: Optional[str] = None
+    summary: str
+    incremental: bool
+    prompt_chars: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+class ScoreTrendPoint(BaseModel):
+    created_at: datetime
+    risk_score: int
+    performance_score: int
+
+class ScoreTrend(BaseModel):
+    """Saklanan analizlerden (eskiden yeniye) skor trendi."""
+    project_id: int
+    points: List[ScoreTrendPoint]
+    risk_change: int = Field(0, description="Son analiz ile ilk analiz arasındaki risk farkı")
+    performance_change: int = Field(0, description="Son analiz ile ilk analiz arasındaki performans farkı")
+
+
+# --- AI Gateway Metrikleri ---
+class CircuitBreakerStats(BaseModel):
+    state: str = Field(..., description="'closed', 'open' veya 'half_open'")
+    consecutive_failures: int
+    opened_total: int
+
+class LatencyStats(BaseModel):
+    count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+class AIGatewayStats(BaseModel):
+    requests: int
+    successes: int
+    failures: int
+    timeouts: int
+    retries: int
+    retries_denied: int
+    rate_limited: int
+    short_circuited: int
+    retry_tokens: float
+    timeout_seconds: float
+    breaker: CircuitBreakerStats
+    latency: LatencyStats
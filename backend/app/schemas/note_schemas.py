@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
 
 # --- Not Şemaları ---
 
@@ -29,6 +30,58 @@ class NoteDisplay(BaseModel):
     title: str
     content: Optional[str] = None
     user_id: int # Notun sahibini bilmek için
+    version: int = 1 # PATCH isteklerinde 'base_version' olarak gönderilir
 
     class Config:
-        from_attributes = True # (Bu 'orm_mode = True' idi)
\ No newline at end of file
+        from_attributes = True # (Bu 'orm_mode = True' idi)
+
+# --- Hafif Liste Şemaları (Kenar Çubuğu İçin) ---
+
+class NoteSummary(BaseModel):
+    """
+    Not listesinde kullanılan hafif şema.
+    'content' yerine sunucuda hesaplanan kısa bir önizleme (excerpt) döner.
+    """
+    id: int
+    title: str
+    excerpt: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class NotePage(BaseModel):
+    """
+    Keyset sayfalı not listesi.
+    'next_cursor' bir sonraki sayfa için 'before_id' olarak gönderilir (son sayfada None).
+    """
+    items: List[NoteSummary]
+    next_cursor: Optional[int] = None
+
+
+# --- Delta (PATCH) Şemaları (Otomatik Kaydetme İçin) ---
+
+class NoteTextOp(BaseModel):
+    """
+    Tek bir metin değişikliği: 'position' konumundan itibaren 'delete' kadar
+    karakter silinir ve yerine 'insert' eklenir. İşlemler sırayla uygulanır;
+    her işlemin konumu bir önceki işlem uygulanmış metne göredir.
+    """
+    position: int = Field(..., ge=0)
+    delete: int = Field(0, ge=0)
+    insert: str = ""
+
+class NotePatch(BaseModel):
+    """Notun bilinen son sürümüne ('base_version') uygulanacak değişiklikler."""
+    base_version: int
+    ops: List[NoteTextOp] = []
+    title: Optional[str] = None
+
+class NotePatchResult(BaseModel):
+    """
+    PATCH sonucu. 'persisted' False ise değişiklik bellekte birleştiriliyor,
+    kısa süre içinde veritabanına yazılacak.
+    """
+    id: int
+    version: int
+    persisted: bool
@@ -1,6 +1,9 @@
 from pydantic import BaseModel
 from typing import List, Optional # 'Optional' import edildi
 from app.schemas.project_member_schemas import ProjectMemberDisplay 
+from app.schemas.task_schemas import TaskDisplay
+from app.schemas.analysis_schemas import ProjectScores
+from app.models.project_member_model import ProjectRole
 
 class ProjectBase(BaseModel):
     name: str
@@ -27,4 +30,14 @@ class ProjectUpdate(BaseModel):
     kullanıcıdan alınacak veri. Tüm alanlar opsiyoneldir.
     """
     name: Optional[str] = None
-    description: Optional[str] = None
\ No newline at end of file
+    description: Optional[str] = None
+# --- PROJE ÖZETİ (TEK İSTEK) ---
+class ProjectOverview(BaseModel):
+    """
+    Proje detay ve analiz sayfaları için tek yanıt:
+    proje + üyeler, isteyenin rolü, pano görevleri ve yerel skorlar.
+    """
+    project: ProjectDisplay
+    my_role: ProjectRole
+    tasks: List[TaskDisplay]
+    stats: ProjectScores
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+class SearchHit(BaseModel):
+    """
+    Tek bir arama sonucu (not veya görev).
+    'title' ve 'snippet' HTML-escape edilmiştir; içlerindeki tek HTML etiketi
+    eşleşmeleri işaretleyen <mark>...</mark> çiftidir.
+    """
+    kind: Literal["note", "task"]
+    id: int
+    project_id: Optional[int] = None # Sadece görevler için
+    title: str
+    snippet: Optional[str] = None
+    rank: float
+
+class SearchPage(BaseModel):
+    """Sıralı ve sayfalı arama sonucu. Son sayfada 'next_offset' None döner."""
+    query: str
+    items: List[SearchHit]
+    next_offset: Optional[int] = None
@@ -0,0 +1,70 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+# --- Servis Önbelleği Metrikleri ---
+class CacheNamespaceStats(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    invalidations: int
+    ttl_seconds: int
+
+class ServiceCacheStats(BaseModel):
+    backend: str
+    evictions: int
+    namespaces: Dict[str, CacheNamespaceStats]
+
+# --- Invalidation Bus Metrikleri ---
+class InvalidationBusStats(BaseModel):
+    transport: str
+    running: bool
+    published: int
+    received: int
+    resyncs: int
+    errors: int
+
+# --- Yanıt Sıkıştırma Metrikleri ---
+class PrecompressedCacheStats(BaseModel):
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+
+class CompressionStats(BaseModel):
+    enabled: bool
+    encodings: List[str]
+    compressed: int
+    skipped_small: int
+    skipped_type: int
+    streamed: int
+    not_accepted: int
+    bytes_in: int
+    bytes_out: int
+    ratio: float
+    cache: PrecompressedCacheStats
+
+# --- Hız Sınırlama ---
+class RateLimitStats(BaseModel):
+    enabled: bool
+    backend: Optional[str]
+    rules: List[str]
+    checked: int
+    limited: int
+    # redis backend'inde -1 (kovalar Redis'te tutulur)
+    tracked_keys: int
+    evictions: int
+
+# --- İstek Profilleri ---
+class ProfileInfo(BaseModel):
+    id: str
+    request_id: str
+    method: str
+    path: str
+    route: str
+    status: int
+    duration_ms: float
+    samples: int
+    created_at: str
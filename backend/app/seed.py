@@ -0,0 +1,293 @@
+# backend/app/seed.py
+"""
+Yüksek hacimli sentetik veri üretici (benchmark ve indeks çalışmaları için).
+
+app/models altındaki gerçek tablolara gerçekçi dağılımlarla kullanıcı, proje, üyelik,
+görev, bildirim ve not yazar. ORM kullanılmaz:
+  - PostgreSQL: COPY ... FROM STDIN (psycopg2 copy_expert),
+  - diğerleri (SQLite): Core insert ile executemany (tek transaction).
+Aynı seed ve aynı başlangıç durumu her zaman aynı veriyi üretir. Id'ler mevcut en büyük
+id'den devam eder; PostgreSQL'de yükleme sonrası sequence'ler güncellenir.
+
+Kullanım (backend klasöründen, DATABASE_URL ayarlı ve migration'lar uygulanmış olmalı):
+    python -m app.seed --users 100000 --projects 10000 --tasks-per-project 200 --seed 42
+
+Tüm kullanıcıların şifresi aynıdır (--password, varsayılan 'seedpass123').
+"""
+import argparse
+import csv
+import io
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.models import User, Project, ProjectMember, ProjectRole, Task, Notification, Note
+from app.models.task_model import TaskStatus, TaskPriority, TaskCategory
+
+# --- DAĞILIMLAR ---
+
+STATUS_WEIGHTS = [(TaskStatus.beklemede, 45), (TaskStatus.yapılıyor, 25), (TaskStatus.tamamlandı, 30)]
+PRIORITY_WEIGHTS = [(TaskPriority.dusuk, 20), (TaskPriority.orta, 45), (TaskPriority.yuksek, 25), (TaskPriority.kritik, 10)]
+STORY_POINT_WEIGHTS = [(1, 15), (2, 25), (3, 25), (5, 20), (8, 10), (13, 5)]
+CATEGORY_WEIGHTS = [(TaskCategory.backend, 28), (TaskCategory.frontend, 25), (TaskCategory.test, 14),
+                    (TaskCategory.tasarim, 12), (TaskCategory.devops, 9), (TaskCategory.diger, 12)]
+
+FIRST_NAMES = ["Ahmet", "Ayşe", "Mehmet", "Elif", "Mustafa", "Zeynep", "Emre", "Selin", "Burak", "Deniz",
+               "Can", "Ece", "Kerem", "Merve", "Oğuz", "Derya", "Hakan", "Gizem", "Onur", "Buse"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın", "Arslan", "Doğan",
+              "Kılıç", "Aslan", "Koç", "Kurt", "Özdemir"]
+TITLES = ["Yazılım Geliştirici", "Kıdemli Geliştirici", "Ürün Yöneticisi", "Tasarımcı", "Test Uzmanı",
+          "DevOps Mühendisi", "Takım Lideri", None]
+PROJECT_WORDS = ["Mobil", "Web", "Ödeme", "Raporlama", "Envanter", "CRM", "Kampanya", "Altyapı", "Analitik", "Portal"]
+TASK_VERBS = ["Düzelt", "Ekle", "Güncelle", "Test et", "Tasarla", "Optimize et", "Belgele", "Gözden geçir"]
+TASK_OBJECTS = ["giriş ekranı", "API uç noktası", "rapor sayfası", "bildirim servisi", "veritabanı indeksi",
+                "ödeme akışı", "kullanıcı profili", "arama", "dağıtım hattı", "performans testi"]
+NOTIFICATION_TEMPLATES = [
+    ("Yeni Görev Ataması", "'{project}' projesinde '{task}' görevi size atandı."),
+    ("Görev Size Devredildi", "'{project}' projesinde '{task}' görevi size devredildi."),
+    ("Yeni Proje Üyeliği", "'{project}' projesine üye olarak eklendiniz."),
+]
+
+
+@dataclass
+class SeedConfig:
+    users: int = 1000
+    projects: int = 100
+    # Proje başına ortalama görev (gamma dağılımı: çoğu proje küçük, birkaçı çok büyük)
+    tasks_per_project: float = 50
+    # Proje başına ortalama üye (log-normal, en az 1, en fazla max_members)
+    members_per_project: float = 4
+    max_members: int = 40
+    notifications_per_user: float = 10
+    notes_per_user: float = 2
+    seed: int = 42
+    batch_size: int = 20000
+    password: str = "seedpass123"
+
+
+@dataclass
+class SeedResult:
+    # tablo -> yazılan satır sayısı
+    counts: Dict[str, int] = field(default_factory=dict)
+    # tablo -> (ilk id, son id)
+    id_ranges: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+def _weighted(rng: random.Random, weights: Sequence[Tuple[object, int]]):
+    """Ağırlıklı seçim için (değerler, kümülatif ağırlıklar) hazırlar; rng.choices ile kullanılır."""
+    values = [v for v, _ in weights]
+    cumulative, total = [], 0
+    for _, w in weights:
+        total += w
+        cumulative.append(total)
+    return lambda: rng.choices(values, cum_weights=cumulative)[0]
+
+
+def _gamma_count(rng: random.Random, mean: float, shape: float = 1.5) -> int:
+    if mean <= 0:
+        return 0
+    return int(round(rng.gammavariate(shape, mean / shape)))
+
+
+# --- YÜKLEYİCİLER ---
+
+class _Loader:
+    """Tablo başına satır tamponu; tampon dolunca dialect'in en hızlı yoluyla yazar."""
+
+    def __init__(self, conn: Connection, batch_size: int):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.postgres = conn.dialect.name == "postgresql"
+        self._buffers: Dict[str, List[tuple]] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, model, row: tuple) -> None:
+        name = model.__tablename__
+        buffer = self._buffers.setdefault(name, [])
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model) -> None:
+        table = model.__table__
+        rows = self._buffers.pop(table.name, None)
+        if not rows:
+            return
+        columns = [c.name for c in table.columns]
+        if self.postgres:
+            self._copy(table.name, columns, rows)
+        else:
+            self.conn.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+        self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+
+    def _copy(self, table_name: str, columns: List[str], rows: List[tuple]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            # Enum'lar veritabanında isimleriyle saklanır; None -> boş alan (COPY CSV'de NULL)
+            writer.writerow([v.name if isinstance(v, (TaskStatus, TaskPriority, TaskCategory, ProjectRole))
+                             else ("" if v is None else v) for v in row])
+        buffer.seek(0)
+        cursor = self.conn.connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+
+
+def _next_id(conn: Connection, model) -> int:
+    return (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _reset_sequences(conn: Connection, models) -> None:
+    for model in models:
+        table = model.__tablename__
+        conn.exec_driver_sql(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {table}))"
+        )
+
+
+# --- ÜRETİM ---
+
+def seed_database(engine: Engine, config: SeedConfig) -> SeedResult:
+    """Sentetik veriyi tek transaction içinde yazar ve özetini döndürür."""
+    from app.services.auth_service import get_password_hash
+
+    started = time.perf_counter()
+    rng = random.Random(config.seed)
+    pick_status = _weighted(rng, STATUS_WEIGHTS)
+    pick_priority = _weighted(rng, PRIORITY_WEIGHTS)
+    pick_points = _weighted(rng, STORY_POINT_WEIGHTS)
+    pick_category = _weighted(rng, CATEGORY_WEIGHTS)
+    # Tüm kullanıcılar aynı hash'i paylaşır (bcrypt kullanıcı başına saniyeler alırdı)
+    hashed_password = get_password_hash(config.password)
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    result = SeedResult()
+
+    with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA synchronous = OFF")
+        loader = _Loader(conn, config.batch_size)
+        first = {model: _next_id(conn, model) for model in (User, Project, ProjectMember, Task, Notification, Note)}
+
+        # Kullanıcılar
+        user_ids = range(first[User], first[User] + config.users)
+        for user_id in user_ids:
+            loader.add(User, (
+                user_id, f"user{user_id}@seed.example.com", hashed_password,
+                rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(TITLES),
+            ))
+        loader.flush(User)
+
+        # Projeler
+        project_names = {}
+        project_ids = range(first[Project], first[Project] + config.projects)
+        for project_id in project_ids:
+            name = f"{rng.choice(PROJECT_WORDS)} {rng.choice(PROJECT_WORDS)} #{project_id}"
+            project_names[project_id] = name
+            loader.add(Project, (project_id, name, f"{name} için sentetik proje açıklaması."))
+        loader.flush(Project)
+
+        # Üyelikler + görevler (proje proje; görevler o projenin üyelerine atanır)
+        member_id, task_id = first[ProjectMember], first[Task]
+        task_titles: List[Tuple[str, str]] = []
+        mu = math.log(max(config.members_per_project, 1))
+        for project_id in project_ids:
+            size = min(config.max_members, len(user_ids), max(1, int(round(rng.lognormvariate(mu, 0.6)))))
+            team = set()
+            while len(team) < size:
+                # Kare alma küçük id'lere yoğunlaşır: bazı kullanıcılar çok sayıda projede olur
+                team.add(user_ids[int(len(user_ids) * rng.random() ** 2)])
+            team = sorted(team)
+            owner = rng.choice(team)
+            for user_id in team:
+                loader.add(ProjectMember, (member_id, project_id, user_id,
+                                           ProjectRole.admin if user_id == owner else ProjectRole.member))
+                member_id += 1
+
+            for _ in range(_gamma_count(rng, config.tasks_per_project)):
+                status = pick_status()
+                updated_at = now - timedelta(minutes=rng.randint(0, 90 * 24 * 60))
+                due_date = now + timedelta(days=rng.gauss(7, 21)) if rng.random() < 0.85 else None
+                completed_at = None
+                if status == TaskStatus.tamamlandı:
+                    completed_at = min(now, (due_date or updated_at) + timedelta(days=rng.gauss(-1, 4)))
+                title = f"{rng.choice(TASK_OBJECTS).capitalize()}: {rng.choice(TASK_VERBS)} #{task_id}"
+                loader.add(Task, (
+                    task_id, title, f"{title} için açıklama. " * rng.randint(1, 6), status,
+                    due_date, completed_at, updated_at, pick_priority(), pick_points(), pick_category(),
+                    project_id, rng.choice(team) if rng.random() < 0.8 else None,
+                ))
+                if len(task_titles) < 10000:
+                    task_titles.append((project_names[project_id], title))
+                task_id += 1
+        loader.flush(ProjectMember)
+        loader.flush(Task)
+
+        # Bildirimler (eskiler çoğunlukla okunmuş)
+        notification_id, note_id = first[Notification], first[Note]
+        for user_id in user_ids:
+            for _ in range(_gamma_count(rng, config.notifications_per_user)):
+                title, template = rng.choice(NOTIFICATION_TEMPLATES)
+                project, task = rng.choice(task_titles) if task_titles else ("Proje", "Görev")
+                age_days = rng.expovariate(1 / 15)
+                loader.add(Notification, (
+                    notification_id, user_id, title, template.format(project=project, task=task),
+                    rng.random() < min(0.95, age_days / 10), now - timedelta(days=age_days),
+                ))
+                notification_id += 1
+            for _ in range(_gamma_count(rng, config.notes_per_user)):
+                loader.add(Note, (
+                    note_id, f"Not {note_id}", "Toplantı notları ve yapılacaklar. " * rng.randint(1, 40),
+                    user_id, now - timedelta(days=rng.expovariate(1 / 30)), 1,
+                ))
+                note_id += 1
+        loader.flush(Notification)
+        loader.flush(Note)
+
+        if loader.postgres:
+            _reset_sequences(conn, (User, Project, ProjectMember, Task, Notification, Note))
+
+    for model in (User, Project, ProjectMember, Task, Notification, Note):
+        count = loader.counts.get(model.__tablename__, 0)
+        result.counts[model.__tablename__] = count
+        result.id_ranges[model.__tablename__] = (first[model], first[model] + count - 1)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    defaults = SeedConfig()
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--projects", type=int, default=defaults.projects)
+    parser.add_argument("--tasks-per-project", type=float, default=defaults.tasks_per_project, help="Ortalama")
+    parser.add_argument("--members-per-project", type=float, default=defaults.members_per_project, help="Ortalama")
+    parser.add_argument("--max-members", type=int, default=defaults.max_members)
+    parser.add_argument("--notifications-per-user", type=float, default=defaults.notifications_per_user, help="Ortalama")
+    parser.add_argument("--notes-per-user", type=float, default=defaults.notes_per_user, help="Ortalama")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size)
+    parser.add_argument("--password", default=defaults.password)
+    args = parser.parse_args()
+
+    from app.database import engine
+
+    config = SeedConfig(**{name: getattr(args, name) for name in SeedConfig.__dataclass_fields__})
+    result = seed_database(engine, config)
+    for table, count in result.counts.items():
+        first_id, last_id = result.id_ranges[table]
+        print(f"{table:<18}{count:>12,} satır  (id {first_id} - {last_id})")
+    total = sum(result.counts.values())
+    print(f"Toplam {total:,} satır, {result.seconds:.1f} sn ({total / result.seconds:,.0f} satır/sn)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import enum
+import json
+from datetime import date, datetime
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+
+from app.models.activity_model import ProjectActivity
+from app.models.user_model import User
+from app.schemas import activity_schemas
+
+# Olay adları (istemciler bunlara göre ikon/metin seçer)
+PROJECT_CREATED = "project.created"
+PROJECT_UPDATED = "project.updated"
+TASK_CREATED = "task.created"
+TASK_UPDATED = "task.updated"
+TASK_DELETED = "task.deleted"
+MEMBER_ADDED = "member.added"
+MEMBER_REMOVED = "member.removed"
+MEMBER_ROLE_CHANGED = "member.role_changed"
+
+
+def _json_default(value: Any) -> Any:
+    # Ayrıntılarda enum (durum, öncelik, rol) ve tarih değerleri bulunabilir
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"JSON'a çevrilemeyen değer: {type(value).__name__}")
+
+
+class ActivityService:
+
+    @staticmethod
+    def record(db: Session, project_id: int, actor_id: Optional[int], event: str,
+               task_id: Optional[int] = None, details: Optional[Dict[str, Any]] = None) -> ProjectActivity:
+        """
+        Olayı session'a ekler, commit etmez: kayıt, çağıran servisin commit'iyle
+        değişikliğin kendisiyle aynı transaction'da yazılır (ya ikisi ya hiçbiri).
+        """
+        activity = ProjectActivity(
+            project_id=project_id,
+            actor_id=actor_id,
+            event=event,
+            task_id=task_id,
+            details=json.dumps(details, ensure_ascii=False, default=_json_default) if details else None,
+        )
+        db.add(activity)
+        return activity
+
+    @staticmethod
+    def changes(obj: Any, update_data: Dict[str, Any]) -> Dict[str, list]:
+        """Güncellemeden ÖNCE çağrılır: gerçekten değişen alanlar için {alan: [eski, yeni]}."""
+        return {
+            key: [getattr(obj, key), value]
+            for key, value in update_data.items()
+            if getattr(obj, key) != value
+        }
+
+    @staticmethod
+    def get_feed(db: Session, project_id: int, limit: int = 50, before_id: Optional[int] = None) -> activity_schemas.ActivityPage:
+        """
+        Projenin aktivite akışı, en yeniden eskiye keyset sayfalı.
+        (project_id, id) indeksi sayesinde maliyet geçmişin uzunluğundan değil sayfa boyutundan gelir.
+        İşlemi yapan kullanıcının adı aynı sorguda (outer join) alınır.
+        """
+        query = db.query(
+            ProjectActivity.id,
+            ProjectActivity.event,
+            ProjectActivity.task_id,
+            ProjectActivity.details,
+            ProjectActivity.created_at,
+            ProjectActivity.actor_id,
+            User.email,
+            User.first_name,
+            User.last_name,
+        ).outerjoin(User, User.id == ProjectActivity.actor_id).filter(ProjectActivity.project_id == project_id)
+
+        if before_id is not None:
+            query = query.filter(ProjectActivity.id < before_id)
+
+        # Bir fazla satır çekerek sonraki sayfanın varlığını anlarız
+        rows = query.order_by(ProjectActivity.id.desc()).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = [
+            activity_schemas.ActivityDisplay(
+                id=row.id,
+                event=row.event,
+                task_id=row.task_id,
+                details=json.loads(row.details) if row.details else {},
+                created_at=row.created_at,
+                actor=activity_schemas.ActivityActor(
+                    id=row.actor_id, email=row.email, first_name=row.first_name, last_name=row.last_name,
+                ) if row.actor_id is not None and row.email is not None else None,
+            )
+            for row in rows
+        ]
+        next_cursor = items[-1].id if has_more else None
+        return activity_schemas.ActivityPage(items=items, next_cursor=next_cursor)
+
+activity_service = ActivityService()
@@ -0,0 +1,402 @@
+import queue
+import threading
+import time
+from collections import deque
+from pydantic import BaseModel
+from typing import Dict, Iterator, Optional, Type, TypeVar
+
+from app.config import (
+    AI_MAX_CONCURRENT_CALLS, AI_CALL_TIMEOUT_SECONDS,
+    AI_RATE_LIMIT_GLOBAL_PER_MINUTE, AI_RATE_LIMIT_PROJECT_PER_MINUTE, AI_RATE_LIMIT_MAX_WAIT_SECONDS,
+    AI_BREAKER_FAILURE_THRESHOLD, AI_BREAKER_RESET_SECONDS,
+    AI_RETRY_MAX_ATTEMPTS, AI_RETRY_BUDGET_RATIO, AI_RETRY_BACKOFF_SECONDS,
+)
+from app.services.ai_providers import AIProvider
+from app.metrics import metrics, LLM_CALLS, LLM_CALL_SECONDS
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# Geçici sayılan HTTP hata kodları (tekrar denenebilir)
+_RETRYABLE_CODES = {429, 500, 502, 503, 504}
+
+
+# --- HATALAR ---
+
+class AIGatewayError(Exception):
+    """Gateway'in çağrıyı sağlayıcıya hiç iletmeden reddettiği durumlar."""
+
+class CircuitOpenError(AIGatewayError):
+    pass
+
+class RateLimitedError(AIGatewayError):
+    pass
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, AIGatewayError):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # google.genai.errors.APIError 'code' alanında HTTP durum kodunu taşır
+    return getattr(error, "code", None) in _RETRYABLE_CODES
+
+
+# --- YAPI TAŞLARI ---
+
+class _StreamEnd:
+    """Akış kuyruğunun son öğesi; sağlayıcı hata verdiyse hatayı taşır."""
+    __slots__ = ("error",)
+
+    def __init__(self, error: Optional[Exception] = None):
+        self.error = error
+
+
+class TokenBucket:
+    """Saniyede 'rate' jeton dolan, en fazla 'capacity' jeton tutan kova. Kilidi çağıran tutar."""
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+    def wait_time(self) -> float:
+        """Bir jeton için beklenmesi gereken süre (refill sonrası çağrılmalı)."""
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Global ve proje başına token bucket. Bir çağrı iki kovadan da jeton alabiliyorsa geçer;
+    alamıyorsa en fazla 'max_wait' saniye bekler, sonra RateLimitedError fırlatır.
+    """
+
+    # Bu kadar proje kovası birikince dolu (boşta) olanlar silinir
+    MAX_PROJECT_BUCKETS = 1024
+
+    def __init__(self, global_per_minute: int, project_per_minute: int, max_wait: float):
+        self.project_per_minute = project_per_minute
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._global = TokenBucket(global_per_minute / 60, global_per_minute)
+        self._projects: Dict[int, TokenBucket] = {}
+
+    def acquire(self, project_id: Optional[int]) -> None:
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                buckets = [self._global]
+                if project_id is not None:
+                    buckets.append(self._project_bucket(project_id))
+                for bucket in buckets:
+                    bucket.refill(now)
+                wait = max(bucket.wait_time() for bucket in buckets)
+                if wait == 0:
+                    for bucket in buckets:
+                        bucket.tokens -= 1
+                    return
+            if now + wait > deadline:
+                raise RateLimitedError("AI çağrı hız sınırı aşıldı.")
+            time.sleep(wait)
+
+    def _project_bucket(self, project_id: int) -> TokenBucket:
+        bucket = self._projects.get(project_id)
+        if bucket is None:
+            if len(self._projects) >= self.MAX_PROJECT_BUCKETS:
+                self._evict_idle()
+            bucket = self._projects[project_id] = TokenBucket(self.project_per_minute / 60, self.project_per_minute)
+        return bucket
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for project_id, bucket in list(self._projects.items()):
+            bucket.refill(now)
+            if bucket.tokens >= bucket.capacity:
+                del self._projects[project_id]
+
+
+class CircuitBreaker:
+    """
+    Art arda 'failure_threshold' hatadan sonra açılır (çağrılar hemen reddedilir).
+    'reset_seconds' sonra yarı açık duruma geçer ve tek bir deneme çağrısına izin verir:
+    başarılıysa kapanır, başarısızsa tekrar açılır.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._opened_total = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._state, self._probe_in_flight = self.HALF_OPEN, False
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """İzin alınmış ama sağlayıcıya hiç gitmemiş bir çağrıyı geri bırakır."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state, self._failures, self._probe_in_flight = self.CLOSED, 0, False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or (self._state == self.CLOSED and self._failures >= self.failure_threshold):
+                self._state, self._opened_at = self.OPEN, time.monotonic()
+                self._opened_total += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            state = self._state
+            if state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                state = self.HALF_OPEN
+            return {"state": state, "consecutive_failures": self._failures, "opened_total": self._opened_total}
+
+
+class RetryBudget:
+    """
+    Tekrar denemeleri toplam çağrıların belli bir oranıyla sınırlar: her çağrı 'ratio'
+    jeton ekler, her tekrar deneme bir jeton harcar. Sağlayıcı tamamen çöktüğünde
+    tekrar denemeler yükü katlamaz.
+    """
+
+    def __init__(self, ratio: float, min_tokens: float = 3.0, max_tokens: float = 50.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            return self._tokens
+
+
+class LatencyRecorder:
+    """Son 'size' başarılı çağrının süresini tutar; yüzdelikleri hesaplar."""
+
+    def __init__(self, size: int = 2048):
+        self._samples: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+
+        def pct(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 2)
+
+        return {"count": len(samples), "p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99)}
+
+
+# --- GATEWAY ---
+
+class AIGateway:
+    """
+    LLM sağlayıcı çağrılarının tek geçiş noktası:
+    devre kesici -> hız sınırı -> eşzamanlılık sınırı -> zaman aşımlı çağrı -> (bütçe varsa) tekrar deneme.
+    Reddedilen/başarısız çağrılar exception fırlatır; yedek yanıtı AIService üretir.
+    """
+
+    def __init__(self, max_concurrent: int, timeout_seconds: float,
+                 global_per_minute: int, project_per_minute: int, max_wait_seconds: float,
+                 failure_threshold: int, reset_seconds: float,
+                 max_attempts: int, retry_ratio: float, backoff_seconds: float):
+        self.timeout_seconds = timeout_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.limiter = RateLimiter(global_per_minute, project_per_minute, max_wait_seconds)
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self.retry_budget = RetryBudget(retry_ratio)
+        self.latency = LatencyRecorder()
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0, "successes": 0, "failures": 0, "timeouts": 0,
+            "retries": 0, "retries_denied": 0, "rate_limited": 0, "short_circuited": 0,
+        }
+
+    def generate(self, provider: AIProvider, prompt: str, schema: Type[SchemaT], project_id: Optional[int] = None) -> SchemaT:
+        self._admit(provider, project_id)
+        attempt = 1
+        while True:
+            started = time.monotonic()
+            try:
+                with self.slots:
+                    result = provider.generate(prompt, schema, timeout=self.timeout_seconds)
+            except Exception as e:
+                self._record_failure(provider, e, time.monotonic() - started)
+                if not self._should_retry(e, attempt):
+                    raise
+                time.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+                attempt += 1
+                continue
+            self._record_success(provider, time.monotonic() - started)
+            return result
+
+    def stream(self, provider: AIProvider, prompt: str, schema: Type[SchemaT], project_id: Optional[int] = None) -> Iterator[str]:
+        """
+        Akışlı çağrı. Henüz hiç parça gönderilmediyse hata sonrası tekrar denenebilir;
+        parça gönderildikten sonraki hatalar doğrudan iletilir.
+        Sağlayıcı ayrı bir thread'de okunur ve parçalar kuyruğa alınır: eşzamanlılık slotu
+        sağlayıcı bitince bırakılır, yavaş okuyan (veya kopan) istemci slotu tutmaz.
+        """
+        self._admit(provider, project_id)
+        attempt = 1
+        while True:
+            chunks: "queue.Queue" = queue.Queue()
+            threading.Thread(
+                target=self._pump, args=(provider, prompt, schema, chunks), name="ai-stream", daemon=True
+            ).start()
+            sent_any = False
+            while True:
+                item = chunks.get()
+                if isinstance(item, _StreamEnd):
+                    break
+                sent_any = True
+                yield item
+            if item.error is None:
+                return
+            if sent_any or not self._should_retry(item.error, attempt):
+                raise item.error
+            time.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+            attempt += 1
+
+    def max_call_seconds(self) -> float:
+        """Tek bir generate() çağrısının en kötü süresi: hız sınırı beklemesi + tüm denemeler + aradaki beklemeler."""
+        backoff = sum(self.backoff_seconds * 2 ** (attempt - 1) for attempt in range(1, self.max_attempts))
+        return self.limiter.max_wait + self.max_attempts * self.timeout_seconds + backoff
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._counters)
+        data["breaker"] = self.breaker.snapshot()
+        data["latency"] = self.latency.snapshot()
+        data["retry_tokens"] = round(self.retry_budget.available, 2)
+        data["timeout_seconds"] = self.timeout_seconds
+        return data
+
+    # --- YARDIMCI METODLAR ---
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def _admit(self, provider: AIProvider, project_id: Optional[int]) -> None:
+        """Devre açıksa hemen, hız sınırı aşılırsa kısa bir bekleme sonrası reddeder."""
+        self._count("requests")
+        self.retry_budget.deposit()
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            LLM_CALLS.labels(provider.name, "short_circuited").inc()
+            raise CircuitOpenError("AI servisi geçici olarak devre dışı (art arda hata).")
+        try:
+            self.limiter.acquire(project_id)
+        except RateLimitedError:
+            self.breaker.release()
+            self._count("rate_limited")
+            LLM_CALLS.labels(provider.name, "rate_limited").inc()
+            raise
+
+    def _pump(self, provider: AIProvider, prompt: str, schema: Type[SchemaT], out: "queue.Queue") -> None:
+        """Sağlayıcı akışını slot tutarak kuyruğa aktarır; sonuç (başarı/hata) burada kaydedilir."""
+        started = time.monotonic()
+        error = None
+        try:
+            with self.slots:
+                for chunk in provider.stream(prompt, schema, timeout=self.timeout_seconds):
+                    out.put(chunk)
+        except Exception as e:
+            error = e
+            self._record_failure(provider, e, time.monotonic() - started)
+        else:
+            self._record_success(provider, time.monotonic() - started)
+        finally:
+            out.put(_StreamEnd(error))
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        if attempt >= self.max_attempts or not _is_retryable(error):
+            return False
+        # Bu hatayla devre açıldıysa tekrar denenmez
+        if not self.breaker.allow():
+            return False
+        if not self.retry_budget.try_withdraw():
+            self.breaker.release()
+            self._count("retries_denied")
+            return False
+        self._count("retries")
+        return True
+
+    def _record_success(self, provider: AIProvider, seconds: float) -> None:
+        self.breaker.record_success()
+        self.latency.add(seconds)
+        self._count("successes")
+        LLM_CALLS.labels(provider.name, "success").inc()
+        LLM_CALL_SECONDS.labels(provider.name, "success").observe(seconds)
+
+    def _record_failure(self, provider: AIProvider, error: Exception, seconds: float) -> None:
+        self.breaker.record_failure()
+        outcome = "timeout" if isinstance(error, TimeoutError) else "failure"
+        self._count("timeouts" if outcome == "timeout" else "failures")
+        LLM_CALLS.labels(provider.name, outcome).inc()
+        LLM_CALL_SECONDS.labels(provider.name, outcome).observe(seconds)
+
+
+ai_gateway = AIGateway(
+    max_concurrent=AI_MAX_CONCURRENT_CALLS,
+    timeout_seconds=AI_CALL_TIMEOUT_SECONDS,
+    global_per_minute=AI_RATE_LIMIT_GLOBAL_PER_MINUTE,
+    project_per_minute=AI_RATE_LIMIT_PROJECT_PER_MINUTE,
+    max_wait_seconds=AI_RATE_LIMIT_MAX_WAIT_SECONDS,
+    failure_threshold=AI_BREAKER_FAILURE_THRESHOLD,
+    reset_seconds=AI_BREAKER_RESET_SECONDS,
+    max_attempts=AI_RETRY_MAX_ATTEMPTS,
+    retry_ratio=AI_RETRY_BUDGET_RATIO,
+    backoff_seconds=AI_RETRY_BACKOFF_SECONDS,
+)
+
+# Devre durumu /metrics'te: 0 = kapalı, 1 = yarı açık, 2 = açık
+_BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+metrics.gauge_function(
+    "llm_circuit_state", "AI devre kesici durumu (0 kapalı, 1 yarı açık, 2 açık).", (),
+    lambda: {(): _BREAKER_STATES.get(ai_gateway.breaker.snapshot()["state"], 0)},
+)
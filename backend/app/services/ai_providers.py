@@ -0,0 +1,173 @@
+import hashlib
+import os
+import threading
+import time
+import typing
+from abc import ABC, abstractmethod
+from pydantic import BaseModel
+from typing import Iterator, Optional, Type, TypeVar
+
+from app.config import AI_PROVIDER, GEMINI_MODEL, AI_STUB_LATENCY_MS
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+class AIProvider(ABC):
+    """
+    Yapılandırılmış (şemaya uygun) metin üreten LLM sağlayıcısı arayüzü.
+    Hata durumunda exception fırlatır; yedek yanıtı AIService üretir.
+    'timeout' (saniye) aşılırsa TimeoutError fırlatılmalıdır.
+    """
+    name = "base"
+
+    @abstractmethod
+    def generate(self, prompt: str, schema: Type[SchemaT], timeout: Optional[float] = None) -> SchemaT:
+        ...
+
+    def stream(self, prompt: str, schema: Type[SchemaT], timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        Şemaya uygun JSON yanıtı parça parça (ham metin) üretir.
+        Akış desteklemeyen sağlayıcılar için tüm yanıt tek parça döner.
+        """
+        yield self.generate(prompt, schema, timeout=timeout).model_dump_json()
+
+
+class GeminiProvider(AIProvider):
+    """Google Gemini. SDK (google.genai) sadece bu sınıf ilk kez oluşturulduğunda import edilir."""
+    name = "gemini"
+
+    def __init__(self, api_key: Optional[str], model_name: str):
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY ortam değişkeni bulunamadı.")
+
+        import httpx
+        from google import genai
+        from google.genai import types
+
+        self._types = types
+        self._timeout_errors = (httpx.TimeoutException,)
+        self.client = genai.Client(api_key=api_key)
+        self.model_name = model_name
+
+    def generate(self, prompt: str, schema: Type[SchemaT], timeout: Optional[float] = None) -> SchemaT:
+        try:
+            response = self.client.models.generate_content(
+                model=self.model_name,
+                contents=prompt,
+                config=self._config(schema, timeout)
+            )
+        except self._timeout_errors as e:
+            raise TimeoutError(f"Gemini {timeout} sn içinde yanıt vermedi.") from e
+        if response.parsed is None:
+            raise ValueError(f"Model yanıtı {schema.__name__} şemasına uymuyor.")
+        return response.parsed
+
+    def stream(self, prompt: str, schema: Type[SchemaT], timeout: Optional[float] = None) -> Iterator[str]:
+        try:
+            for chunk in self.client.models.generate_content_stream(
+                model=self.model_name,
+                contents=prompt,
+                config=self._config(schema, timeout)
+            ):
+                if chunk.text:
+                    yield chunk.text
+        except self._timeout_errors as e:
+            raise TimeoutError(f"Gemini {timeout} sn içinde yanıt vermedi.") from e
+
+    def _config(self, schema: Type[SchemaT], timeout: Optional[float]):
+        # SDK'nın zaman aşımı milisaniye cinsindendir; verilmezse SDK varsayılanı (uzun) kullanılır
+        http_options = self._types.HttpOptions(timeout=int(timeout * 1000)) if timeout else None
+        return self._types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=schema,
+            http_options=http_options
+        )
+
+
+class StubProvider(AIProvider):
+    """
+    Ağ kullanmayan sahte sağlayıcı. Aynı prompt için her zaman aynı yanıtı üretir;
+    'latency_ms' ile gerçek bir LLM çağrısının süresi taklit edilir.
+    Yük testleri ve API anahtarı olmayan geliştirme ortamları için.
+    """
+    name = "stub"
+
+    def __init__(self, latency_ms: int = 0):
+        self.latency_ms = latency_ms
+
+    def generate(self, prompt: str, schema: Type[SchemaT], timeout: Optional[float] = None) -> SchemaT:
+        self._sleep(self.latency_ms / 1000, timeout)
+        return self._build(prompt, schema)
+
+    def stream(self, prompt: str, schema: Type[SchemaT], timeout: Optional[float] = None) -> Iterator[str]:
+        """Yanıtı küçük parçalara bölerek gönderir; toplam gecikme 'latency_ms' kadardır."""
+        text = self._build(prompt, schema).model_dump_json()
+        pieces = [text[i:i + 16] for i in range(0, len(text), 16)]
+        deadline = time.monotonic() + timeout if timeout else None
+        for piece in pieces:
+            remaining = deadline - time.monotonic() if deadline else None
+            self._sleep(self.latency_ms / 1000 / len(pieces), remaining)
+            yield piece
+
+    @staticmethod
+    def _sleep(seconds: float, timeout: Optional[float]) -> None:
+        """Gecikmeyi taklit eder; zaman aşımı daha kısaysa o kadar bekleyip TimeoutError fırlatır."""
+        if timeout is not None and seconds > timeout:
+            time.sleep(max(timeout, 0))
+            raise TimeoutError(f"Stub sağlayıcı {timeout} sn içinde yanıt vermedi.")
+        if seconds:
+            time.sleep(seconds)
+
+    def _build(self, prompt: str, schema: Type[SchemaT]) -> SchemaT:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        values = {
+            name: self._stub_value(name, field.annotation, digest)
+            for name, field in schema.model_fields.items()
+        }
+        return schema(**values)
+
+    @staticmethod
+    def _stub_value(name: str, annotation, digest: str):
+        number = int(digest[:8], 16)
+        if annotation is int:
+            return number % 101
+        if annotation is float:
+            return (number % 1000) / 1000
+        if typing.get_origin(annotation) in (list, typing.List):
+            return [f"[stub] {name} {i + 1} ({digest[i * 4:i * 4 + 4]})" for i in range(3)]
+        return f"[stub] {name} ({digest[:12]})"
+
+
+def create_provider(name: str = AI_PROVIDER) -> AIProvider:
+    """Ayarlardaki sağlayıcıyı oluşturur. Bilinmeyen isimde ValueError fırlatır."""
+    if name == "gemini":
+        return GeminiProvider(os.getenv("GEMINI_API_KEY"), GEMINI_MODEL)
+    if name == "stub":
+        return StubProvider(AI_STUB_LATENCY_MS)
+    raise ValueError(f"Bilinmeyen AI_PROVIDER: '{name}' (geçerli değerler: gemini, stub)")
+
+
+class LazyProvider:
+    """
+    Sağlayıcıyı ilk analiz çağrısında oluşturur (import/boot sırasında değil).
+    Oluşturma başarısız olursa (örn. API anahtarı yok) bir sonraki çağrıda tekrar denenir.
+    """
+
+    def __init__(self, factory=create_provider):
+        self._factory = factory
+        self._provider: Optional[AIProvider] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> AIProvider:
+        provider = self._provider
+        if provider is None:
+            with self._lock:
+                if self._provider is None:
+                    self._provider = self._factory()
+                provider = self._provider
+        return provider
+
+    def set(self, provider: Optional[AIProvider]) -> None:
+        """Sağlayıcıyı değiştirir (testler ve yük testleri için). None verilirse tekrar tembel oluşturulur."""
+        with self._lock:
+            self._provider = provider
@@ -1,149 +1,244 @@
-import os
 import json
 from datetime import datetime
 from sqlalchemy.orm import Session
-from google import genai
-from google.genai import types
-
-# Modellerimiz
-from app.models.project_model import Project
-from app.models.task_model import Task
-from app.models.project_member_model import ProjectMember
-from app.models.user_model import User
-from app.schemas.analysis_schemas import ProjectAnalysis
+from typing import Iterator, Optional
+
+from app.schemas.analysis_schemas import ProjectAnalysis, ProjectNarrative, ProjectScores, AnalysisResponse
+from app.services.analysis_cache import analysis_cache, fingerprint_project_data
+from app.services.analytics_service import analytics_service
+from app.services.analysis_history import analysis_history
+from app.services.project_snapshot import project_snapshot_builder
+from app.services.ai_providers import AIProvider, LazyProvider
+from app.services.ai_gateway import ai_gateway
+from app.services.json_stream import JsonStringFieldReader
+from app.database import SessionLocal
 
 class AIService:
     def __init__(self):
-        self.api_key = os.getenv("GEMINI_API_KEY")
-        if not self.api_key:
-            raise ValueError("GEMINI_API_KEY ortam değişkeni bulunamadı.")
-        
-        # Google GenAI Client
-        self.client = genai.Client(api_key=self.api_key)
-        # Modeli 2.0 Flash olarak güncelledik, daha hızlı ve akıllı
-        self.model_name = "gemini-2.5-flash" 
+        # Sağlayıcı (Gemini SDK'sı dahil) ilk analiz çağrısında oluşturulur;
+        # böylece import/boot sırasında ne SDK yüklenir ne de API anahtarı istenir.
+        self._provider = LazyProvider()
+
+    @property
+    def provider(self) -> AIProvider:
+        return self._provider.get()
+
+    def set_provider(self, provider: AIProvider | None) -> None:
+        self._provider.set(provider)
 
     def _prepare_project_data(self, db: Session, project_id: int) -> str:
         """
-        AI'a gönderilecek veriyi hazırlar. 
-        Artık Puan, Öncelik ve Kategori bilgilerini de içeriyor.
+        AI'a gönderilecek veriyi hazırlar (Puan, Öncelik, Kategori ve gecikme dahil).
+        Veri kompakt, kolon bazlı JSON olarak üretilir; detaylar için project_snapshot.py.
         """
-        # 1. Proje Bilgisi
-        project = db.query(Project).filter(Project.id == project_id).first()
-        if not project:
-            raise ValueError(f"Proje ID {project_id} bulunamadı.")
-
-        # 2. Üyeler
-        members = db.query(ProjectMember).filter(ProjectMember.project_id == project_id).all()
-        member_list = []
-        user_map = {}
-        
-        for m in members:
-            user = db.query(User).filter(User.id == m.user_id).first()
-            if user:
-                full_name = f"{user.first_name} {user.last_name}" if user.first_name else user.email
-                member_list.append(f"{full_name} ({m.role})")
-                user_map[user.id] = full_name
-
-        # 3. Görevler ve Detaylı Analiz Verileri
-        tasks = db.query(Task).filter(Task.project_id == project_id).all()
-        task_list = []
-        
-        now = datetime.now()
-        
-        total_story_points = 0
-        completed_story_points = 0
-
-        for t in tasks:
-            assignee = user_map.get(t.assignee_id, "Atanmamış")
-            
-            # Gecikme Kontrolü
-            is_overdue = False
-            days_overdue = 0
-            if t.due_date and t.status != "tamamlandı" and t.due_date < now:
-                is_overdue = True
-                days_overdue = (now - t.due_date).days
-
-            # Puan Hesabı
-            points = t.story_points or 1
-            total_story_points += points
-            if t.status == "tamamlandı":
-                completed_story_points += points
-
-            task_list.append({
-                "baslik": t.title,
-                "durum": t.status,
-                "oncelik": t.priority,   # YENİ VERİ
-                "kategori": t.category,  # YENİ VERİ
-                "efor_puani": points,    # YENİ VERİ
-                "atanan": assignee,
-                "gecikme_durumu": f"{days_overdue} gün gecikti" if is_overdue else "Zamanında",
-                "bitis_tarihi": str(t.due_date) if t.due_date else "Yok"
-            })
-
-        # 4. JSON Özeti
-        data_summary = {
-            "proje_adi": project.name,
-            "analiz_tarihi": str(now.strftime("%Y-%m-%d")),
-            "toplam_is_yuku_puani": total_story_points,
-            "tamamlanan_is_yuku_puani": completed_story_points,
-            "ekip_uyeleri": member_list,
-            "gorev_detaylari": task_list
-        }
-        
-        return json.dumps(data_summary, ensure_ascii=False, indent=2)
+        return project_snapshot_builder.build(db, project_id)
+
+    def analyze_project(self, db: Session, project_id: int, force_refresh: bool = False) -> AnalysisResponse:
+        """
+        Projeyi analiz eder. Proje verisinin parmak izi önbellekteki ile aynıysa
+        Gemini çağrılmadan önceki analiz döner ('force_refresh' ile atlanabilir).
+        """
+        snapshot_at = datetime.now()
+        project_data_json, fingerprint = self.prepare_snapshot(db, project_id)
 
-    def analyze_project(self, db: Session, project_id: int) -> ProjectAnalysis:
+        if not force_refresh:
+            cached = self.get_cached(db, project_id, fingerprint)
+            if cached is not None:
+                return cached
+
+        return self.run_analysis(db, project_id, project_data_json, fingerprint, snapshot_at)
+
+    def prepare_snapshot(self, db: Session, project_id: int) -> tuple[str, str]:
+        """Prompt'a girecek proje verisini ve parmak izini döndürür."""
         project_data_json = self._prepare_project_data(db, project_id)
-        
-        # --- GELİŞMİŞ PROMPT (YENİ VERİLERE GÖRE) ---
-        prompt = f"""
+        return project_data_json, fingerprint_project_data(project_data_json)
+
+    def get_cached(self, db: Session, project_id: int, fingerprint: str) -> AnalysisResponse | None:
+        cached = analysis_cache.get(db, project_id, fingerprint)
+        if cached is None:
+            return None
+        scores = analytics_service.compute_scores(db, project_id)
+        return AnalysisResponse(project_id=project_id, analysis=cached, scores=scores, cached=True, fingerprint=fingerprint)
+
+    def run_analysis(self, db: Session, project_id: int, project_data_json: str, fingerprint: str,
+                     snapshot_at: Optional[datetime] = None) -> AnalysisResponse:
+        """
+        Skorları yerelde hesaplar, Gemini'den sadece yorum (özet/öneriler) ister
+        ve başarılı sonucu önbelleğe ve analiz geçmişine yazar. Gemini'ye ulaşılamazsa skorlar yine doğrudur.
+        'snapshot_at', 'project_data_json' hazırlanmadan önce alınan zamandır (verilmezse şimdi).
+        """
+        snapshot_at = snapshot_at or datetime.now()
+        scores = analytics_service.compute_scores(db, project_id)
+        prompt, incremental, task_ids = self._prepare_prompt(db, project_id, project_data_json, scores)
+        narrative, succeeded = self._generate_narrative(prompt, project_id)
+
+        analysis = ProjectAnalysis(
+            **narrative.model_dump(),
+            risk_score=scores.risk_score,
+            performance_score=scores.performance_score
+        )
+
+        # Yedek (hata) yanıtı önbelleğe/geçmişe alınmaz, bir sonraki istek tekrar denesin
+        if succeeded:
+            analysis_cache.set(db, project_id, fingerprint, analysis)
+            analysis_history.record(db, project_id, fingerprint, analysis, task_ids, incremental, len(prompt), snapshot_at)
+
+        return AnalysisResponse(project_id=project_id, analysis=analysis, scores=scores, cached=False,
+                                fingerprint=fingerprint, incremental=incremental)
+
+    def _prepare_prompt(self, db: Session, project_id: int, project_data_json: str, scores: ProjectScores) -> tuple[str, bool, list[int]]:
+        """
+        Prompt'u hazırlar. Önceki bir analiz varsa ve az sayıda görev değiştiyse sadece
+        önceki özet + değişen görevler gönderilir. (prompt, artımlı_mı, görev_id_listesi) döndürür.
+        """
+        task_ids = analysis_history.current_task_ids(db, project_id)
+        previous = analysis_history.latest(db, project_id)
+        if previous is not None:
+            incremental_data = analysis_history.build_incremental_data(db, project_id, previous, task_ids)
+            if incremental_data is not None:
+                return self._build_incremental_prompt(incremental_data, scores), True, task_ids
+        return self._build_prompt(project_data_json, scores), False, task_ids
+
+    def stream_analysis(self, db: Session, project_id: int, force_refresh: bool = False) -> Iterator[str]:
+        """
+        Analizi Server-Sent Events olarak akıtır:
+          'scores'  -> yerel skorlar (hemen),
+          'summary' -> AI özetinin yeni gelen parçası ({"text": ...}),
+          'result'  -> doğrulanmış tam AnalysisResponse (son olay).
+        Veritabanı işi burada (istek session'ı ile) yapılır; dönen üreteç sadece AI'ı bekler.
+        """
+        snapshot_at = datetime.now()
+        project_data_json, fingerprint = self.prepare_snapshot(db, project_id)
+        scores = analytics_service.compute_scores(db, project_id)
+        cached = None if force_refresh else analysis_cache.get(db, project_id, fingerprint)
+        prompt, incremental, task_ids = None, False, []
+        if cached is None:
+            prompt, incremental, task_ids = self._prepare_prompt(db, project_id, project_data_json, scores)
+
+        def events() -> Iterator[str]:
+            yield self._sse("scores", scores.model_dump_json())
+
+            if cached is not None:
+                yield self._sse("result", AnalysisResponse(
+                    project_id=project_id, analysis=cached, scores=scores, cached=True, fingerprint=fingerprint
+                ).model_dump_json())
+                return
+
+            narrative, succeeded = None, False
+            reader = JsonStringFieldReader("summary")
+            try:
+                chunks = []
+                for chunk in ai_gateway.stream(self.provider, prompt, ProjectNarrative, project_id):
+                    chunks.append(chunk)
+                    delta = reader.feed(chunk)
+                    if delta:
+                        yield self._sse("summary", json.dumps({"text": delta}, ensure_ascii=False))
+                narrative, succeeded = ProjectNarrative.model_validate_json("".join(chunks)), True
+            except Exception as e:
+                print(f"AI Akış Hatası: {e}")
+                narrative = self._fallback_narrative()
+
+            analysis = ProjectAnalysis(
+                **narrative.model_dump(),
+                risk_score=scores.risk_score,
+                performance_score=scores.performance_score
+            )
+            if succeeded:
+                # İstek session'ı bu noktada kapanmış olabilir
+                cache_db = SessionLocal()
+                try:
+                    analysis_cache.set(cache_db, project_id, fingerprint, analysis)
+                    analysis_history.record(cache_db, project_id, fingerprint, analysis, task_ids, incremental,
+                                            len(prompt), snapshot_at)
+                finally:
+                    cache_db.close()
+
+            yield self._sse("result", AnalysisResponse(
+                project_id=project_id, analysis=analysis, scores=scores, cached=False,
+                fingerprint=fingerprint, incremental=incremental
+            ).model_dump_json())
+
+        return events()
+
+    @staticmethod
+    def _sse(event: str, data: str) -> str:
+        return f"event: {event}\ndata: {data}\n\n"
+
+    def _build_prompt(self, project_data_json: str, scores: ProjectScores) -> str:
+        # --- GELİŞMİŞ PROMPT (SKORLAR YERELDE HESAPLANIR) ---
+        return f"""
         Sen uzman bir Agile Proje Koçu ve Veri Analistisin. Aşağıdaki proje verilerini analiz et.
 
-        VERİLER:
+        VERİLER (kompakt format, açıklaması 'format' alanında):
         {project_data_json}
 
+        HESAPLANMIŞ SKORLAR (değiştirme, yorumla):
+        {scores.model_dump_json(exclude={"workload"})}
+
         GÖREVLERİN:
-        1. **Risk Skoru Hesapla (0-100):** - 'Kritik' öncelikli ve gecikmiş görevler puanı ciddi oranda yükseltir.
-           - Atanmamış görevler risktir.
-           - 0 = Mükemmel, 100 = Felaket.
-        
-        2. **Performans Skoru Hesapla (0-100):**
-           - Tamamlanan 'efor_puani' (story points) oranına bak.
-           - Ekip üyelerinin iş yükü dengesine bak.
-        
-        3. **Özet (Summary):**
-           - Durumu teknik bir dille özetle. Hangi kategoride (Frontend, Backend vb.) yığılma var?
+        1. **Özet (Summary):**
+           - Durumu teknik bir dille özetle. Risk ({scores.risk_score}/100) ve performans
+             ({scores.performance_score}/100) skorlarının nedenlerini açıkla.
+           - Hangi kategoride (Frontend, Backend vb.) yığılma var? 'bottlenecks' listesine bak.
            - "Ahmet Frontend tarafında darboğaz yaşıyor" gibi spesifik tespitler yap.
         
-        4. **Öneriler (Recommendations):**
+        2. **Öneriler (Recommendations):**
            - Yöneticinin hemen yapması gereken 3 stratejik hamle söyle.
+           - 'ozetlenen_gorevler' varsa bu görevler sadece istatistik olarak verilmiştir.
         
-        5. **Sentiment:** Projenin genel havası (Pozitif, Nötr, Negatif).
+        3. **Sentiment:** Projenin genel havası (Pozitif, Nötr, Negatif).
 
         YANIT FORMATI: Sadece JSON döndür.
         """
 
+    def _build_incremental_prompt(self, incremental_data_json: str, scores: ProjectScores) -> str:
+        # --- ARTIMLI PROMPT (ÖNCEKİ ÖZET + SADECE DEĞİŞEN GÖREVLER) ---
+        return f"""
+        Sen uzman bir Agile Proje Koçu ve Veri Analistisin. Bu projeyi daha önce analiz ettin.
+        Aşağıda önceki analizin ('onceki_analiz') ve o tarihten beri eklenen/değişen görevler
+        ('degisen_gorevler', kompakt format, açıklaması 'format' alanında) var.
+        'silinen_gorev_sayisi' kadar görev projeden kaldırıldı.
+
+        VERİLER:
+        {incremental_data_json}
+
+        GÜNCEL HESAPLANMIŞ SKORLAR (tüm projeden, değiştirme, yorumla):
+        {scores.model_dump_json(exclude={"workload"})}
+
+        GÖREVLERİN:
+        1. **Özet (Summary):**
+           - Önceki özeti değişikliklere göre güncelle; neyin iyileştiğini/kötüleştiğini belirt.
+           - Risk ({scores.risk_score}/100) ve performans ({scores.performance_score}/100)
+             skorlarının önceki değerlere göre değişiminin nedenlerini açıkla.
+           - Darboğazlar için 'bottlenecks' listesine bak.
+
+        2. **Öneriler (Recommendations):**
+           - Güncel duruma göre yöneticinin hemen yapması gereken 3 stratejik hamle söyle.
+
+        3. **Sentiment:** Projenin genel havası (Pozitif, Nötr, Negatif).
+
+        YANIT FORMATI: Sadece JSON döndür.
+        """
+
+    def _generate_narrative(self, prompt: str, project_id: int | None = None) -> tuple[ProjectNarrative, bool]:
+        """
+        Sağlayıcıyı (Gemini/stub) AI gateway üzerinden çağırır: hız sınırı, devre kesici,
+        zaman aşımı ve tekrar deneme bütçesi orada uygulanır (bkz. ai_gateway.py).
+        (yorum, başarılı_mı) döndürür; hata veya ret durumunda yedek yorum döner.
+        """
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    response_schema=ProjectAnalysis
-                )
-            )
-            return response.parsed
+            return ai_gateway.generate(self.provider, prompt, ProjectNarrative, project_id), True
 
         except Exception as e:
             print(f"AI Analiz Hatası: {e}")
             # Frontend çökmesin diye varsayılan bir obje dönüyoruz
-            return ProjectAnalysis(
-                summary="Yapay zeka servisine şu an ulaşılamıyor. Lütfen API anahtarınızı kontrol edin.",
-                recommendations=["Bağlantınızı kontrol edin.", "API anahtarını doğrulayın."],
-                risk_score=0,
-                performance_score=0,
-                sentiment="Nötr"
-            )
+            return self._fallback_narrative(), False
+
+    def _fallback_narrative(self) -> ProjectNarrative:
+        return ProjectNarrative(
+            summary="Yapay zeka servisine şu an ulaşılamıyor. Skorlar yerel analizle hesaplandı.",
+            recommendations=["Bağlantınızı kontrol edin.", "API anahtarını doğrulayın."],
+            sentiment="Nötr"
+        )
 
 ai_service = AIService()
\ No newline at end of file
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.config import AI_CACHE_MAX_ENTRIES, AI_CACHE_TTL_SECONDS, AI_CACHE_PERSIST
+from app.models.analysis_cache_model import AnalysisCacheEntry
+from app.schemas.analysis_schemas import ProjectAnalysis
+
+# Parmak izine dahil edilmeyen alanlar (veri değişmese de her gün değişirler)
+_VOLATILE_KEYS = ("analiz_tarihi",)
+
+def fingerprint_project_data(project_data_json: str) -> str:
+    """
+    _prepare_project_data çıktısını normalize edip SHA-256 özetini döndürür.
+    Anahtar sırası ve boşluklar sonucu etkilemez.
+    """
+    data = json.loads(project_data_json)
+    if isinstance(data, dict):
+        for key in _VOLATILE_KEYS:
+            data.pop(key, None)
+    normalized = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Proje başına son AI analizini tutan LRU + TTL önbellek.
+    Her proje için tek kayıt vardır; parmak izi değiştiğinde kayıt geçersizdir.
+    'persist' açıksa bellekte bulunamayan kayıtlar 'analysis_cache' tablosundan okunur.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, persist: bool = False):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist = persist
+        self._lock = threading.Lock()
+        # project_id -> (fingerprint, ProjectAnalysis, stored_at)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "persistent_hits": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, db: Session, project_id: int, fingerprint: str) -> Optional[ProjectAnalysis]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is not None:
+                cached_fp, analysis, stored_at = entry
+                if now - stored_at > self.ttl_seconds:
+                    del self._entries[project_id]
+                    self._stats["expirations"] += 1
+                elif cached_fp == fingerprint:
+                    self._entries.move_to_end(project_id)
+                    self._stats["hits"] += 1
+                    return analysis
+
+        if self.persist:
+            analysis = self._load_persisted(db, project_id, fingerprint)
+            if analysis is not None:
+                with self._lock:
+                    self._stats["hits"] += 1
+                    self._stats["persistent_hits"] += 1
+                    self._put(project_id, fingerprint, analysis, now)
+                return analysis
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, db: Session, project_id: int, fingerprint: str, analysis: ProjectAnalysis) -> None:
+        with self._lock:
+            self._put(project_id, fingerprint, analysis, time.monotonic())
+        if self.persist:
+            self._store_persisted(db, project_id, fingerprint, analysis)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    # --- YARDIMCI METODLAR ---
+
+    def _put(self, project_id: int, fingerprint: str, analysis: ProjectAnalysis, stored_at: float) -> None:
+        """Kilit altında çağrılır."""
+        self._entries[project_id] = (fingerprint, analysis, stored_at)
+        self._entries.move_to_end(project_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _load_persisted(self, db: Session, project_id: int, fingerprint: str) -> Optional[ProjectAnalysis]:
+        row = db.query(AnalysisCacheEntry).filter(
+            AnalysisCacheEntry.project_id == project_id,
+            AnalysisCacheEntry.fingerprint == fingerprint,
+            AnalysisCacheEntry.created_at >= datetime.now() - timedelta(seconds=self.ttl_seconds)
+        ).first()
+        if row is None:
+            return None
+        return ProjectAnalysis.model_validate_json(row.result)
+
+    def _store_persisted(self, db: Session, project_id: int, fingerprint: str, analysis: ProjectAnalysis) -> None:
+        row = db.query(AnalysisCacheEntry).filter(AnalysisCacheEntry.project_id == project_id).first()
+        if row is None:
+            row = AnalysisCacheEntry(project_id=project_id)
+        row.fingerprint = fingerprint
+        row.created_at = datetime.now()
+        row.result = analysis.model_dump_json()
+        db.add(row)
+        db.commit()
+
+analysis_cache = AnalysisCache(AI_CACHE_MAX_ENTRIES, AI_CACHE_TTL_SECONDS, persist=AI_CACHE_PERSIST)
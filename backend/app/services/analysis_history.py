@@ -0,0 +1,123 @@
+import json
+from datetime import datetime
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.config import AI_INCREMENTAL_MAX_CHANGED_RATIO
+from app.models.analysis_record_model import ProjectAnalysisRecord
+from app.models.task_model import Task
+from app.schemas.analysis_schemas import ProjectAnalysis, ScoreTrend, ScoreTrendPoint
+from app.services.project_snapshot import project_snapshot_builder
+
+
+class AnalysisHistoryService:
+    """
+    Projelerin AI analiz geçmişini saklar ve artımlı (incremental) analiz verisini hazırlar.
+    Artımlı analizde AI'a tüm proje yerine önceki özet + sadece değişen görevler gönderilir.
+    """
+
+    def __init__(self, max_changed_ratio: float):
+        self.max_changed_ratio = max_changed_ratio
+
+    @staticmethod
+    def latest(db: Session, project_id: int) -> Optional[ProjectAnalysisRecord]:
+        return db.query(ProjectAnalysisRecord)\
+            .filter(ProjectAnalysisRecord.project_id == project_id)\
+            .order_by(ProjectAnalysisRecord.id.desc())\
+            .first()
+
+    @staticmethod
+    def current_task_ids(db: Session, project_id: int) -> List[int]:
+        return [row.id for row in db.query(Task.id).filter(Task.project_id == project_id).all()]
+
+    def build_incremental_data(self, db: Session, project_id: int, previous: ProjectAnalysisRecord,
+                               task_ids: List[int], now: Optional[datetime] = None) -> Optional[str]:
+        """
+        Önceki analizden beri değişen görevleri ve önceki özeti içeren prompt verisini döndürür.
+        Değişen + silinen görevlerin oranı eşiği aşıyorsa None döner (tam analiz yapılmalı).
+        Değişen görevler, tam analizdeki gibi token bütçesine sığdırılır.
+        """
+        # Eski kayıtlarda snapshot_at yok; o durumda en iyi tahmin kaydın oluşma zamanı
+        since = previous.snapshot_at or previous.created_at
+        changes = project_snapshot_builder.build_changes(db, project_id, since, now)
+        if changes is None:
+            raise ValueError(f"Proje ID {project_id} bulunamadı.")
+
+        removed = len(set(json.loads(previous.task_ids)) - set(task_ids))
+        changed = len(changes["gorevler"])
+        if changed + removed > self.max_changed_ratio * max(len(task_ids), 1):
+            return None
+
+        data = {
+            "proje_adi": changes.pop("proje_adi"),
+            "analiz_tarihi": changes.pop("analiz_tarihi"),
+            "onceki_analiz": {
+                "tarih": previous.created_at.strftime("%Y-%m-%d %H:%M"),
+                "risk_skoru": previous.risk_score,
+                "performans_skoru": previous.performance_score,
+                "ozet": previous.summary,
+                "oneriler": json.loads(previous.recommendations),
+            },
+            "toplam_gorev": len(task_ids),
+            "degisen_gorev_sayisi": changed,
+            "silinen_gorev_sayisi": removed,
+        }
+        reserved = len(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+        data["degisen_gorevler"] = project_snapshot_builder.fit_budget(changes, reserved_chars=reserved)
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+    @staticmethod
+    def record(db: Session, project_id: int, fingerprint: str, analysis: ProjectAnalysis,
+               task_ids: List[int], incremental: bool, prompt_chars: int,
+               snapshot_at: Optional[datetime] = None) -> ProjectAnalysisRecord:
+        """
+        Başarılı bir analizi geçmişe ekler. 'snapshot_at', analiz verisi okunmadan ÖNCE
+        alınmış zamandır; sonraki artımlı analiz bu andan sonra değişen görevleri gönderir.
+        """
+        entry = ProjectAnalysisRecord(
+            project_id=project_id,
+            snapshot_at=snapshot_at,
+            fingerprint=fingerprint,
+            risk_score=analysis.risk_score,
+            performance_score=analysis.performance_score,
+            sentiment=analysis.sentiment,
+            summary=analysis.summary,
+            recommendations=json.dumps(analysis.recommendations, ensure_ascii=False),
+            task_ids=json.dumps(task_ids),
+            incremental=incremental,
+            prompt_chars=prompt_chars,
+        )
+        db.add(entry)
+        db.commit()
+        return entry
+
+    @staticmethod
+    def list_history(db: Session, project_id: int, limit: int = 20, before_id: Optional[int] = None) -> List[ProjectAnalysisRecord]:
+        """Projenin analizlerini yeniden eskiye döndürür."""
+        query = db.query(ProjectAnalysisRecord).filter(ProjectAnalysisRecord.project_id == project_id)
+        if before_id is not None:
+            query = query.filter(ProjectAnalysisRecord.id < before_id)
+        return query.order_by(ProjectAnalysisRecord.id.desc()).limit(limit).all()
+
+    @staticmethod
+    def score_trend(db: Session, project_id: int, limit: int = 100) -> ScoreTrend:
+        """
+        Skor trendini doğrudan saklanan satırlardan (sadece gerekli kolonlar) üretir.
+        Son 'limit' analiz, eskiden yeniye sıralanır.
+        """
+        rows = db.query(
+            ProjectAnalysisRecord.created_at, ProjectAnalysisRecord.risk_score, ProjectAnalysisRecord.performance_score
+        ).filter(ProjectAnalysisRecord.project_id == project_id)\
+            .order_by(ProjectAnalysisRecord.id.desc())\
+            .limit(limit)\
+            .all()
+
+        points = [ScoreTrendPoint(created_at=r.created_at, risk_score=r.risk_score, performance_score=r.performance_score)
+                  for r in reversed(rows)]
+        trend = ScoreTrend(project_id=project_id, points=points)
+        if points:
+            trend.risk_change = points[-1].risk_score - points[0].risk_score
+            trend.performance_change = points[-1].performance_score - points[0].performance_score
+        return trend
+
+analysis_history = AnalysisHistoryService(AI_INCREMENTAL_MAX_CHANGED_RATIO)
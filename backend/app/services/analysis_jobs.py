@@ -0,0 +1,175 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, Optional, Tuple
+
+from app.config import AI_MAX_CONCURRENT_CALLS, AI_JOB_TTL_SECONDS
+from app.database import SessionLocal
+from app.schemas.analysis_schemas import AnalysisJobDisplay, AnalysisResponse
+from app.services.ai_service import ai_service
+
+class JobStatus:
+    queued = "queued"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class AnalysisJob:
+    """Tek bir analiz işinin durumu. Aynı iş birden fazla istemci tarafından paylaşılabilir."""
+
+    def __init__(self, project_id: int, fingerprint: str, snapshot_at: Optional[datetime] = None):
+        self.id = uuid.uuid4().hex
+        self.project_id = project_id
+        self.fingerprint = fingerprint
+        # Proje verisinin okunmaya başlandığı an (analiz geçmişine yazılır)
+        self.snapshot_at = snapshot_at
+        self.status = JobStatus.queued
+        self.progress = 0
+        self.stage = "Sırada bekliyor"
+        self.result: Optional[AnalysisResponse] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self._done = threading.Event()
+        self._callbacks = []
+        self._callbacks_lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def add_done_callback(self, fn: Callable[["AnalysisJob"], None]) -> None:
+        """İş bittiğinde 'fn(job)' çağrılır; iş zaten bittiyse hemen çağrılır."""
+        with self._callbacks_lock:
+            if not self.finished:
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def finish(self, result: Optional[AnalysisResponse] = None, error: Optional[str] = None) -> None:
+        self.result = result
+        self.error = error
+        self.status = JobStatus.failed if error else JobStatus.done
+        self.progress = 100
+        self.stage = "Hata" if error else "Tamamlandı"
+        self.finished_at = datetime.now()
+        with self._callbacks_lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            fn(self)
+
+    def to_display(self) -> AnalysisJobDisplay:
+        return AnalysisJobDisplay(
+            job_id=self.id,
+            project_id=self.project_id,
+            status=self.status,
+            progress=self.progress,
+            stage=self.stage,
+            result=self.result,
+            error=self.error,
+            created_at=self.created_at,
+            finished_at=self.finished_at
+        )
+
+
+class AnalysisJobManager:
+    """
+    Analizleri sınırlı bir işçi havuzunda arka planda çalıştırır.
+    Single-flight: aynı proje ve aynı veri (parmak izi) için süren bir iş varsa
+    yeni iş açılmaz, mevcut iş paylaşılır. Böylece aynı anda "Analiz Et"e basan
+    üyeler tek bir Gemini çağrısını bekler.
+    """
+
+    def __init__(self, max_workers: int, job_ttl_seconds: int):
+        self.job_ttl_seconds = job_ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-analysis")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._inflight: Dict[Tuple[int, str], AnalysisJob] = {}
+
+    def submit(self, db: Session, project_id: int, force_refresh: bool = False) -> AnalysisJob:
+        """
+        Proje verisini (istek session'ı ile) hazırlar, önbellekte yoksa işi kuyruğa alır.
+        Proje bulunamazsa ValueError fırlatır.
+        """
+        snapshot_at = datetime.now()
+        project_data_json, fingerprint = ai_service.prepare_snapshot(db, project_id)
+        return self.submit_prepared(db, project_id, project_data_json, fingerprint, force_refresh, snapshot_at)
+
+    def submit_prepared(self, db: Session, project_id: int, project_data_json: str, fingerprint: str,
+                        force_refresh: bool = False, snapshot_at: Optional[datetime] = None) -> AnalysisJob:
+        """
+        Verisi önceden (örn. toplu olarak) hazırlanmış bir proje için işi kuyruğa alır.
+        'snapshot_at' verinin hazırlanmasından önce alınan zamandır (verilmezse iş çalışırken alınır).
+        """
+        key = (project_id, fingerprint)
+
+        cached = None if force_refresh else ai_service.get_cached(db, project_id, fingerprint)
+        if cached is not None:
+            job = AnalysisJob(project_id, fingerprint)
+            job.finish(result=cached)
+            with self._lock:
+                self._evict_expired()
+                self._jobs[job.id] = job
+            return job
+
+        with self._lock:
+            self._evict_expired()
+
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                return inflight
+
+            job = AnalysisJob(project_id, fingerprint, snapshot_at)
+            self._jobs[job.id] = job
+            self._inflight[key] = job
+
+        self._executor.submit(self._run, job, project_data_json)
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- YARDIMCI METODLAR ---
+
+    def _run(self, job: AnalysisJob, project_data_json: str) -> None:
+        job.status = JobStatus.running
+        job.progress = 50
+        job.stage = "Yapay zeka analizi sürüyor"
+
+        # İş kendi session'ını kullanır (istek session'ı çoktan kapanmış olabilir)
+        db = SessionLocal()
+        try:
+            result = ai_service.run_analysis(db, job.project_id, project_data_json, job.fingerprint, job.snapshot_at)
+            job.finish(result=result)
+        except Exception as e:
+            print(f"Analiz İşi Hatası ({job.id}): {e}")
+            job.finish(error=str(e))
+        finally:
+            db.close()
+            with self._lock:
+                self._inflight.pop((job.project_id, job.fingerprint), None)
+
+    def _evict_expired(self) -> None:
+        """Kilit altında çağrılır. Süresi dolan tamamlanmış işleri bellekten atar."""
+        cutoff = time.time() - self.job_ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at.timestamp() < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+analysis_jobs = AnalysisJobManager(AI_MAX_CONCURRENT_CALLS, AI_JOB_TTL_SECONDS)
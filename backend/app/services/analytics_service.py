@@ -0,0 +1,158 @@
+import math
+from datetime import datetime
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from app.models.task_model import Task, TaskStatus, TaskPriority
+from app.models.project_member_model import ProjectMember
+from app.schemas.analysis_schemas import ProjectScores, CategoryBottleneck, MemberWorkload
+
+# Riskte öncelik ağırlıkları (Kritik gecikmiş iş, Düşük gecikmiş işten 6 kat risklidir)
+PRIORITY_RISK_WEIGHT = {
+    TaskPriority.kritik: 3.0,
+    TaskPriority.yuksek: 2.0,
+    TaskPriority.orta: 1.0,
+    TaskPriority.dusuk: 0.5,
+}
+
+# Bir kategorinin darboğaz sayılması için açık iş payının ortalamaya oranı
+BOTTLENECK_SHARE_FACTOR = 1.5
+
+
+class TaskAggregate(NamedTuple):
+    """(atanan, kategori, durum, öncelik, gecikmiş_mi) grubu için görev sayısı ve puan toplamı."""
+    assignee_id: Optional[int]
+    category: str
+    status: str
+    priority: str
+    overdue: int
+    tasks: int
+    points: int
+
+
+def _clamp(value: float, low: float = 0.0, high: float = 100.0) -> int:
+    return int(round(max(low, min(high, value))))
+
+
+class AnalyticsService:
+    """
+    LLM'den bağımsız, deterministik proje skorları.
+    Görevler tek bir GROUP BY sorgusuyla veritabanında toplanır (satır satır Python döngüsü yok),
+    skorlar birkaç düzine toplam satırı üzerinden hesaplanır; milisaniyeler içinde döner.
+    """
+
+    @staticmethod
+    def compute_scores(db: Session, project_id: int, now: Optional[datetime] = None) -> ProjectScores:
+        return AnalyticsService.compute_scores_many(db, [project_id], now)[project_id]
+
+    @staticmethod
+    def compute_scores_many(db: Session, project_ids: List[int], now: Optional[datetime] = None) -> Dict[int, ProjectScores]:
+        """Birden fazla projenin skorlarını aynı iki sorguyla hesaplar (portföy analizi için)."""
+        now = now or datetime.now()
+        if not project_ids:
+            return {}
+        is_open = Task.status != TaskStatus.tamamlandı
+        overdue = case((and_(Task.due_date.isnot(None), Task.due_date < now, is_open), 1), else_=0)
+
+        rows = db.query(
+            Task.project_id, Task.assignee_id, Task.category, Task.status, Task.priority,
+            overdue.label("overdue"),
+            func.count(Task.id).label("tasks"),
+            func.sum(func.coalesce(Task.story_points, 1)).label("points")
+        ).filter(Task.project_id.in_(project_ids))\
+            .group_by(Task.project_id, Task.assignee_id, Task.category, Task.status, Task.priority, overdue)\
+            .all()
+
+        aggregates: Dict[int, List[TaskAggregate]] = {pid: [] for pid in project_ids}
+        for project_id, *values in rows:
+            aggregates[project_id].append(TaskAggregate(*values))
+
+        members: Dict[int, List[int]] = {pid: [] for pid in project_ids}
+        for m in db.query(ProjectMember.project_id, ProjectMember.user_id).filter(ProjectMember.project_id.in_(project_ids)):
+            members[m.project_id].append(m.user_id)
+
+        return {pid: AnalyticsService.score_aggregates(aggregates[pid], members[pid]) for pid in project_ids}
+
+    @staticmethod
+    def aggregate_tasks(tasks: Iterable[Task], now: Optional[datetime] = None) -> List[TaskAggregate]:
+        """Zaten yüklenmiş Task nesnelerinden (ek sorgu olmadan) aynı toplamları üretir."""
+        now = now or datetime.now()
+        groups: Dict[tuple, List[int]] = {}
+        for t in tasks:
+            is_overdue = int(bool(t.due_date and t.status != TaskStatus.tamamlandı and t.due_date < now))
+            key = (t.assignee_id, t.category, t.status, t.priority, is_overdue)
+            bucket = groups.setdefault(key, [0, 0])
+            bucket[0] += 1
+            bucket[1] += t.story_points or 1
+        return [TaskAggregate(*key, tasks, points) for key, (tasks, points) in groups.items()]
+
+    @staticmethod
+    def score_aggregates(aggregates: List[TaskAggregate], member_ids: List[int]) -> ProjectScores:
+        total_points = sum(a.points for a in aggregates)
+        if total_points == 0:
+            return ProjectScores(
+                risk_score=0, performance_score=0, workload_balance=100,
+                completion_rate=0.0, total_tasks=0, open_tasks=0, overdue_tasks=0,
+                bottlenecks=[], workload=[]
+            )
+
+        open_aggs = [a for a in aggregates if a.status != TaskStatus.tamamlandı]
+        done_points = total_points - sum(a.points for a in open_aggs)
+        open_points = total_points - done_points
+        completion = done_points / total_points
+
+        # --- Risk: gecikmiş (öncelik ağırlıklı), atanmamış ve kritik açık işlerin payı ---
+        weight = lambda a: PRIORITY_RISK_WEIGHT.get(TaskPriority(a.priority), 1.0)
+        max_weight = max(PRIORITY_RISK_WEIGHT.values())
+        overdue_weighted = sum(a.points * weight(a) for a in open_aggs if a.overdue) / (total_points * max_weight)
+        overdue_share = sum(a.points for a in open_aggs if a.overdue) / open_points if open_points else 0.0
+        unassigned_share = sum(a.points for a in open_aggs if a.assignee_id is None) / open_points if open_points else 0.0
+        critical_share = sum(a.points for a in open_aggs if a.priority == TaskPriority.kritik) / open_points if open_points else 0.0
+        risk = 100 * (0.5 * min(1.0, overdue_weighted * 3) + 0.25 * unassigned_share + 0.25 * critical_share)
+
+        # --- İş yükü dengesi: üyelerin açık puanlarının varyasyon katsayısı ---
+        loads: Dict[int, int] = {user_id: 0 for user_id in member_ids}
+        for a in open_aggs:
+            if a.assignee_id is not None:
+                loads[a.assignee_id] = loads.get(a.assignee_id, 0) + a.points
+        values = list(loads.values())
+        balance = 1.0
+        if len(values) > 1 and sum(values) > 0:
+            mean = sum(values) / len(values)
+            std = math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+            balance = max(0.0, 1.0 - std / mean / math.sqrt(len(values) - 1))
+
+        performance = 100 * (0.6 * completion + 0.2 * (1 - overdue_share) + 0.2 * balance)
+
+        # --- Kategori darboğazları ---
+        by_category: Dict[str, List[int]] = {}
+        for a in open_aggs:
+            bucket = by_category.setdefault(a.category.value if hasattr(a.category, "value") else a.category, [0, 0, 0])
+            bucket[0] += a.tasks
+            bucket[1] += a.points
+            bucket[2] += a.tasks if a.overdue else 0
+        fair_share = 1 / len(by_category) if by_category else 0
+        bottlenecks = sorted((
+            CategoryBottleneck(
+                category=category, open_tasks=tasks, open_points=points, overdue_tasks=late,
+                share=round(points / open_points, 3)
+            )
+            for category, (tasks, points, late) in by_category.items()
+            if late > 0 or (len(by_category) > 1 and points / open_points > fair_share * BOTTLENECK_SHARE_FACTOR)
+        ), key=lambda b: (b.overdue_tasks, b.open_points), reverse=True)
+
+        return ProjectScores(
+            risk_score=_clamp(risk),
+            performance_score=_clamp(performance),
+            workload_balance=_clamp(balance * 100),
+            completion_rate=round(completion, 3),
+            total_tasks=sum(a.tasks for a in aggregates),
+            open_tasks=sum(a.tasks for a in open_aggs),
+            overdue_tasks=sum(a.tasks for a in open_aggs if a.overdue),
+            bottlenecks=bottlenecks,
+            workload=[MemberWorkload(user_id=user_id, open_points=points)
+                      for user_id, points in sorted(loads.items(), key=lambda item: -item[1])]
+        )
+
+analytics_service = AnalyticsService()
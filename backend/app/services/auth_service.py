@@ -11,6 +11,8 @@ from app.database import get_db
 from app.models.user_model import User 
 # Yeni modeller import edildi
 from app.models.project_member_model import ProjectMember, ProjectRole
+from app.metrics import PASSWORD_HASH_SECONDS
+from app.config import ADMIN_EMAILS
 
 # .env dosyasındaki değişkenleri yükle
 load_dotenv() 
@@ -33,10 +35,12 @@ except ValueError:
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with PASSWORD_HASH_SECONDS.time("verify"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    with PASSWORD_HASH_SECONDS.time("hash"):
+        return pwd_context.hash(password)
 
 
 # --- JWT (Token) Oluşturma (Değişmedi) ---
@@ -124,5 +128,22 @@ def get_project_admin(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Bu işlemi yapmak için proje admini olmalısınız."
         )
-    
-    return membership
\ No newline at end of file
+
+    return membership
+
+
+def get_system_admin(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    """
+    Kullanıcının sistem yöneticisi (ADMIN_EMAILS listesinde) olup olmadığını kontrol eder.
+
+    Bu, uygulama geneli yönetim endpoint'leri için kullanılır (/api/system/*: metrikler ve profil dosyaları).
+    """
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Bu işlem için sistem yöneticisi olmalısınız."
+        )
+
+    return current_user
@@ -0,0 +1,241 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+from app.config import (
+    SERVICE_CACHE_BACKEND, SERVICE_CACHE_REDIS_URL,
+    SERVICE_CACHE_MAX_ENTRIES, SERVICE_CACHE_DEFAULT_TTL_SECONDS,
+)
+from app.events import change_registry, ResourceKey
+
+# Bulunamadı işareti (None da geçerli bir değer olabilir)
+_MISSING = object()
+
+
+# --- BACKEND'LER ---
+
+class CacheBackend(ABC):
+    """
+    Anahtar/değer deposu arayüzü. Anahtarlar 'namespace:key' biçimindedir.
+    Değerler JSON'a çevrilebilir olmalıdır (ağ üzerindeki backend'ler için).
+    """
+    name = "base"
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Değeri döndürür; yoksa veya süresi dolduysa _MISSING."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self, prefix: str) -> None:
+        ...
+
+
+class MemoryBackend(CacheBackend):
+    """Süreç içi LRU + TTL. Her worker'ın kendi kopyası vardır."""
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (value, expires_at)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+
+class RedisBackend(CacheBackend):
+    """
+    Tüm worker'ların paylaştığı Redis deposu. 'redis' paketi sadece bu sınıf
+    oluşturulduğunda import edilir. Değerler JSON olarak saklanır.
+    """
+    name = "redis"
+
+    def __init__(self, url: str, key_prefix: str = "pm:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.key_prefix = key_prefix
+
+    def get(self, key: str) -> Any:
+        raw = self.client.get(self.key_prefix + key)
+        return _MISSING if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        self.client.set(self.key_prefix + key, json.dumps(value, ensure_ascii=False), ex=ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.key_prefix + key)
+
+    def clear(self, prefix: str) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.key_prefix}{prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def create_backend(name: str = SERVICE_CACHE_BACKEND) -> CacheBackend:
+    if name == "memory":
+        return MemoryBackend(SERVICE_CACHE_MAX_ENTRIES)
+    if name == "redis":
+        return RedisBackend(SERVICE_CACHE_REDIS_URL)
+    raise ValueError(f"Bilinmeyen SERVICE_CACHE_BACKEND: '{name}' (geçerli değerler: memory, redis)")
+
+
+# --- NAMESPACE VE ÖNBELLEK ---
+
+class CacheNamespace:
+    """
+    Bir servis önbelleğinin tek bir bölümü (örn. 'project_names').
+    'depends_on' verilirse (örn. "project"), commit edilen ("project", 5) değişikliği
+    bu namespace'teki 5 anahtarını siler.
+    """
+
+    def __init__(self, cache: "ServiceCache", name: str, ttl_seconds: int, depends_on: Optional[str]):
+        self.cache = cache
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.depends_on = depends_on
+        self._lock = threading.Lock()
+        # Yükleme sırasında geçersiz kılınan değerin geri yazılmasını önler
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.name}:{key}"
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Değer önbellekte yoksa loader() ile yükler ve saklar. None sonuçlar saklanmaz."""
+        value = self.cache.backend.get(self._key(key))
+        if value is not _MISSING:
+            self._count("hits")
+            return value
+
+        self._count("misses")
+        generation = self._generation
+        value = loader()
+        if value is not None and generation == self._generation:
+            self.cache.backend.set(self._key(key), value, self.ttl_seconds)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            self._stats["invalidations"] += 1
+        self.cache.backend.delete(self._key(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+        self.cache.backend.clear(f"{self.name}:")
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._stats)
+        lookups = data["hits"] + data["misses"]
+        data["hit_rate"] = round(data["hits"] / lookups, 4) if lookups else 0.0
+        data["ttl_seconds"] = self.ttl_seconds
+        return data
+
+
+class ServiceCache:
+    """
+    Servis katmanı için ortak önbellek. Backend ayarlardan seçilir (memory/redis) ve
+    set_backend() ile değiştirilebilir. Commit sonrası değişen kaynaklar, change
+    registry aboneliği üzerinden ilgili namespace anahtarlarını siler.
+    """
+
+    def __init__(self, backend_factory: Callable[[], CacheBackend] = create_backend):
+        self._backend_factory = backend_factory
+        self._backend: Optional[CacheBackend] = None
+        self._lock = threading.Lock()
+        self._namespaces: Dict[str, CacheNamespace] = {}
+        change_registry.subscribe(self.on_resources_changed)
+
+    @property
+    def backend(self) -> CacheBackend:
+        # Redis bağlantısı ilk kullanımda kurulur
+        backend = self._backend
+        if backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._backend_factory()
+                backend = self._backend
+        return backend
+
+    def set_backend(self, backend: Optional[CacheBackend]) -> None:
+        with self._lock:
+            self._backend = backend
+
+    def namespace(self, name: str, ttl_seconds: int = SERVICE_CACHE_DEFAULT_TTL_SECONDS,
+                  depends_on: Optional[str] = None) -> CacheNamespace:
+        with self._lock:
+            ns = self._namespaces.get(name)
+            if ns is None:
+                ns = self._namespaces[name] = CacheNamespace(self, name, ttl_seconds, depends_on)
+            return ns
+
+    def clear_all(self) -> None:
+        """Tüm namespace'leri boşaltır (invalidation bus mesaj kaçırdığında)."""
+        for ns in list(self._namespaces.values()):
+            ns.clear()
+
+    def on_resources_changed(self, keys: Set[ResourceKey]) -> None:
+        """change_registry aboneliği: değişen kaynaklara bağlı anahtarları siler."""
+        for ns in list(self._namespaces.values()):
+            if ns.depends_on is None:
+                continue
+            for kind, resource_id in keys:
+                if kind == ns.depends_on:
+                    ns.invalidate(resource_id)
+
+    def stats(self) -> dict:
+        backend = self._backend
+        return {
+            "backend": backend.name if backend else SERVICE_CACHE_BACKEND,
+            "evictions": getattr(backend, "evictions", 0),
+            "namespaces": {name: ns.stats() for name, ns in list(self._namespaces.items())},
+        }
+
+service_cache = ServiceCache()
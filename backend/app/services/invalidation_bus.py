@@ -0,0 +1,290 @@
+import json
+import select
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, List, Optional, Set
+
+from app.config import INVALIDATION_BUS, INVALIDATION_BUS_CHANNEL, WEB_CONCURRENCY
+from app.database import SQLALCHEMY_DATABASE_URL
+from app.events import ChangeRegistry, ResourceKey, change_registry
+from app.services.cache import service_cache
+
+# PostgreSQL NOTIFY yükü 8000 baytla sınırlı; mesajlar bu boyutun altında parçalanır
+_MAX_PAYLOAD_BYTES = 7000
+
+# Transport'un iletebileceği mesaj: JSON metni, ya da None = "mesaj kaçmış olabilir, her şeyi düşür"
+MessageHandler = Callable[[Optional[str]], None]
+
+
+# --- TRANSPORT'LAR ---
+
+class BusTransport(ABC):
+    """Worker'lar arası mesaj taşıyıcı arayüzü."""
+    name = "base"
+
+    @abstractmethod
+    def start(self, handler: MessageHandler) -> None:
+        ...
+
+    @abstractmethod
+    def publish(self, payload: str) -> None:
+        ...
+
+    def stop(self) -> None:
+        pass
+
+
+class LocalHub:
+    """Aynı süreçteki transport'ları birbirine bağlar (testler ve tek süreçli çalışma için)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers: List[MessageHandler] = []
+
+    def connect(self, handler: MessageHandler) -> None:
+        with self._lock:
+            self._handlers.append(handler)
+
+    def disconnect(self, handler: MessageHandler) -> None:
+        with self._lock:
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+
+    def broadcast(self, payload: str) -> None:
+        with self._lock:
+            handlers = list(self._handlers)
+        for handler in handlers:
+            handler(payload)
+
+
+class LocalTransport(BusTransport):
+    """Bellek içi transport; mesajlar aynı hub'a bağlı herkese senkron iletilir."""
+    name = "local"
+
+    def __init__(self, hub: LocalHub):
+        self.hub = hub
+        self._handler: Optional[MessageHandler] = None
+
+    def start(self, handler: MessageHandler) -> None:
+        self._handler = handler
+        self.hub.connect(handler)
+
+    def publish(self, payload: str) -> None:
+        self.hub.broadcast(payload)
+
+    def stop(self) -> None:
+        if self._handler is not None:
+            self.hub.disconnect(self._handler)
+            self._handler = None
+
+
+class PostgresTransport(BusTransport):
+    """
+    PostgreSQL LISTEN/NOTIFY. Dinleme için ayrı bir bağlantı ve arka plan thread'i,
+    yayın için ayrı (autocommit) bir bağlantı kullanılır. Bağlantı koparsa yeniden
+    bağlanılır ve aradaki mesajlar kaçmış olabileceği için handler(None) çağrılır.
+    """
+    name = "postgres"
+
+    RECONNECT_DELAY_SECONDS = 2.0
+
+    def __init__(self, database_url: str, channel: str):
+        # SQLAlchemy URL'sinden (postgresql+psycopg2://) psycopg2'nin anladığı URI'ye
+        self.dsn = database_url.replace("postgresql+psycopg2://", "postgresql://", 1)
+        self.channel = channel
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._publish_lock = threading.Lock()
+        self._publish_conn = None
+
+    def start(self, handler: MessageHandler) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, args=(handler,), name="invalidation-bus", daemon=True)
+        self._thread.start()
+
+    def publish(self, payload: str) -> None:
+        with self._publish_lock:
+            for attempt in (1, 2):
+                try:
+                    if self._publish_conn is None or self._publish_conn.closed:
+                        self._publish_conn = self._connect()
+                    with self._publish_conn.cursor() as cur:
+                        cur.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+                    return
+                except Exception:
+                    self._publish_conn = None
+                    if attempt == 2:
+                        raise
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        with self._publish_lock:
+            if self._publish_conn is not None:
+                self._publish_conn.close()
+                self._publish_conn = None
+
+    def _connect(self):
+        import psycopg2
+
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def _listen(self, handler: MessageHandler) -> None:
+        first_connect = True
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN "{self.channel}"')
+                if not first_connect:
+                    handler(None)
+                first_connect = False
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        handler(conn.notifies.pop(0).payload)
+            except Exception as e:
+                print(f"Invalidation bus bağlantı hatası: {e}")
+                first_connect = False
+                self._stop.wait(self.RECONNECT_DELAY_SECONDS)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+# --- BUS ---
+
+class InvalidationBus:
+    """
+    Commit sonrası "şu kaynaklar şu sürüme geçti" bilgisini diğer worker'lara yayar.
+    Uzak mesaj gelince yerel change registry aynı sürümleri alır (apply); böylece ETag'ler
+    worker'lar arasında eşleşir ve registry'ye abone önbellekler (servis önbelleği)
+    ilgili anahtarları siler.
+    """
+
+    def __init__(self, registry: ChangeRegistry, transport: Optional[BusTransport],
+                 on_resync: Optional[Callable[[], None]] = None):
+        self.registry = registry
+        self.transport = transport
+        self.on_resync = on_resync
+        self.origin = uuid.uuid4().hex
+        self._applying = threading.local()
+        self._subscribed = False
+        self._running = False
+        self._lock = threading.Lock()
+        self._stats = {"published": 0, "received": 0, "resyncs": 0, "errors": 0}
+
+    def start(self) -> None:
+        if self.transport is None or self._running:
+            return
+        if not self._subscribed:
+            self.registry.subscribe(self._on_local_change)
+            self._subscribed = True
+        self.transport.start(self._on_message)
+        self._running = True
+
+    def stop(self) -> None:
+        if self.transport is not None and self._running:
+            self._running = False
+            self.transport.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._stats)
+        data["transport"] = self.transport.name if self.transport else "off"
+        data["running"] = self._running
+        return data
+
+    # --- YARDIMCI METODLAR ---
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def _on_local_change(self, keys: Set[ResourceKey]) -> None:
+        # Uzaktan gelen değişikliği uygularken tekrar yayınlama (döngü olmasın)
+        if not self._running or getattr(self._applying, "active", False):
+            return
+        for payload in self._encode(keys):
+            self.transport.publish(payload)
+            self._count("published")
+
+    def _on_message(self, payload: Optional[str]) -> None:
+        if payload is None:
+            # Hangi kaynakların değiştiği bilinmiyor: tüm ETag'leri ve önbelleği geçersiz kıl
+            self._count("resyncs")
+            self.registry.reset()
+            if self.on_resync is not None:
+                self.on_resync()
+            return
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            self._count("errors")
+            return
+        if message.get("origin") == self.origin:
+            return
+
+        self._count("received")
+        self._applying.active = True
+        try:
+            self.registry.apply(((kind, key_id), version, changed_at)
+                                for kind, key_id, version, changed_at in message["keys"])
+        finally:
+            self._applying.active = False
+
+    def _encode(self, keys: Iterable[ResourceKey]) -> List[str]:
+        payloads, batch, size = [], [], 0
+        for key in keys:
+            # Alıcılar aynı sürümü kullanır; arada daha yeni bir değişiklik olduysa onun
+            # sürümü gider (o da kendi mesajıyla yayınlanır, alıcılar en yenisini tutar)
+            item = [*key, *self.registry.version(key)]
+            item_size = len(json.dumps(item)) + 1
+            if batch and size + item_size > _MAX_PAYLOAD_BYTES:
+                payloads.append(self._dumps(batch))
+                batch, size = [], 0
+            batch.append(item)
+            size += item_size
+        if batch:
+            payloads.append(self._dumps(batch))
+        return payloads
+
+    def _dumps(self, keys: list) -> str:
+        return json.dumps({"origin": self.origin, "keys": keys}, separators=(",", ":"))
+
+
+def create_transport(name: str = INVALIDATION_BUS, database_url: Optional[str] = SQLALCHEMY_DATABASE_URL,
+                     workers: int = WEB_CONCURRENCY) -> Optional[BusTransport]:
+    """
+    'auto': veritabanı PostgreSQL ise LISTEN/NOTIFY, değilse süreç içi transport.
+    Süreç içi transport diğer worker'lara ulaşmaz; birden fazla worker ile açıkça
+    'local' seçilmişse açılış hata verir, 'auto' bu duruma düşerse uyarı basılır.
+    """
+    if name == "auto":
+        if database_url and database_url.startswith("postgresql"):
+            return PostgresTransport(database_url, INVALIDATION_BUS_CHANNEL)
+        if workers > 1:
+            print(f"UYARI: INVALIDATION_BUS=auto PostgreSQL dışı veritabanında süreç içi transport'a düştü; "
+                  f"{workers} worker'ın önbellekleri ve ETag'leri birbirinden habersiz kalır.")
+        return LocalTransport(LocalHub())
+    if name == "postgres":
+        return PostgresTransport(database_url, INVALIDATION_BUS_CHANNEL)
+    if name == "local":
+        if workers > 1:
+            raise ValueError(f"INVALIDATION_BUS=local tek süreçlidir, WEB_CONCURRENCY={workers} ile kullanılamaz "
+                             f"(postgres veya off seçin).")
+        return LocalTransport(LocalHub())
+    if name == "off":
+        return None
+    raise ValueError(f"Bilinmeyen INVALIDATION_BUS: '{name}' (geçerli değerler: auto, postgres, local, off)")
+
+
+invalidation_bus = InvalidationBus(change_registry, create_transport(), on_resync=service_cache.clear_all)
@@ -0,0 +1,64 @@
+import re
+
+
+class JsonStringFieldReader:
+    """
+    Parça parça gelen bir JSON metninde tek bir string alanın ('summary' gibi)
+    değerini, tüm JSON tamamlanmadan çözer. Her 'feed' çağrısı o ana kadar
+    çözülebilen YENİ metni döndürür; yarım kalan kaçış dizileri sonraki parçayı bekler.
+    """
+
+    _ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+    def __init__(self, field: str):
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._pos = None
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        if self.done:
+            return ""
+
+        if self._pos is None:
+            match = self._key.search(self._buffer)
+            if match is None:
+                return ""
+            self._pos = match.end()
+
+        buf, i, out = self._buffer, self._pos, []
+        while i < len(buf):
+            c = buf[i]
+            if c == '"':
+                self.done = True
+                i += 1
+                break
+            if c != "\\":
+                out.append(c)
+                i += 1
+                continue
+
+            # Kaçış dizisi: tamamı gelmediyse bir sonraki parçayı bekle
+            if i + 1 >= len(buf):
+                break
+            escape = buf[i + 1]
+            if escape != "u":
+                out.append(self._ESCAPES.get(escape, escape))
+                i += 2
+                continue
+            if i + 6 > len(buf):
+                break
+            code = int(buf[i + 2:i + 6], 16)
+            if 0xD800 <= code < 0xDC00:
+                # UTF-16 vekil çifti (örn. emoji): ikinci yarıyı da bekle
+                if i + 12 > len(buf):
+                    break
+                low = int(buf[i + 8:i + 12], 16)
+                code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                i += 6
+            out.append(chr(code))
+            i += 6
+
+        self._pos = i
+        return "".join(out)
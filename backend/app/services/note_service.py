@@ -0,0 +1,207 @@
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from typing import Dict, List, Optional
+
+from app.config import NOTE_AUTOSAVE_COALESCE_SECONDS
+from app.database import SessionLocal
+from app.events import change_registry
+from app.models.note_model import Note
+from app.schemas import note_schemas
+from app.fast_json import ColumnProjection
+
+# Liste görünümünde döndürülecek önizleme uzunluğu (karakter)
+NOTE_EXCERPT_LENGTH = 160
+
+# fields= ile alan seçimi için şema -> kolon eşlemesi (bkz. app/fast_json.py)
+NOTE_DISPLAY_COLUMNS = ColumnProjection(note_schemas.NoteDisplay, Note)
+
+class NoteService:
+
+    @staticmethod
+    def list_note_summaries(db: Session, user_id: int, limit: int = 50, before_id: Optional[int] = None) -> note_schemas.NotePage:
+        """
+        Kullanıcının notlarını hafif formatta, keyset sayfalama ile listeler.
+        'content' kolonu hiç yüklenmez; önizleme veritabanında substr ile kesilir.
+        Sıralama (user_id, id) indeksini kullanır: en yeni not en üstte.
+        """
+        query = db.query(
+            Note.id,
+            Note.title,
+            func.substr(Note.content, 1, NOTE_EXCERPT_LENGTH).label("excerpt"),
+            Note.updated_at
+        ).filter(Note.user_id == user_id)
+
+        if before_id is not None:
+            query = query.filter(Note.id < before_id)
+
+        # Bir fazla satır çekerek sonraki sayfanın varlığını anlarız
+        rows = query.order_by(Note.id.desc()).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = [note_schemas.NoteSummary.model_validate(row) for row in rows]
+        next_cursor = items[-1].id if has_more else None
+        return note_schemas.NotePage(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    def get_note_rows(db: Session, user_id: int, projection: ColumnProjection = NOTE_DISPLAY_COLUMNS) -> List[dict]:
+        """Kullanıcının notları, sadece projeksiyondaki kolonlarla (örn. 'content' olmadan)."""
+        rows = db.query(*projection.columns).filter(Note.user_id == user_id).order_by(Note.id).all()
+        return projection.to_dicts(rows)
+
+    @staticmethod
+    def apply_text_ops(content: str, ops: List[note_schemas.NoteTextOp]) -> str:
+        """Delta işlemlerini sırayla metne uygular. Geçersiz konumda 422 döndürür."""
+        for op in ops:
+            if op.position + op.delete > len(content):
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Geçersiz değişiklik: {op.position}+{op.delete} metin uzunluğunu ({len(content)}) aşıyor."
+                )
+            content = content[:op.position] + op.insert + content[op.position + op.delete:]
+        return content
+
+
+class _PendingNote:
+    """Bellekte bekleyen (henüz yazılmamış) not durumu."""
+    __slots__ = ("user_id", "title", "content", "version", "dirty_since")
+
+    def __init__(self, user_id: int, title: str, content: str, version: int):
+        self.user_id = user_id
+        self.title = title
+        self.content = content
+        self.version = version
+        self.dirty_since = time.monotonic()
+
+
+class NoteWriteBuffer:
+    """
+    Otomatik kaydetme için yazma birleştirici (write coalescing).
+    Aynı nota art arda gelen PATCH istekleri bellekte birleştirilir ve nota
+    en fazla 'interval' saniyede bir yazılır. Okuma/PUT/DELETE öncesinde ilgili
+    not 'flush' edilir, böylece kullanıcı her zaman son hâli görür.
+
+    Kilit sadece bellekteki durumu korur; veritabanı yazımı kilit dışında yapılır.
+    Bekleyen kayıt ancak başarılı commit'ten sonra silinir: yazma hata verirse
+    değişiklikler kaybolmaz, zamanlayıcı tekrar dener.
+    """
+
+    # Başarısız yazımlar en erken bu kadar saniye sonra tekrar denenir
+    RETRY_SECONDS = 1.0
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending: Dict[int, _PendingNote] = {}
+        self._timer: Optional[threading.Timer] = None
+
+    def apply_patch(self, db: Session, note: Note, patch: note_schemas.NotePatch) -> note_schemas.NotePatchResult:
+        with self._lock:
+            entry = self._pending.get(note.id)
+            current_version = entry.version if entry else note.version
+            if patch.base_version != current_version:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Not güncel değil (sunucu sürümü: {current_version}). Lütfen notu yeniden yükleyin."
+                )
+
+            content = entry.content if entry else (note.content or "")
+            content = NoteService.apply_text_ops(content, patch.ops)
+            title = patch.title if patch.title is not None else (entry.title if entry else note.title)
+
+            if entry is None:
+                entry = _PendingNote(note.user_id, title, content, current_version + 1)
+                self._pending[note.id] = entry
+            else:
+                entry.title, entry.content, entry.version = title, content, current_version + 1
+            version = entry.version
+
+            # Birleştirme kapalıysa veya aralık dolduysa hemen yaz
+            due = self.interval <= 0 or time.monotonic() - entry.dirty_since >= self.interval
+            if not due:
+                self._schedule(self.interval)
+
+        persisted = due and self._persist(db, note.id)
+        return note_schemas.NotePatchResult(id=note.id, version=version, persisted=persisted)
+
+    def flush_note(self, db: Session, note_id: int) -> None:
+        """Tek bir notun bekleyen değişikliklerini yazar."""
+        if not self._pending:
+            return
+        self._persist(db, note_id)
+
+    def flush_user(self, db: Session, user_id: int) -> None:
+        """Kullanıcının bekleyen tüm not değişikliklerini yazar (liste okumalarından önce)."""
+        if not self._pending:
+            return
+        with self._lock:
+            note_ids = [nid for nid, e in self._pending.items() if e.user_id == user_id]
+        for note_id in note_ids:
+            self._persist(db, note_id)
+
+    def flush_all(self) -> None:
+        """Bekleyen her şeyi kendi session'ı ile yazar (zamanlayıcı ve kapanış için)."""
+        with self._lock:
+            self._timer = None
+            note_ids = list(self._pending)
+        if not note_ids:
+            return
+        db = SessionLocal()
+        try:
+            for note_id in note_ids:
+                self._persist(db, note_id)
+        finally:
+            db.close()
+
+    # --- YARDIMCI METODLAR ---
+
+    def _persist(self, db: Session, note_id: int) -> bool:
+        """
+        Notun bekleyen hâlini yazar; başarılıysa (veya bekleyen yoksa) True döner.
+        Hata okuma isteğini düşürmez: kayıt bellekte kalır ve tekrar denenir.
+        """
+        with self._lock:
+            entry = self._pending.get(note_id)
+            if entry is None:
+                return True
+            user_id, title, content, version = entry.user_id, entry.title, entry.content, entry.version
+
+        try:
+            # Eşzamanlı iki yazımdan eski sürümü taşıyanı veritabanındaki yeniyi ezemez
+            db.query(Note).filter(Note.id == note_id, Note.version < version).update({
+                Note.title: title,
+                Note.content: content,
+                Note.version: version,
+                Note.updated_at: datetime.now()
+            }, synchronize_session="fetch")
+            # Toplu UPDATE flush olayı üretmez; ETag sürümleri elle işaretlenir
+            change_registry.mark(db, ("user_notes", user_id), ("note", note_id))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Not Yazma Hatası ({note_id}): {e}")
+            with self._lock:
+                self._schedule(max(self.interval, self.RETRY_SECONDS))
+            return False
+
+        with self._lock:
+            # Yazım sürerken yeni bir PATCH geldiyse kayıt bekleyen olarak kalır
+            current = self._pending.get(note_id)
+            if current is not None and current.version == version:
+                del self._pending[note_id]
+        return True
+
+    def _schedule(self, delay: float) -> None:
+        """Kilit altında çağrılır."""
+        if self._timer is None:
+            self._timer = threading.Timer(delay, self.flush_all)
+            self._timer.daemon = True
+            self._timer.start()
+
+note_service = NoteService()
+note_write_buffer = NoteWriteBuffer(NOTE_AUTOSAVE_COALESCE_SECONDS)
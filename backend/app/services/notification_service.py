@@ -1,6 +1,12 @@
 from sqlalchemy.orm import Session
 from app.models.notification_model import Notification
 from typing import List
+from app.metrics import NOTIFICATIONS_CREATED
+from app.schemas import notification_schemas
+from app.fast_json import ColumnProjection
+
+# fields= ile alan seçimi için şema -> kolon eşlemesi (bkz. app/fast_json.py)
+NOTIFICATION_DISPLAY_COLUMNS = ColumnProjection(notification_schemas.NotificationDisplay, Notification)
 
 class NotificationService:
     
@@ -15,6 +21,7 @@ class NotificationService:
         db.add(new_notif)
         db.commit()
         db.refresh(new_notif)
+        NOTIFICATIONS_CREATED.inc()
         return new_notif
 
     @staticmethod
@@ -26,6 +33,17 @@ class NotificationService:
             .limit(limit)\
             .all()
 
+    @staticmethod
+    def get_user_notification_rows(db: Session, user_id: int, projection: ColumnProjection = NOTIFICATION_DISPLAY_COLUMNS,
+                                   limit: int = 10) -> List[dict]:
+        """get_user_notifications ile aynı sıralama; sadece projeksiyondaki kolonlar okunur."""
+        rows = db.query(*projection.columns)\
+            .filter(Notification.user_id == user_id)\
+            .order_by(Notification.created_at.desc())\
+            .limit(limit)\
+            .all()
+        return projection.to_dicts(rows)
+
     @staticmethod
     def mark_as_read(db: Session, notification_id: int, user_id: int):
         """Bildirimi okundu olarak işaretler."""
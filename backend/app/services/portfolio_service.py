@@ -0,0 +1,133 @@
+import queue
+import time
+from datetime import datetime
+from sqlalchemy.orm import Session
+from typing import Dict, Iterator, List
+
+from app.config import AI_PORTFOLIO_MAX_PROJECTS
+from app.models.project_model import Project
+from app.models.project_member_model import ProjectMember
+from app.schemas.analysis_schemas import (
+    AnalysisResponse, PortfolioProject, PortfolioOverview, PortfolioResult, PortfolioDone
+)
+from app.services.analysis_cache import analysis_cache, fingerprint_project_data
+from app.services.analysis_jobs import analysis_jobs, AnalysisJob
+from app.services.analytics_service import analytics_service
+from app.services.project_snapshot import project_snapshot_builder
+
+# Akışın tüm analizleri toplamda beklenebileceği en uzun süre (saniye)
+RESULT_WAIT_SECONDS = 300
+
+
+class PortfolioRun:
+    """Başlatılmış bir portföy analizi: anlık sıralama, hazır sonuçlar ve bekleyen işler."""
+
+    def __init__(self, projects: Dict[int, PortfolioProject], ready: List[AnalysisResponse], jobs: List[AnalysisJob]):
+        self.projects = projects
+        self.ready = ready
+        self.jobs = jobs
+
+    def ranking(self) -> List[PortfolioProject]:
+        return sorted(self.projects.values(), key=lambda p: (-p.risk_score, p.project_id))
+
+
+class PortfolioService:
+    """
+    Kullanıcının üyesi olduğu tüm projeleri tek istekte analiz eder.
+    Veriler ve yerel skorlar toplu sorgularla hazırlanır; parmak izi değişmeyen
+    projeler önbellekten döner, kalanlar ortak iş havuzunda (küresel LLM sınırı
+    altında) eşzamanlı çalışır.
+    """
+
+    @staticmethod
+    def start(db: Session, user_id: int, force_refresh: bool = False) -> PortfolioRun:
+        """Tüm veritabanı işini istek session'ı ile burada yapar; akış sadece işleri bekler."""
+        projects = db.query(Project.id, Project.name)\
+            .join(ProjectMember, ProjectMember.project_id == Project.id)\
+            .filter(ProjectMember.user_id == user_id)\
+            .order_by(Project.id)\
+            .limit(AI_PORTFOLIO_MAX_PROJECTS)\
+            .all()
+        project_ids = [p.id for p in projects]
+
+        snapshot_at = datetime.now()
+        snapshots = project_snapshot_builder.build_many(db, project_ids)
+        scores = analytics_service.compute_scores_many(db, project_ids)
+
+        entries: Dict[int, PortfolioProject] = {}
+        ready: List[AnalysisResponse] = []
+        jobs: List[AnalysisJob] = []
+        for project in projects:
+            project_data_json = snapshots[project.id]
+            fingerprint = fingerprint_project_data(project_data_json)
+            project_scores = scores[project.id]
+
+            cached = None if force_refresh else analysis_cache.get(db, project.id, fingerprint)
+            if cached is not None:
+                ready.append(AnalysisResponse(
+                    project_id=project.id, analysis=cached, scores=project_scores, cached=True, fingerprint=fingerprint
+                ))
+            else:
+                # Önbellek burada zaten kontrol edildi; iş yöneticisi tekrar bakmasın
+                jobs.append(analysis_jobs.submit_prepared(
+                    db, project.id, project_data_json, fingerprint, force_refresh=True, snapshot_at=snapshot_at
+                ))
+
+            entries[project.id] = PortfolioProject(
+                project_id=project.id,
+                name=project.name,
+                risk_score=project_scores.risk_score,
+                performance_score=project_scores.performance_score,
+                open_tasks=project_scores.open_tasks,
+                overdue_tasks=project_scores.overdue_tasks,
+                status="unchanged" if cached is not None else "pending"
+            )
+
+        return PortfolioRun(entries, ready, jobs)
+
+    @staticmethod
+    def stream(run: PortfolioRun) -> Iterator[str]:
+        """NDJSON satırları üretir: önce sıralama, sonra biten her analiz, en sonda özet."""
+        yield PortfolioOverview(projects=run.ranking()).model_dump_json() + "\n"
+
+        for result in run.ready:
+            yield PortfolioResult(project_id=result.project_id, result=result).model_dump_json() + "\n"
+
+        finished: "queue.Queue[AnalysisJob]" = queue.Queue()
+        for job in run.jobs:
+            job.add_done_callback(finished.put)
+
+        analyzed = failed = 0
+        deadline = time.monotonic() + RESULT_WAIT_SECONDS
+        for _ in run.jobs:
+            try:
+                job = finished.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            entry = run.projects[job.project_id]
+            if job.error:
+                failed += 1
+                entry.status = "failed"
+            else:
+                analyzed += 1
+                entry.status = "done"
+                entry.risk_score = job.result.analysis.risk_score
+                entry.performance_score = job.result.analysis.performance_score
+            yield PortfolioResult(project_id=job.project_id, result=job.result, error=job.error).model_dump_json() + "\n"
+
+        # Süresinde bitmeyen işler arka planda sürer; bu akışta zaman aşımı olarak raporlanır
+        timed_out = 0
+        for entry in run.projects.values():
+            if entry.status == "pending":
+                entry.status = "timed_out"
+                timed_out += 1
+
+        yield PortfolioDone(
+            analyzed=analyzed,
+            unchanged=len(run.ready),
+            failed=failed,
+            timed_out=timed_out,
+            ranking=run.ranking()
+        ).model_dump_json() + "\n"
+
+portfolio_service = PortfolioService()
@@ -0,0 +1,58 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.models.project_model import Project
+from app.models.project_member_model import ProjectMember
+from app.models.task_model import Task
+from app.models.user_model import User
+from app.services.project_service import PROJECT_DISPLAY_COLUMNS, USER_DISPLAY_COLUMNS
+from app.services.task_service import TASK_DISPLAY_COLUMNS
+from app.services.analytics_service import analytics_service
+
+
+class ProjectOverviewService:
+    """
+    Proje sayfalarının ihtiyaç duyduğu her şey tek yanıtta: proje, üyeler, pano görevleri
+    ve yerel skorlar. Yetki kontrolü router'da bir kez yapılır (get_project_membership);
+    buradaki sorgu sayısı proje/görev sayısından bağımsız olarak sabittir:
+      1. proje + üyeler (kullanıcı bilgisiyle) tek join,
+      2. görevler (TaskDisplay kolonları).
+    Skorlar ikinci sorgunun satırlarından hesaplanır (analytics_service.aggregate_tasks),
+    ayrıca GROUP BY sorgusu çalıştırılmaz.
+    """
+
+    @staticmethod
+    def get_overview(db: Session, project_id: int, role, now: Optional[datetime] = None) -> dict:
+        member_rows = db.query(
+            *PROJECT_DISPLAY_COLUMNS.columns, ProjectMember.id, ProjectMember.role, *USER_DISPLAY_COLUMNS.columns
+        ).join(ProjectMember, ProjectMember.project_id == Project.id)\
+            .join(User, User.id == ProjectMember.user_id)\
+            .filter(Project.id == project_id)\
+            .order_by(ProjectMember.id)\
+            .all()
+
+        # Çağıran üye olduğu için en az bir satır vardır
+        project_width = len(PROJECT_DISPLAY_COLUMNS.fields)
+        project = dict(zip(PROJECT_DISPLAY_COLUMNS.fields, member_rows[0][:project_width]))
+        user_fields = USER_DISPLAY_COLUMNS.fields
+        project["memberships"] = [
+            {"id": row[project_width], "role": row[project_width + 1], "user": dict(zip(user_fields, row[project_width + 2:]))}
+            for row in member_rows
+        ]
+
+        # Satırlar hem yanıt sözlüklerine hem skor toplamlarına kaynak olur (Row nesneleri
+        # Task ile aynı öznitelik adlarına sahip)
+        task_rows = db.query(*TASK_DISPLAY_COLUMNS.columns).filter(Task.project_id == project_id).all()
+        aggregates = analytics_service.aggregate_tasks(task_rows, now)
+        member_ids = [m["user"]["id"] for m in project["memberships"]]
+        stats = analytics_service.score_aggregates(aggregates, member_ids)
+
+        return {
+            "project": project,
+            "my_role": role,
+            "tasks": TASK_DISPLAY_COLUMNS.to_dicts(task_rows),
+            "stats": stats.model_dump(),
+        }
+
+project_overview_service = ProjectOverviewService()
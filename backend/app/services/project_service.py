@@ -1,12 +1,25 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List
+from typing import List, Optional
 
 from app.models.project_model import Project
 from app.models.user_model import User
 from app.models.project_member_model import ProjectMember, ProjectRole
 from app.schemas import project_schemas, project_member_schemas
+from app.schemas.user_schemas import UserDisplay
 from app.services.notification_service import notification_service
+from app.services.activity_service import (
+    activity_service, PROJECT_CREATED, PROJECT_UPDATED, MEMBER_ADDED, MEMBER_REMOVED, MEMBER_ROLE_CHANGED,
+)
+from app.services.cache import service_cache
+from app.fast_json import ColumnProjection
+
+# Proje adı bildirim metinlerinde sık kullanılır; proje değişince (commit sonrası) silinir
+_project_names = service_cache.namespace("project_names", depends_on="project")
+
+# Hızlı JSON yolu için şema -> kolon eşlemeleri (bkz. app/fast_json.py)
+PROJECT_DISPLAY_COLUMNS = ColumnProjection(project_schemas.ProjectDisplay, Project, exclude=("memberships",))
+USER_DISPLAY_COLUMNS = ColumnProjection(UserDisplay, User)
 
 class ProjectService:
     
@@ -29,28 +42,72 @@ class ProjectService:
         
         return membership.project
 
+    @staticmethod
+    def get_project_name(db: Session, project_id: int) -> Optional[str]:
+        """Proje adını önbellekten (yoksa tek kolonluk sorguyla) döndürür. Proje yoksa None."""
+        def load() -> Optional[str]:
+            row = db.query(Project.name).filter(Project.id == project_id).first()
+            return row.name if row else None
+        return _project_names.get_or_load(project_id, load)
+
     @staticmethod
     def get_user_projects(db: Session, user_id: int) -> List[Project]:
         """Kullanıcının üye olduğu tüm projeleri listeler."""
         memberships = db.query(ProjectMember).filter(ProjectMember.user_id == user_id).all()
         return [m.project for m in memberships]
 
+    @staticmethod
+    def get_user_project_rows(db: Session, user_id: int, projection: ColumnProjection = PROJECT_DISPLAY_COLUMNS,
+                              include_memberships: bool = True) -> List[dict]:
+        """
+        get_user_projects ile aynı veri; ProjectDisplay sözlükleri.
+        Projeler ve tüm üyelikler (kullanıcı bilgisiyle) iki sorguda gelir (N+1 yok).
+        'include_memberships' False ise (fields= içinde 'memberships' yok) ikinci sorgu hiç çalışmaz.
+        """
+        project_rows = db.query(*projection.columns)\
+            .join(ProjectMember, ProjectMember.project_id == Project.id)\
+            .filter(ProjectMember.user_id == user_id)\
+            .order_by(ProjectMember.id)\
+            .all()
+        projects = projection.to_dicts(project_rows)
+        if not projects or not include_memberships:
+            return projects
+
+        by_id = {}
+        for project in projects:
+            project["memberships"] = []
+            by_id[project["id"]] = project
+
+        member_rows = db.query(ProjectMember.project_id, ProjectMember.id, ProjectMember.role, *USER_DISPLAY_COLUMNS.columns)\
+            .join(User, User.id == ProjectMember.user_id)\
+            .filter(ProjectMember.project_id.in_(by_id))\
+            .order_by(ProjectMember.id)\
+            .all()
+        user_fields = USER_DISPLAY_COLUMNS.fields
+        for row in member_rows:
+            by_id[row[0]]["memberships"].append({
+                "id": row[1],
+                "role": row[2],
+                "user": dict(zip(user_fields, row[3:])),
+            })
+        return projects
+
     @staticmethod
     def create_project(db: Session, project_data: project_schemas.ProjectCreate, user_id: int) -> Project:
         """Yeni proje oluşturur ve oluşturanı Admin yapar."""
         # 1. Projeyi oluştur
         db_project = Project(**project_data.dict())
         db.add(db_project)
-        db.commit()
-        db.refresh(db_project)
+        db.flush()
         
-        # 2. Üyeliği (Admin) ekle
+        # 2. Üyeliği (Admin) ve aktivite kaydını ekle; hepsi tek commit'te yazılır
         db_membership = ProjectMember(
             project_id=db_project.id,
             user_id=user_id,
             role=ProjectRole.admin
         )
         db.add(db_membership)
+        activity_service.record(db, db_project.id, user_id, PROJECT_CREATED, details={"name": db_project.name})
         db.commit()
         db.refresh(db_project)
         
@@ -70,10 +127,13 @@ class ProjectService:
         if not update_data:
             raise HTTPException(status_code=400, detail="Güncellenecek veri gönderilmedi.")
 
+        changes = activity_service.changes(db_project, update_data)
         for key, value in update_data.items():
             setattr(db_project, key, value)
             
         db.add(db_project)
+        if changes:
+            activity_service.record(db, project_id, user_id, PROJECT_UPDATED, details={"changes": changes})
         db.commit()
         db.refresh(db_project)
         return db_project
@@ -111,9 +171,12 @@ class ProjectService:
             role=invite_data.role
         )
         db.add(new_member)
+        activity_service.record(db, project_id, user_id, MEMBER_ADDED, details={
+            "user_id": user_to_add.id, "email": user_to_add.email, "role": new_member.role,
+        })
         db.commit()
 
-        project_name = db.query(Project).filter(Project.id == project_id).first().name
+        project_name = ProjectService.get_project_name(db, project_id)
         notification_service.create_notification(
             db, 
             user_to_add.id, # Yeni eklenen üyeye git
@@ -137,6 +200,9 @@ class ProjectService:
         if membership.user_id == admin_user_id:
             raise HTTPException(status_code=400, detail="Admin kendini projeden atamaz.")
             
+        activity_service.record(db, project_id, admin_user_id, MEMBER_REMOVED, details={
+            "user_id": membership.user_id, "email": membership.user.email,
+        })
         db.delete(membership)
         db.commit()
 
@@ -149,6 +215,10 @@ class ProjectService:
         if not membership:
             raise HTTPException(status_code=404, detail="Üyelik kaydı bulunamadı.")
             
+        if membership.role != role:
+            activity_service.record(db, project_id, admin_user_id, MEMBER_ROLE_CHANGED, details={
+                "user_id": membership.user_id, "changes": {"role": [membership.role, role]},
+            })
         membership.role = role
         db.add(membership)
         db.commit()
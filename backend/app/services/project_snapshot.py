@@ -0,0 +1,314 @@
+import json
+import threading
+from datetime import datetime
+from sqlalchemy import and_, or_, case, cast, func, literal, DateTime, Integer
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+
+from app.config import AI_PROMPT_TOKEN_BUDGET
+from app.models.project_model import Project
+from app.models.task_model import Task, TaskStatus, TaskPriority
+from app.models.project_member_model import ProjectMember
+from app.models.user_model import User
+
+# Kaba token tahmini: ~4 karakter = 1 token
+CHARS_PER_TOKEN = 4
+
+UNASSIGNED = -1
+
+TASK_COLUMNS = ["baslik", "durum", "oncelik", "kategori", "puan", "atanan", "gecikme_gun", "bitis"]
+
+ENCODING_NOTE = (
+    "gorevler satırları gorev_kolonlari sırasındadır. durum/oncelik/kategori değerleri "
+    "sozluk içindeki listelerin, atanan ve uyeler değerleri 'kisiler' listesinin indeksidir "
+    "(atanan -1 = Atanmamış). gecikme_gun > 0 ise görev gecikmiştir."
+)
+
+# Bütçe aşıldığında hangi görevlerin tek tek kalacağını belirleyen ağırlıklar
+_PRIORITY_WEIGHT = {
+    TaskPriority.kritik: 3, TaskPriority.yuksek: 2, TaskPriority.orta: 1, TaskPriority.dusuk: 0,
+}
+
+
+def _overdue_days_expr(dialect: str, now: datetime):
+    """Gecikme gün sayısını SQL'de hesaplar (Python'daki timedelta.days ile aynı)."""
+    if dialect == "postgresql":
+        return cast(func.date_part("day", literal(now, DateTime) - Task.due_date), Integer)
+    if dialect == "sqlite":
+        return cast(func.julianday(literal(now, DateTime)) - func.julianday(Task.due_date), Integer)
+    return None
+
+
+class PromptStats:
+    """Prompt boyutu metrikleri: eski (girintili JSON) format, kompakt format ve bütçe sonrası."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {
+            "snapshots": 0, "trimmed_snapshots": 0,
+            "legacy_chars_total": 0, "compact_chars_total": 0, "final_chars_total": 0,
+            "last_legacy_chars": 0, "last_compact_chars": 0, "last_final_chars": 0,
+        }
+
+    def record(self, legacy_chars: int, compact_chars: int, final_chars: int, trimmed: bool) -> None:
+        with self._lock:
+            d = self._data
+            d["snapshots"] += 1
+            d["trimmed_snapshots"] += int(trimmed)
+            d["legacy_chars_total"] += legacy_chars
+            d["compact_chars_total"] += compact_chars
+            d["final_chars_total"] += final_chars
+            d["last_legacy_chars"], d["last_compact_chars"], d["last_final_chars"] = legacy_chars, compact_chars, final_chars
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            d = dict(self._data)
+        d["estimated_tokens_saved"] = (d["legacy_chars_total"] - d["final_chars_total"]) // CHARS_PER_TOKEN
+        d["compression_ratio"] = round(d["final_chars_total"] / d["legacy_chars_total"], 4) if d["legacy_chars_total"] else 0.0
+        return d
+
+
+class ProjectSnapshotBuilder:
+    """
+    AI prompt'u için proje verisini hazırlar.
+    - Üyeler tek bir JOIN sorgusuyla, görevler tek bir sorguyla çekilir (N+1 yok).
+    - Gecikme durumu SQL'de hesaplanır.
+    - Çıktı kolon bazlıdır; tekrar eden isimler ve enum değerleri sözlükle kodlanır.
+    - Token bütçesi aşılırsa düşük öncelikli görevler özetlenir.
+    """
+
+    def __init__(self, token_budget: int):
+        self.token_budget = token_budget
+        self.stats = PromptStats()
+
+    def build(self, db: Session, project_id: int, now: Optional[datetime] = None) -> str:
+        snapshots = self.build_many(db, [project_id], now)
+        if project_id not in snapshots:
+            raise ValueError(f"Proje ID {project_id} bulunamadı.")
+        return snapshots[project_id]
+
+    def build_many(self, db: Session, project_ids: List[int], now: Optional[datetime] = None) -> Dict[int, str]:
+        """
+        Birden fazla projenin verisini aynı iki sorguyla hazırlar (portföy analizi için).
+        Bulunamayan projeler sonuçta yer almaz.
+        """
+        now = now or datetime.now()
+        if not project_ids:
+            return {}
+
+        members_by_project, tasks_by_project, python_overdue = self._fetch(db, project_ids, now)
+        return {
+            project_id: self._encode(rows, tasks_by_project.get(project_id, []), now, python_overdue)
+            for project_id, rows in members_by_project.items()
+        }
+
+    def build_changes(self, db: Session, project_id: int, since: datetime, now: Optional[datetime] = None) -> Optional[dict]:
+        """
+        Artımlı analiz için: sadece 'since' tarihinden sonra değişen görevleri aynı
+        kompakt formatta döndürür (JSON'a çevrilmemiş sözlük). Proje yoksa None.
+        'updated_at' değeri olmayan (eski) görevler değişmiş sayılır.
+        """
+        now = now or datetime.now()
+        members_by_project, tasks_by_project, python_overdue = self._fetch(db, [project_id], now, changed_since=since)
+        if project_id not in members_by_project:
+            return None
+        return self._snapshot(members_by_project[project_id], tasks_by_project.get(project_id, []), now, python_overdue)
+
+    def _fetch(self, db: Session, project_ids: List[int], now: datetime, changed_since: Optional[datetime] = None) -> tuple:
+        """Projeleri + üyeleri tek sorguyla, görevleri tek sorguyla çeker."""
+        # 1. Projeler + üyeler (tek sorgu)
+        member_rows = db.query(
+            Project.id.label("project_id"), Project.name, ProjectMember.role,
+            User.id, User.first_name, User.last_name, User.email
+        ).select_from(Project)\
+            .outerjoin(ProjectMember, ProjectMember.project_id == Project.id)\
+            .outerjoin(User, User.id == ProjectMember.user_id)\
+            .filter(Project.id.in_(project_ids))\
+            .order_by(Project.id, ProjectMember.id)\
+            .all()
+
+        members_by_project: Dict[int, list] = {}
+        for row in member_rows:
+            members_by_project.setdefault(row.project_id, []).append(row)
+
+        # 2. Görevler (tek sorgu, gecikme SQL'de)
+        is_overdue = and_(Task.due_date.isnot(None), Task.due_date < now, Task.status != TaskStatus.tamamlandı)
+        days_expr = _overdue_days_expr(db.get_bind().dialect.name, now)
+        overdue_col = case((is_overdue, days_expr if days_expr is not None else 1), else_=0).label("gecikme")
+
+        query = db.query(
+            Task.project_id, Task.title, Task.status, Task.priority, Task.category, Task.story_points,
+            Task.assignee_id, Task.due_date, overdue_col
+        ).filter(Task.project_id.in_(project_ids))
+        if changed_since is not None:
+            query = query.filter(or_(Task.updated_at.is_(None), Task.updated_at > changed_since))
+        task_rows = query.order_by(Task.project_id, Task.id).all()
+
+        tasks_by_project: Dict[int, list] = {}
+        for row in task_rows:
+            tasks_by_project.setdefault(row.project_id, []).append(row)
+
+        return members_by_project, tasks_by_project, days_expr is None
+
+    def _encode(self, member_rows: list, task_rows: list, now: datetime, python_overdue: bool) -> str:
+        snapshot = self._snapshot(member_rows, task_rows, now, python_overdue)
+
+        compact = self._dumps(snapshot)
+        final, trimmed = compact, False
+        budget_chars = self.token_budget * CHARS_PER_TOKEN
+        if len(compact) > budget_chars:
+            final, trimmed = self._dumps(self._apply_budget(snapshot, len(compact), budget_chars)), True
+
+        self.stats.record(self._legacy_size(snapshot), len(compact), len(final), trimmed)
+        return final
+
+    def fit_budget(self, snapshot: dict, reserved_chars: int = 0) -> dict:
+        """
+        Kompakt sözlüğü (örn. build_changes çıktısı) token bütçesine sığdırır.
+        'reserved_chars' prompt'ta sözlüğün yanına eklenecek diğer veriler için ayrılır.
+        Bütçeye zaten sığıyorsa sözlük aynen döner.
+        """
+        budget_chars = self.token_budget * CHARS_PER_TOKEN - reserved_chars
+        compact_chars = len(self._dumps(snapshot))
+        if compact_chars <= budget_chars:
+            return snapshot
+        return self._apply_budget(snapshot, compact_chars, budget_chars)
+
+    def _snapshot(self, member_rows: list, task_rows: list, now: datetime, python_overdue: bool) -> dict:
+        project_name = member_rows[0].name
+        people: List[str] = []
+        person_index: Dict[int, int] = {}
+        members = []
+        for row in member_rows:
+            if row.id is None:
+                continue
+            full_name = f"{row.first_name} {row.last_name}" if row.first_name else row.email
+            person_index[row.id] = len(people)
+            people.append(full_name)
+            members.append([person_index[row.id], row.role.value])
+
+        vocab: Dict[str, List[str]] = {"durum": [], "oncelik": [], "kategori": []}
+        vocab_index: Dict[str, Dict[str, int]] = {key: {} for key in vocab}
+
+        def encode(field: str, value) -> int:
+            value = value.value if hasattr(value, "value") else str(value)
+            index = vocab_index[field].get(value)
+            if index is None:
+                index = vocab_index[field][value] = len(vocab[field])
+                vocab[field].append(value)
+            return index
+
+        rows = []
+        total_points = 0
+        completed_points = 0
+        for t in task_rows:
+            points = t.story_points or 1
+            total_points += points
+            if t.status == TaskStatus.tamamlandı:
+                completed_points += points
+
+            days_overdue = t.gecikme or 0
+            if python_overdue and days_overdue:
+                days_overdue = (now - t.due_date).days
+
+            rows.append([
+                t.title,
+                encode("durum", t.status),
+                encode("oncelik", t.priority),
+                encode("kategori", t.category),
+                points,
+                person_index.get(t.assignee_id, UNASSIGNED),
+                days_overdue,
+                t.due_date.strftime("%Y-%m-%d") if t.due_date else None,
+            ])
+
+        snapshot = {
+            "proje_adi": project_name,
+            "analiz_tarihi": now.strftime("%Y-%m-%d"),
+            "toplam_is_yuku_puani": total_points,
+            "tamamlanan_is_yuku_puani": completed_points,
+            "format": ENCODING_NOTE,
+            "kisiler": people,
+            "uyeler": members,
+            "sozluk": vocab,
+            "gorev_kolonlari": TASK_COLUMNS,
+            "gorevler": rows,
+        }
+        return snapshot
+
+    # --- YARDIMCI METODLAR ---
+
+    @staticmethod
+    def _dumps(data: dict) -> str:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+    def _apply_budget(self, snapshot: dict, compact_chars: int, budget_chars: int) -> dict:
+        """
+        En önemli görevleri (gecikmiş, kritik/yüksek öncelikli, tamamlanmamış) tek tek bırakır,
+        bütçeye sığmayanları durum/kategori dağılımı olarak özetler.
+        """
+        rows = snapshot["gorevler"]
+        vocab = snapshot["sozluk"]
+        done_index = vocab["durum"].index(TaskStatus.tamamlandı.value) if TaskStatus.tamamlandı.value in vocab["durum"] else None
+        priority_weight = [_PRIORITY_WEIGHT.get(TaskPriority(value), 0) for value in vocab["oncelik"]]
+
+        def importance(row) -> tuple:
+            return (row[6] > 0, row[1] != done_index, priority_weight[row[2]], row[4])
+
+        fixed_chars = compact_chars - sum(len(self._dumps_row(row)) + 1 for row in rows)
+
+        order = sorted(range(len(rows)), key=lambda i: importance(rows[i]), reverse=True)
+        used = fixed_chars
+        keep = set()
+        for i in order:
+            size = len(self._dumps_row(rows[i])) + 1
+            if used + size > budget_chars:
+                break
+            keep.add(i)
+            used += size
+
+        dropped = [row for i, row in enumerate(rows) if i not in keep]
+        status_dist: Dict[str, int] = {}
+        category_dist: Dict[str, int] = {}
+        for row in dropped:
+            status_dist[vocab["durum"][row[1]]] = status_dist.get(vocab["durum"][row[1]], 0) + 1
+            category_dist[vocab["kategori"][row[3]]] = category_dist.get(vocab["kategori"][row[3]], 0) + 1
+
+        trimmed = dict(snapshot)
+        trimmed["gorevler"] = [row for i, row in enumerate(rows) if i in keep]
+        trimmed["ozetlenen_gorevler"] = {
+            "adet": len(dropped),
+            "toplam_puan": sum(row[4] for row in dropped),
+            "durum_dagilimi": status_dist,
+            "kategori_dagilimi": category_dist,
+        }
+        return trimmed
+
+    @staticmethod
+    def _dumps_row(row: list) -> str:
+        return json.dumps(row, ensure_ascii=False, separators=(",", ":"))
+
+    @staticmethod
+    def _legacy_size(snapshot: dict) -> int:
+        """Eski formatın (nesne listesi, indent=2) karakter sayısı; karşılaştırma metriği için."""
+        vocab, people = snapshot["sozluk"], snapshot["kisiler"]
+        legacy = {
+            "proje_adi": snapshot["proje_adi"],
+            "analiz_tarihi": snapshot["analiz_tarihi"],
+            "toplam_is_yuku_puani": snapshot["toplam_is_yuku_puani"],
+            "tamamlanan_is_yuku_puani": snapshot["tamamlanan_is_yuku_puani"],
+            "ekip_uyeleri": [f"{people[i]} ({role})" for i, role in snapshot["uyeler"]],
+            "gorev_detaylari": [{
+                "baslik": row[0],
+                "durum": vocab["durum"][row[1]],
+                "oncelik": vocab["oncelik"][row[2]],
+                "kategori": vocab["kategori"][row[3]],
+                "efor_puani": row[4],
+                "atanan": people[row[5]] if row[5] != UNASSIGNED else "Atanmamış",
+                "gecikme_durumu": f"{row[6]} gün gecikti" if row[6] > 0 else "Zamanında",
+                "bitis_tarihi": row[7] or "Yok",
+            } for row in snapshot["gorevler"]],
+        }
+        return len(json.dumps(legacy, ensure_ascii=False, indent=2))
+
+project_snapshot_builder = ProjectSnapshotBuilder(AI_PROMPT_TOKEN_BUDGET)
@@ -0,0 +1,149 @@
+import html
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from typing import List, Optional
+
+from app.schemas.search_schemas import SearchHit, SearchPage
+
+# Eşleşmeleri işaretlemek için kullanılan etiketler
+MARK_START = "<mark>"
+MARK_STOP = "</mark>"
+
+# Veritabanı vurgulamayı bu özel kullanım (Private Use Area) karakterleriyle yapar;
+# metin HTML-escape edildikten SONRA <mark> etiketlerine çevrilirler. Böylece not/görev
+# içeriğindeki HTML istemciye ham olarak gitmez, yalnızca bizim <mark> etiketlerimiz kalır.
+_SENTINEL_START = "\ue000"
+_SENTINEL_STOP = "\ue001"
+
+# Migration'daki üretilmiş kolonla AYNI olmalı (7d3f0a6e91c2)
+PG_TS_CONFIG = "simple"
+
+# (tür, tablo, başlık kolonu, metin kolonu)
+_TARGETS = {
+    "note": ("notes", "title", "content"),
+    "task": ("tasks", "title", "description"),
+}
+
+class SearchService:
+
+    @staticmethod
+    def search(db: Session, user_id: int, query: str, kinds: List[str], limit: int = 20, offset: int = 0) -> SearchPage:
+        """
+        Kullanıcının notları ve üyesi olduğu projelerin görevleri içinde tam metin arama yapar.
+        Her tür için (offset + limit + 1) sonuç sıralı çekilir, Python'da birleştirilip kesilir.
+        """
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            fetch = SearchService._search_postgres
+        elif dialect == "sqlite":
+            fetch = SearchService._search_sqlite
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail=f"'{dialect}' veritabanı için tam metin arama desteklenmiyor."
+            )
+
+        window = offset + limit + 1
+        hits: List[SearchHit] = []
+        for kind in kinds:
+            hits.extend(fetch(db, kind, user_id, query, window))
+
+        # Yüksek rank = daha alakalı; eşitlikte en yeni kayıt önce
+        hits.sort(key=lambda h: (-h.rank, -h.id))
+        page = hits[offset:offset + limit]
+        next_offset = offset + limit if len(hits) > offset + limit else None
+        return SearchPage(query=query, items=page, next_offset=next_offset)
+
+    # --- YARDIMCI METODLAR ---
+
+    @staticmethod
+    def _scope_clause(kind: str, alias: str) -> str:
+        """Notlar için sahiplik, görevler için proje üyeliği filtresi."""
+        if kind == "note":
+            return f"{alias}.user_id = :user_id"
+        return (
+            f"EXISTS (SELECT 1 FROM project_members pm "
+            f"WHERE pm.project_id = {alias}.project_id AND pm.user_id = :user_id)"
+        )
+
+    @staticmethod
+    def _project_column(kind: str, alias: str) -> str:
+        return f"{alias}.project_id" if kind == "task" else "NULL"
+
+    @staticmethod
+    def _search_postgres(db: Session, kind: str, user_id: int, query: str, window: int) -> List[SearchHit]:
+        table, title_col, body_col = _TARGETS[kind]
+        options = f"StartSel={_SENTINEL_START}, StopSel={_SENTINEL_STOP}"
+        # Önce GIN indeksiyle sıralayıp kesiyoruz; ts_headline (pahalı) sadece kalan satırlarda çalışır.
+        sql = text(f"""
+            SELECT r.id, r.project_id, r.rank,
+                   ts_headline('{PG_TS_CONFIG}', coalesce(r.{title_col}, ''), r.q, '{options}, HighlightAll=true') AS title,
+                   ts_headline('{PG_TS_CONFIG}', coalesce(r.{body_col}, ''), r.q, '{options}, MaxFragments=2, MaxWords=20, MinWords=5') AS snippet
+            FROM (
+                SELECT t.id, {SearchService._project_column(kind, 't')} AS project_id,
+                       t.{title_col}, t.{body_col}, q,
+                       ts_rank(t.search_vector, q) AS rank
+                FROM {table} t, websearch_to_tsquery('{PG_TS_CONFIG}', :query) q
+                WHERE t.search_vector @@ q AND {SearchService._scope_clause(kind, 't')}
+                ORDER BY rank DESC, t.id DESC
+                LIMIT :window
+            ) r
+            ORDER BY r.rank DESC, r.id DESC
+        """)
+        rows = db.execute(sql, {"query": query, "user_id": user_id, "window": window}).all()
+        return [SearchService._to_hit(kind, row, row.rank) for row in rows]
+
+    @staticmethod
+    def _search_sqlite(db: Session, kind: str, user_id: int, query: str, window: int) -> List[SearchHit]:
+        match = SearchService._fts5_match(query)
+        if not match:
+            return []
+
+        table, _, _ = _TARGETS[kind]
+        fts = f"{table}_fts"
+        # bm25: küçük değer = daha alakalı. Başlık eşleşmeleri 10 kat ağırlıklı.
+        sql = text(f"""
+            SELECT t.id, {SearchService._project_column(kind, 't')} AS project_id,
+                   bm25({fts}, 10.0, 1.0) AS score,
+                   highlight({fts}, 0, '{_SENTINEL_START}', '{_SENTINEL_STOP}') AS title,
+                   snippet({fts}, 1, '{_SENTINEL_START}', '{_SENTINEL_STOP}', '…', 16) AS snippet
+            FROM {fts}
+            JOIN {table} t ON t.id = {fts}.rowid
+            WHERE {fts} MATCH :match AND {SearchService._scope_clause(kind, 't')}
+            ORDER BY score, t.id DESC
+            LIMIT :window
+        """)
+        rows = db.execute(sql, {"match": match, "user_id": user_id, "window": window}).all()
+        return [SearchService._to_hit(kind, row, -row.score) for row in rows]
+
+    @staticmethod
+    def _fts5_match(query: str) -> Optional[str]:
+        """
+        Kullanıcı girdisini güvenli bir FTS5 sorgusuna çevirir.
+        Her kelime tırnaklanır (operatör enjeksiyonu olmaz) ve önek eşleşmesi yapılır.
+        """
+        tokens = re.findall(r"\w+", query)
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    @staticmethod
+    def _render_marks(value: Optional[str]) -> str:
+        """Metni HTML-escape eder, ardından vurgu işaretlerini <mark> etiketlerine çevirir."""
+        escaped = html.escape(value or "")
+        return escaped.replace(_SENTINEL_START, MARK_START).replace(_SENTINEL_STOP, MARK_STOP)
+
+    @staticmethod
+    def _to_hit(kind: str, row, rank: float) -> SearchHit:
+        return SearchHit(
+            kind=kind,
+            id=row.id,
+            project_id=row.project_id,
+            title=SearchService._render_marks(row.title),
+            snippet=SearchService._render_marks(row.snippet) or None,
+            rank=float(rank)
+        )
+
+search_service = SearchService()
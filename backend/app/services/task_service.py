@@ -8,7 +8,13 @@ from app.models.project_member_model import ProjectMember
 from app.schemas import task_schemas
 
 from app.services.notification_service import notification_service
+from app.services.project_service import project_service
+from app.services.activity_service import activity_service, TASK_CREATED, TASK_UPDATED, TASK_DELETED
 from app.models.project_model import Project
+from app.fast_json import ColumnProjection
+
+# Hızlı JSON yolu için şema -> kolon eşlemeleri (bkz. app/fast_json.py)
+TASK_DISPLAY_COLUMNS = ColumnProjection(task_schemas.TaskDisplay, Task)
 
 class TaskService:
     @staticmethod
@@ -33,6 +39,15 @@ class TaskService:
     def get_tasks_by_project(db: Session, project_id: int) -> List[Task]:
         return db.query(Task).filter(Task.project_id == project_id).all()
 
+    @staticmethod
+    def get_task_rows_by_project(db: Session, project_id: int, projection: ColumnProjection = TASK_DISPLAY_COLUMNS) -> List[dict]:
+        """
+        get_tasks_by_project ile aynı veri; ORM nesnesi yerine TaskDisplay sözlükleri (tek sorgu).
+        'projection' bir alt küme ise (fields=) sadece o kolonlar okunur.
+        """
+        rows = db.query(*projection.columns).filter(Task.project_id == project_id).all()
+        return projection.to_dicts(rows)
+
     @staticmethod
     def get_assigned_tasks(db: Session, user_id: int) -> List[Task]:
         """
@@ -45,14 +60,39 @@ class TaskService:
             .all()
 
     @staticmethod
-    def create_task(db: Session, task_data: task_schemas.TaskCreate, project_id: int) -> Task:
+    def get_assigned_task_rows(db: Session, user_id: int, projection: ColumnProjection = TASK_DISPLAY_COLUMNS,
+                               include_project: bool = True) -> List[dict]:
+        """
+        get_assigned_tasks ile aynı veri; TaskWithProject sözlükleri (proje bilgisi JOIN ile).
+        'include_project' False ise (fields= içinde 'project' yok) JOIN yapılmaz.
+        """
+        if not include_project:
+            rows = db.query(*projection.columns).filter(Task.assignee_id == user_id).all()
+            return projection.to_dicts(rows)
+        rows = db.query(*projection.columns, Project.id, Project.name)\
+            .outerjoin(Project, Project.id == Task.project_id)\
+            .filter(Task.assignee_id == user_id)\
+            .all()
+        width = len(projection.fields)
+        result = projection.to_dicts(rows)
+        for item, row in zip(result, rows):
+            project_id, project_name = row[width], row[width + 1]
+            item["project"] = {"id": project_id, "name": project_name} if project_id is not None else None
+        return result
+
+    @staticmethod
+    def create_task(db: Session, task_data: task_schemas.TaskCreate, project_id: int, actor_id: Optional[int] = None) -> Task:
         db_task = Task(**task_data.dict(), project_id=project_id)
         db.add(db_task)
+        # Aktivite kaydı görev id'sine ihtiyaç duyar; ikisi aynı commit'te yazılır
+        db.flush()
+        activity_service.record(db, project_id, actor_id, TASK_CREATED, task_id=db_task.id,
+                                details={"title": db_task.title, "assignee_id": db_task.assignee_id})
         db.commit()
         db.refresh(db_task)
 
         if db_task.assignee_id:
-            project_name = db.query(Project).filter(Project.id == project_id).first().name
+            project_name = project_service.get_project_name(db, project_id)
             notification_service.create_notification(
                 db,
                 db_task.assignee_id,
@@ -63,9 +103,10 @@ class TaskService:
         return db_task
 
     @staticmethod
-    def update_task(db: Session, task: Task, update_data: dict) -> Task:
-        # 1. ÖNEMLİ: Güncelleme yapmadan ÖNCE eski atanan kişiyi hafızaya al
+    def update_task(db: Session, task: Task, update_data: dict, actor_id: Optional[int] = None) -> Task:
+        # 1. ÖNEMLİ: Güncelleme yapmadan ÖNCE eski atanan kişiyi ve değişen alanları hafızaya al
         old_assignee = task.assignee_id
+        changes = activity_service.changes(task, update_data)
 
         # 2. Statü ve Tarih Mantığı
         if "status" in update_data:
@@ -80,6 +121,9 @@ class TaskService:
             setattr(task, key, value)
         
         db.add(task)
+        if changes:
+            activity_service.record(db, task.project_id, actor_id, TASK_UPDATED, task_id=task.id,
+                                    details={"title": task.title, "changes": changes})
         db.commit()
 
         # 4. Bildirim Mantığı
@@ -89,10 +133,8 @@ class TaskService:
             # Eğer yeni birine atandıysa VE bu kişi eskisiyle aynı değilse
             if new_assignee and new_assignee != old_assignee:
                 
-                # Proje ismini güvenli bir şekilde çekelim
-                from app.models.project_model import Project
-                project_record = db.query(Project).filter(Project.id == task.project_id).first()
-                project_name = project_record.name if project_record else "Proje"
+                # Proje ismini güvenli bir şekilde çekelim (önbellekten)
+                project_name = project_service.get_project_name(db, task.project_id) or "Proje"
 
                 # Servisi import et ve bildirimi gönder
                 from app.services.notification_service import notification_service
@@ -108,7 +150,9 @@ class TaskService:
         return task
 
     @staticmethod
-    def delete_task(db: Session, task: Task) -> None:
+    def delete_task(db: Session, task: Task, actor_id: Optional[int] = None) -> None:
+        activity_service.record(db, task.project_id, actor_id, TASK_DELETED, task_id=task.id,
+                                details={"title": task.title})
         db.delete(task)
         db.commit()
 
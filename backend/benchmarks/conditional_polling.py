@@ -0,0 +1,101 @@
+"""
+Koşullu GET (ETag / 304) kazancını ölçer: polling yapan bir istemci aynı kaynağı
+tekrar tekrar isterken aktarılan bayt ve sunucu CPU süresi.
+
+Kullanım (backend klasöründen):
+    python benchmarks/conditional_polling.py --tasks 200 --polls 300
+
+Varsayılan olarak geçici bir SQLite veritabanı oluşturulur ve migration'lar uygulanır;
+'--database-url' ile başka bir (boş, test amaçlı) veritabanı verilebilir.
+Her endpoint için iki senaryo: düz GET ve If-None-Match ile GET.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def prepare_environment(database_url: str) -> None:
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark-dummy-key")
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(BACKEND_DIR)
+
+    from alembic import command
+    from alembic.config import Config
+    command.upgrade(Config(os.path.join(BACKEND_DIR, "alembic.ini")), "head")
+
+
+def seed(client, task_count: int) -> tuple[dict, list]:
+    email = f"bench_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/register", json={"email": email, "password": "benchpass123", "first_name": "Bench", "last_name": "User"})
+    token = client.post("/api/auth/login", data={"username": email, "password": "benchpass123"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    project = client.post("/api/projects/", json={"name": "Polling Benchmark"}, headers=headers).json()
+    for i in range(task_count):
+        client.post(f"/api/projects/{project['id']}/tasks", json={
+            "title": f"Görev {i}", "description": "Açıklama " * 10, "story_points": 1 + i % 8
+        }, headers=headers)
+    for i in range(20):
+        client.post("/api/notes/", json={"title": f"Not {i}", "content": "İçerik " * 200}, headers=headers)
+
+    urls = [f"/api/projects/{project['id']}", f"/api/projects/{project['id']}/tasks", "/api/users/me", "/api/notes/"]
+    return headers, urls
+
+
+def poll(client, url: str, headers: dict, polls: int, conditional: bool) -> dict:
+    etag = client.get(url, headers=headers).headers.get("etag")
+    request_headers = {**headers, "If-None-Match": etag} if conditional else headers
+
+    transferred = 0
+    not_modified = 0
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    for _ in range(polls):
+        response = client.get(url, headers=request_headers)
+        transferred += len(response.content)
+        not_modified += response.status_code == 304
+    return {
+        "bytes": transferred,
+        "wall_ms": (time.perf_counter() - wall_start) * 1000 / polls,
+        "cpu_ms": (time.process_time() - cpu_start) * 1000 / polls,
+        "not_modified": not_modified,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200, help="Projedeki görev sayısı")
+    parser.add_argument("--polls", type=int, default=200, help="Endpoint başına istek sayısı")
+    parser.add_argument("--database-url", default=None, help="Varsayılan: geçici SQLite dosyası")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'polling.db')}"
+    prepare_environment(database_url)
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    headers, urls = seed(client, args.tasks)
+
+    print(f"{'endpoint':<28}{'senaryo':<14}{'KB/istek':>10}{'wall ms':>10}{'cpu ms':>10}{'304':>6}")
+    for url in urls:
+        plain = poll(client, url, headers, args.polls, conditional=False)
+        cond = poll(client, url, headers, args.polls, conditional=True)
+        for name, result in (("düz", plain), ("If-None-Match", cond)):
+            print(f"{url:<28}{name:<14}{result['bytes'] / args.polls / 1024:>10.2f}"
+                  f"{result['wall_ms']:>10.2f}{result['cpu_ms']:>10.2f}{result['not_modified']:>6}")
+        saved_cpu = 100 * (1 - cond["cpu_ms"] / plain["cpu_ms"]) if plain["cpu_ms"] else 0.0
+        print(f"{'':<28}{'kazanç':<14}{(plain['bytes'] - cond['bytes']) / 1024:>9.1f}K{'':>10}{saved_cpu:>9.0f}%")
+
+
+if __name__ == "__main__":
+    main()
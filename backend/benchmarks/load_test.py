@@ -0,0 +1,349 @@
+"""
+API yük testi: ayarlanabilir bir veri seti oluşturur, gerçekçi istek karışımlarını
+uygulamaya (süreç içinde TestClient ile ya da yerel HTTP üzerinden) uygular ve
+senaryo başına verim (istek/sn), p50/p95/p99 gecikme ve istek başına SQL sayısını raporlar.
+
+Senaryolar: login, project_list, board_load (proje + görev listesi), task_drag (durum
+değişikliği), notification_poll, analysis (stub LLM ile).
+
+Kullanım (backend klasöründen):
+    python benchmarks/load_test.py                                   # süreç içi, geçici SQLite
+    python benchmarks/load_test.py --users 20 --tasks 100 --concurrency 8 --mix-requests 2000
+    python benchmarks/load_test.py --save-baseline benchmarks/load_baseline.json
+    python benchmarks/load_test.py --baseline benchmarks/load_baseline.json --fail-on-regression
+
+    # Çalışan bir sunucuya karşı (sunucu AI_PROVIDER=stub, RATE_LIMIT_ENABLED=false ve tek worker ile başlatılmalı;
+    # SQL sayıları sunucunun /metrics çıktısından okunur):
+    python benchmarks/load_test.py --base-url http://localhost:8000
+
+Süreç içi modda geçici bir SQLite veritabanı oluşturulur ve migration'lar uygulanır;
+'--database-url' ile başka bir (boş, test amaçlı) veritabanı verilebilir.
+
+'--background-users/--background-projects' verilirse ölçümden önce app.seed ile toplu
+arka plan verisi yazılır (sorguların büyük tablolardaki davranışını görmek için).
+HTTP modunda bunun için sunucunun kullandığı '--database-url' de verilmelidir.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PASSWORD = "benchpass123"
+TASK_STATUSES = ["beklemede", "yapılıyor", "tamamlandı"]
+DEFAULT_MIX = "login=5,project_list=20,board_load=30,task_drag=15,notification_poll=25,analysis=5"
+
+_STATEMENTS_LINE = re.compile(r'^pm_db_statements_total\{[^}]*\} ([0-9.e+]+)$', re.MULTILINE)
+
+
+def prepare_environment(database_url: str) -> None:
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark-dummy-key")
+    # Ağ kullanmayan sahte LLM; hız sınırları yük testini kısmasın
+    os.environ["AI_PROVIDER"] = "stub"
+    os.environ.setdefault("AI_RATE_LIMIT_GLOBAL_PER_MINUTE", "1000000")
+    os.environ.setdefault("AI_RATE_LIMIT_PROJECT_PER_MINUTE", "1000000")
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(BACKEND_DIR)
+
+    from alembic import command
+    from alembic.config import Config
+    command.upgrade(Config(os.path.join(BACKEND_DIR, "alembic.ini")), "head")
+
+
+# --- VERİ SETİ ---
+
+@dataclass
+class BenchUser:
+    email: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    project_ids: List[int] = field(default_factory=list)
+    task_ids: List[int] = field(default_factory=list)
+
+
+def seed(client, users: int, projects: int, tasks: int, members: int, rng: random.Random) -> List[BenchUser]:
+    """Kullanıcılar, projeler (başka kullanıcılar üye olarak), atanmış görevler ve bildirimler oluşturur."""
+    run = uuid.uuid4().hex[:6]
+    dataset = []
+    for i in range(users):
+        email = f"load_{run}_{i}@example.com"
+        client.post("/api/auth/register", json={"email": email, "password": PASSWORD, "first_name": "Yük", "last_name": str(i)})
+        token = client.post("/api/auth/login", data={"username": email, "password": PASSWORD}).json()["access_token"]
+        user = BenchUser(email, {"Authorization": f"Bearer {token}"})
+        user.id = client.get("/api/users/me", headers=user.headers).json()["id"]
+        dataset.append(user)
+
+    for owner in dataset:
+        for p in range(projects):
+            project = client.post("/api/projects/", json={"name": f"Proje {owner.email} {p}", "description": "Yük testi"},
+                                  headers=owner.headers).json()
+            team = [owner] + rng.sample([u for u in dataset if u is not owner], min(members, len(dataset) - 1))
+            for member in team[1:]:
+                client.post(f"/api/projects/{project['id']}/members", json={"email": member.email}, headers=owner.headers)
+            for member in team:
+                member.project_ids.append(project["id"])
+            for t in range(tasks):
+                assignee = rng.choice(team)
+                task = client.post(f"/api/projects/{project['id']}/tasks", json={
+                    "title": f"Görev {t}", "description": "Açıklama " * 8,
+                    "story_points": 1 + t % 8, "assignee_id": assignee.id,
+                }, headers=owner.headers).json()
+                for member in team:
+                    member.task_ids.append(task["id"])
+    return dataset
+
+
+# --- SENARYOLAR ---
+
+def login(client, user: BenchUser, rng: random.Random) -> List:
+    return [client.post("/api/auth/login", data={"username": user.email, "password": PASSWORD})]
+
+
+def project_list(client, user: BenchUser, rng: random.Random) -> List:
+    return [client.get("/api/projects/", headers=user.headers)]
+
+
+def board_load(client, user: BenchUser, rng: random.Random) -> List:
+    project_id = rng.choice(user.project_ids)
+    return [
+        client.get(f"/api/projects/{project_id}", headers=user.headers),
+        client.get(f"/api/projects/{project_id}/tasks", headers=user.headers),
+    ]
+
+
+def task_drag(client, user: BenchUser, rng: random.Random) -> List:
+    task_id = rng.choice(user.task_ids)
+    return [client.put(f"/api/tasks/{task_id}/status", json={"status": rng.choice(TASK_STATUSES)}, headers=user.headers)]
+
+
+def notification_poll(client, user: BenchUser, rng: random.Random) -> List:
+    return [client.get("/api/notifications/", headers=user.headers)]
+
+
+def analysis(client, user: BenchUser, rng: random.Random) -> List:
+    return [client.post(f"/api/projects/{rng.choice(user.project_ids)}/analyze", headers=user.headers)]
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "login": login,
+    "project_list": project_list,
+    "board_load": board_load,
+    "task_drag": task_drag,
+    "notification_poll": notification_poll,
+    "analysis": analysis,
+}
+
+
+# --- ÖLÇÜM ---
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def db_statements(client) -> Optional[float]:
+    """Sunucunun /metrics çıktısından toplam SQL ifade sayısı (yoksa None)."""
+    response = client.get("/metrics")
+    if response.status_code != 200:
+        return None
+    return sum(float(value) for value in _STATEMENTS_LINE.findall(response.text))
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int, statements: Optional[float]) -> dict:
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "requests": count,
+        "errors": errors,
+        "rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "queries_per_request": round(statements / count, 2) if statements is not None and count else None,
+    }
+
+
+def run_operations(client, dataset: List[BenchUser], names: List[str], concurrency: int, seed: int) -> dict:
+    """Verilen senaryo adlarını (sırayla dağıtılarak) 'concurrency' thread ile çalıştırır."""
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed * 1000 + index)
+        local_latencies, local_errors = [], 0
+        for name in names[index::concurrency]:
+            user = rng.choice(dataset)
+            started = time.perf_counter()
+            responses = SCENARIOS[name](client, user, rng)
+            local_latencies.append(time.perf_counter() - started)
+            local_errors += any(r.status_code >= 400 for r in responses)
+        with lock:
+            latencies.extend(local_latencies)
+            errors += local_errors
+
+    before = db_statements(client)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+    after = db_statements(client)
+    statements = after - before if before is not None and after is not None else None
+    return summarize(latencies, elapsed, errors, statements)
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"Bilinmeyen senaryo: {name} (geçerli: {', '.join(SCENARIOS)})")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+# --- BASELINE KARŞILAŞTIRMA ---
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Baseline'a göre kötüleşen ölçümleri döndürür (ve tabloyu yazdırır)."""
+    regressions = []
+    print(f"\n{'karşılaştırma':<22}{'ölçüm':<22}{'baseline':>11}{'şimdi':>11}{'fark':>9}")
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        for metric, higher_is_worse in (("p50_ms", True), ("p95_ms", True), ("p99_ms", True),
+                                        ("rps", False), ("queries_per_request", True)):
+            old, new = previous.get(metric), current.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else 0.0
+            # SQL sayısı deterministiktir: her artış kötüleşmedir
+            limit = 0.0 if metric == "queries_per_request" else tolerance
+            worse = change > limit if higher_is_worse else change < -limit
+            marker = "  <-- kötüleşme" if worse else ""
+            print(f"{name:<22}{metric:<22}{old:>11.2f}{new:>11.2f}{change * 100:>8.1f}%{marker}")
+            if worse:
+                regressions.append(f"{name}.{metric}: {old} -> {new}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=None, help="Çalışan sunucu adresi (verilmezse süreç içi TestClient)")
+    parser.add_argument("--database-url", default=None, help="Süreç içi mod için; varsayılan: geçici SQLite dosyası")
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--projects", type=int, default=2, help="Kullanıcı başına proje")
+    parser.add_argument("--tasks", type=int, default=40, help="Proje başına görev")
+    parser.add_argument("--members", type=int, default=2, help="Proje başına ek üye")
+    parser.add_argument("--background-users", type=int, default=0, help="app.seed ile eklenecek arka plan kullanıcısı")
+    parser.add_argument("--background-projects", type=int, default=0, help="app.seed ile eklenecek arka plan projesi")
+    parser.add_argument("--background-tasks", type=float, default=50, help="Arka plan projesi başına ortalama görev")
+    parser.add_argument("--requests", type=int, default=100, help="Senaryo başına (tek başına) işlem sayısı")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Karışık yük ağırlıkları (ad=ağırlık,...)")
+    parser.add_argument("--mix-requests", type=int, default=600, help="Karışık yükteki toplam işlem")
+    parser.add_argument("--concurrency", type=int, default=4, help="Karışık yükte eşzamanlı istemci")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=None, help="Karşılaştırılacak baseline JSON dosyası")
+    parser.add_argument("--save-baseline", default=None, help="Sonuçları baseline olarak bu dosyaya yaz")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Gecikme/verim için kabul edilen oran (0.25 = %%25)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Kötüleşme varsa çıkış kodu 1")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mix = parse_mix(args.mix)
+    background = args.background_users or args.background_projects
+    if background and args.base_url and not args.database_url:
+        parser.error("HTTP modunda arka plan verisi için --database-url gerekli")
+
+    if args.base_url:
+        import httpx
+        client = httpx.Client(base_url=args.base_url, timeout=60)
+        context = client
+        if background:
+            sys.path.insert(0, BACKEND_DIR)
+            os.environ["DATABASE_URL"] = args.database_url
+    else:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load.db')}"
+        prepare_environment(database_url)
+        from fastapi.testclient import TestClient
+        from app.main import app
+        context = client = TestClient(app)
+
+    if background:
+        from sqlalchemy import create_engine
+        from app.seed import SeedConfig, seed_database
+        result = seed_database(create_engine(os.environ["DATABASE_URL"]), SeedConfig(
+            users=max(args.background_users, 1), projects=args.background_projects,
+            tasks_per_project=args.background_tasks, seed=args.seed,
+        ))
+        print(f"Arka plan verisi: {result.counts} ({result.seconds:.1f} sn)")
+
+    with context:
+        seed_started = time.perf_counter()
+        dataset = seed(client, args.users, args.projects, args.tasks, args.members, rng)
+        print(f"Veri seti: {args.users} kullanıcı, {args.users * args.projects} proje, "
+              f"{args.users * args.projects * args.tasks} görev ({time.perf_counter() - seed_started:.1f} sn)")
+
+        # Isınma: bağlantılar, önbellekler, ilk analizler
+        run_operations(client, dataset, list(SCENARIOS) * 3, 1, args.seed)
+
+        results = {}
+        for name in SCENARIOS:
+            results[name] = run_operations(client, dataset, [name] * args.requests, 1, args.seed)
+
+        names = [name for name, weight in mix.items() for _ in range(weight)]
+        mixed = [rng.choice(names) for _ in range(args.mix_requests)]
+        results["mix"] = run_operations(client, dataset, mixed, args.concurrency, args.seed)
+
+    print(f"\n{'senaryo':<20}{'istek':>7}{'hata':>6}{'istek/sn':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'SQL/istek':>11}")
+    for name, r in results.items():
+        queries = f"{r['queries_per_request']:.2f}" if r["queries_per_request"] is not None else "-"
+        print(f"{name:<20}{r['requests']:>7}{r['errors']:>6}{r['rps']:>10.1f}"
+              f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{queries:>11}")
+
+    config = {key: getattr(args, key) for key in ("users", "projects", "tasks", "members", "requests",
+                                                   "mix", "mix_requests", "concurrency", "seed")}
+    if background:
+        config["background"] = {"users": args.background_users, "projects": args.background_projects,
+                                "tasks": args.background_tasks}
+    config["mode"] = "http" if args.base_url else "inprocess"
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != config:
+            print("\nUyarı: baseline farklı ayarlarla alınmış; karşılaştırma yanıltıcı olabilir.")
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"\n{len(regressions)} kötüleşme" if regressions else "\nKötüleşme yok.")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"config": config, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                       "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"Baseline yazıldı: {args.save_baseline}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
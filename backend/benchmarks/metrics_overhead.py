@@ -0,0 +1,47 @@
+"""
+Metrik kaydının sıcak yoldaki maliyetini ölçer (gözlem başına nanosaniye).
+
+Kullanım (backend klasöründen):
+    python benchmarks/metrics_overhead.py --iterations 1000000
+
+Karşılaştırma için boş bir Python fonksiyon çağrısının süresi de yazdırılır;
+makineler arası fark bu satıra göre yorumlanmalıdır.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    sys.path.insert(0, BACKEND_DIR)
+    from app.metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+    histogram = registry.histogram("bench_seconds", "Benchmark", ("method", "route", "status"))
+    counter = registry.counter("bench_total", "Benchmark", ("operation",))
+    child = histogram.labels("GET", "/api/projects/{project_id}/tasks", 200)
+
+    def noop():
+        pass
+
+    cases = [
+        ("boş fonksiyon çağrısı", noop),
+        ("counter.labels(...).inc()", lambda: counter.labels("SELECT").inc()),
+        ("histogram child.observe()", lambda: child.observe(0.0042)),
+        ("histogram.labels(...).observe()", lambda: histogram.labels("GET", "/api/projects/{project_id}/tasks", 200).observe(0.0042)),
+    ]
+    n = args.iterations
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=n, repeat=3))
+        print(f"{name:<36}{best / n * 1e9:>8.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
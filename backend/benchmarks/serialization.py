@@ -0,0 +1,152 @@
+"""
+Serileştirme mikro-benchmark'ı: app/schemas altındaki her Pydantic şeması için
+sentetik bir liste yanıtını (varsayılan 500 öğe) üç yolla JSON'a çevirir:
+
+  pydantic : TypeAdapter(List[Şema]).validate_python + dump_json (response_model yolu)
+  json     : hazır sözlükler + standart json.dumps
+  orjson   : hazır sözlükler + orjson.dumps (app/fast_json.py yolu)
+
+Kullanım (backend klasöründen):
+    python benchmarks/serialization.py --items 500 --repeat 20
+    python benchmarks/serialization.py --schema TaskDisplay
+
+Veritabanı gerekmez; örnek değerler alan tiplerinden üretilir.
+"""
+import argparse
+import enum
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import sys
+import time
+from datetime import date, datetime
+from typing import List, Literal, Union, get_args, get_origin
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def prepare_environment() -> None:
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark-dummy-key")
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def discover_schemas() -> list:
+    """app.schemas altındaki modüllerde tanımlı tüm BaseModel sınıfları (isim sırasıyla)."""
+    from pydantic import BaseModel
+    import app.schemas
+
+    found = {}
+    for info in pkgutil.iter_modules(app.schemas.__path__):
+        module = importlib.import_module(f"app.schemas.{info.name}")
+        for name, obj in inspect.getmembers(module, inspect.isclass):
+            if issubclass(obj, BaseModel) and obj is not BaseModel and obj.__module__ == module.__name__:
+                found[name] = obj
+    return [found[name] for name in sorted(found)]
+
+
+def sample_value(annotation, field_name: str, index: int):
+    """Alan tipinden sentetik bir değer üretir (Optional/List/iç içe şemalar dahil)."""
+    from pydantic import BaseModel
+
+    origin = get_origin(annotation)
+    if origin is Literal:
+        return get_args(annotation)[0]
+    if origin is Union or str(origin) == "types.UnionType":
+        options = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return sample_value(options[0], field_name, index) if options else None
+    if origin in (list, List):
+        (item,) = get_args(annotation) or (str,)
+        return [sample_value(item, field_name, index + i) for i in range(3)]
+    if origin is dict:
+        _, value_type = get_args(annotation) or (str, int)
+        return {f"{field_name}_{i}": sample_value(value_type, field_name, index + i) for i in range(3)}
+    if inspect.isclass(annotation):
+        if issubclass(annotation, BaseModel):
+            return sample_dict(annotation, index)
+        if issubclass(annotation, enum.Enum):
+            members = list(annotation)
+            return members[index % len(members)].value
+        if issubclass(annotation, bool):
+            return index % 2 == 0
+        if issubclass(annotation, int):
+            return index + 1
+        if issubclass(annotation, float):
+            return index * 1.5
+        if issubclass(annotation, datetime):
+            return datetime(2030, 1, 1 + index % 28, 12, 30, index % 60)
+        if issubclass(annotation, date):
+            return date(2030, 1, 1 + index % 28)
+    if "email" in field_name or "Email" in str(annotation):
+        return f"user{index}@example.com"
+    return f"{field_name} örnek metin {index} " * 3
+
+
+def sample_dict(schema, index: int) -> dict:
+    return {name: sample_value(field.annotation, name, index) for name, field in schema.model_fields.items()}
+
+
+def timed(fn, repeat: int) -> tuple:
+    """(en iyi süre ms, çıktı bayt sayısı)"""
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = fn()
+        best = min(best, time.perf_counter() - start)
+        size = len(output)
+    return best * 1000, size
+
+
+def bench_schema(schema, items: int, repeat: int):
+    from pydantic import TypeAdapter
+    from app import fast_json
+
+    adapter = TypeAdapter(List[schema])
+    raw = [sample_dict(schema, i) for i in range(items)]
+    # Hızlı yoldaki gibi: önce bir kez doğrulanmış/normalize edilmiş sözlükler
+    rows = adapter.dump_python(adapter.validate_python(raw))
+
+    results = {"pydantic": timed(lambda: adapter.dump_json(adapter.validate_python(raw)), repeat)}
+    results["json"] = timed(
+        lambda: json.dumps(rows, ensure_ascii=False, separators=(",", ":"), default=fast_json._default).encode("utf-8"),
+        repeat,
+    )
+    if fast_json.orjson is not None:
+        results["orjson"] = timed(lambda: fast_json.orjson.dumps(rows), repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500, help="Liste yanıtındaki öğe sayısı")
+    parser.add_argument("--repeat", type=int, default=20, help="Tekrar sayısı (en iyi süre raporlanır)")
+    parser.add_argument("--schema", action="append", help="Sadece bu şema(lar) (örn. TaskDisplay)")
+    args = parser.parse_args()
+
+    prepare_environment()
+    schemas = discover_schemas()
+    if args.schema:
+        schemas = [s for s in schemas if s.__name__ in args.schema]
+
+    print(f"{'şema':<26}{'KB':>8}{'pydantic ms':>13}{'json ms':>10}{'orjson ms':>11}{'hızlanma':>10}")
+    for schema in schemas:
+        try:
+            results = bench_schema(schema, args.items, args.repeat)
+        except Exception as e:
+            print(f"{schema.__name__:<26}  atlandı: {e.__class__.__name__}: {str(e).splitlines()[0]}")
+            continue
+        pyd_ms, size = results["pydantic"]
+        json_ms = results["json"][0]
+        fast_ms = results.get("orjson", results["json"])[0]
+        orjson_col = f"{fast_ms:>11.2f}" if "orjson" in results else f"{'-':>11}"
+        speedup = pyd_ms / fast_ms if fast_ms else 0.0
+        print(f"{schema.__name__:<26}{size / 1024:>8.1f}{pyd_ms:>13.2f}{json_ms:>10.2f}{orjson_col}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
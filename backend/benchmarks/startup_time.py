@@ -0,0 +1,63 @@
+"""
+Uygulama açılış süresini ölçer: Gemini SDK'sı yüklenmeden ve yüklenerek.
+
+Kullanım (backend klasöründen):
+    python benchmarks/startup_time.py --runs 10
+
+Her ölçüm ayrı bir Python sürecinde 'import app.main' süresidir
+(.env'deki DATABASE_URL / SECRET_KEY vb. ayarlanmış olmalıdır).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    # Sağlayıcı tembel: SDK hiç yüklenmez
+    "lazy (SDK yok)": "import app.main",
+    # Eski davranışın maliyeti: SDK boot sırasında yüklenir ve client oluşturulur
+    "eager (SDK yüklü)": (
+        "import app.main\n"
+        "from app.services.ai_providers import create_provider\n"
+        "create_provider('gemini')"
+    ),
+}
+
+TIMER = """
+import time, sys
+_t0 = time.perf_counter()
+{body}
+sys.stdout.write(str(time.perf_counter() - _t0))
+"""
+
+
+def measure(body: str, runs: int, env: dict) -> list:
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", TIMER.format(body=body)],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(float(out.strip().splitlines()[-1]) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("GEMINI_API_KEY", "benchmark-dummy-key")
+
+    print(f"{'senaryo':<22}{'medyan (ms)':>14}{'min (ms)':>12}{'max (ms)':>12}")
+    for name, body in SCENARIOS.items():
+        samples = measure(body, args.runs, env)
+        print(f"{name:<22}{statistics.median(samples):>14.1f}{min(samples):>12.1f}{max(samples):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
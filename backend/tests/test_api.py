@@ -5,6 +5,9 @@ import os
 # 1. Backend klasörünü yola ekle
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Testler aynı istemciden çok sayıda kayıt/giriş yapar; hız sınırı TestClient'a uygulanmasın
+os.environ.setdefault("RATE_LIMIT_EXEMPT_CLIENTS", "testclient")
+
 # 2. Modülü doğru yerden import et
 from app.main import app 
 
@@ -46,4 +49,956 @@ def test_register_flow():
     if login_response.status_code != 200:
         print(f"Giriş Hatası: {login_response.status_code} - {login_response.text}")
 
-    assert login_response.status_code == 200
\ No newline at end of file
+    assert login_response.status_code == 200
+
+# --- YARDIMCI: Yeni kullanıcı oluşturup token header'ı döndürür ---
+def _auth_headers():
+    import uuid
+    email = f"testuser_{uuid.uuid4().hex[:10]}@example.com"
+    client.post("/api/auth/register", json={"email": email, "password": "test1234"})
+    token = client.post("/api/auth/login", data={"username": email, "password": "test1234"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+def _make_system_admin(monkeypatch, headers):
+    """Oturumdaki kullanıcıyı test süresince sistem yöneticisi yapar (/api/system/* için)."""
+    from app.services import auth_service
+    email = client.get("/api/users/me", headers=headers).json()["email"]
+    monkeypatch.setattr(auth_service, "ADMIN_EMAILS", [email.lower()])
+
+def test_note_summary_pagination():
+    """Hafif not listesi içerik döndürmeden keyset sayfalama yapıyor mu?"""
+    headers = _auth_headers()
+    for i in range(3):
+        client.post("/api/notes/", json={"title": f"Not {i}", "content": "x" * 1000}, headers=headers)
+
+    first = client.get("/api/notes/summary?limit=2", headers=headers).json()
+    assert [n["title"] for n in first["items"]] == ["Not 2", "Not 1"]
+    assert "content" not in first["items"][0]
+    assert len(first["items"][0]["excerpt"]) < 1000
+    assert first["next_cursor"] is not None
+
+    second = client.get(f"/api/notes/summary?limit=2&before_id={first['next_cursor']}", headers=headers).json()
+    assert [n["title"] for n in second["items"]] == ["Not 0"]
+    assert second["next_cursor"] is None
+
+    full = client.get(f"/api/notes/{second['items'][0]['id']}", headers=headers).json()
+    assert full["content"] == "x" * 1000
+
+def test_search_notes_and_tasks():
+    """Arama, kullanıcının notlarını ve proje görevlerini sıralı ve işaretli döndürüyor mu?"""
+    headers = _auth_headers()
+    client.post("/api/notes/", json={"title": "Sprint planı", "content": "Kanban panosu taşınacak"}, headers=headers)
+    project = client.post("/api/projects/", json={"name": "Arama Projesi"}, headers=headers).json()
+    client.post(f"/api/projects/{project['id']}/tasks", json={"title": "Kanban sürükle bırak"}, headers=headers)
+
+    result = client.get("/api/search/?q=kanban", headers=headers).json()
+    assert {hit["kind"] for hit in result["items"]} == {"note", "task"}
+    assert any("<mark>" in (hit["snippet"] or hit["title"]) for hit in result["items"])
+
+    # Başka bir kullanıcı bu kayıtları görmemeli
+    other = client.get("/api/search/?q=kanban", headers=_auth_headers()).json()
+    assert other["items"] == []
+
+def test_search_highlights_are_html_escaped():
+    """Not içeriğindeki HTML, vurgulanmış arama sonucunda escape edilmiş olarak dönüyor mu?"""
+    headers = _auth_headers()
+    payload = "<img src=x onerror=alert(1)> retrospektif"
+    client.post("/api/notes/", json={"title": payload, "content": payload}, headers=headers)
+
+    hit = client.get("/api/search/?q=retrospektif", headers=headers).json()["items"][0]
+    for value in (hit["title"], hit["snippet"]):
+        assert "<img" not in value
+        assert "&lt;img" in value
+        assert "<mark>retrospektif</mark>" in value
+
+def test_note_delta_patch_and_stale_version():
+    """Delta güncellemeleri birleştiriliyor ve eski sürüme gelen değişiklik reddediliyor mu?"""
+    headers = _auth_headers()
+    note = client.post("/api/notes/", json={"title": "Taslak", "content": "Merhaba"}, headers=headers).json()
+    url = f"/api/notes/{note['id']}"
+
+    first = client.patch(url, json={"base_version": note["version"], "ops": [{"position": 7, "insert": " dünya"}]}, headers=headers)
+    assert first.status_code == 200
+    second = client.patch(url, json={"base_version": first.json()["version"], "ops": [{"position": 0, "delete": 7, "insert": "Selam"}]}, headers=headers)
+    assert second.status_code == 200
+
+    stale = client.patch(url, json={"base_version": note["version"], "ops": [{"position": 0, "insert": "X"}]}, headers=headers)
+    assert stale.status_code == 409
+
+    # Okuma, bellekte bekleyen değişiklikleri önce yazar
+    full = client.get(url, headers=headers).json()
+    assert full["content"] == "Selam dünya"
+    assert full["version"] == second.json()["version"]
+
+def test_note_buffer_keeps_edits_when_write_fails(monkeypatch):
+    """Bekleyen not yazılamazsa okuma 500 vermiyor ve değişiklik sonraki flush'ta yazılıyor mu?"""
+    from app.events import change_registry
+    from app.services.note_service import note_write_buffer
+
+    monkeypatch.setattr(note_write_buffer, "interval", 60)
+    headers = _auth_headers()
+    note = client.post("/api/notes/", json={"title": "Tampon", "content": "a"}, headers=headers).json()
+    url = f"/api/notes/{note['id']}"
+    patched = client.patch(url, json={"base_version": note["version"], "ops": [{"position": 1, "insert": "b"}]}, headers=headers)
+    assert patched.json()["persisted"] is False
+
+    def broken_mark(*args, **kwargs):
+        raise RuntimeError("veritabanı erişilemez")
+    with monkeypatch.context() as m:
+        m.setattr(change_registry, "mark", broken_mark)
+        assert client.get("/api/notes/", headers=headers).status_code == 200
+
+    full = client.get(url, headers=headers).json()
+    assert full["content"] == "ab"
+    assert full["version"] == patched.json()["version"]
+
+def test_analysis_cache_reuses_result(monkeypatch):
+    """Proje verisi değişmediyse AI tekrar çağrılmıyor mu? force_refresh önbelleği atlıyor mu?"""
+    from app.services.ai_service import ai_service
+    from app.schemas.analysis_schemas import ProjectNarrative
+
+    calls = []
+    def fake_generate(prompt, project_id=None):
+        calls.append(prompt)
+        return ProjectNarrative(summary="ok", recommendations=[], sentiment="Pozitif"), True
+    monkeypatch.setattr(ai_service, "_generate_narrative", fake_generate)
+
+    headers = _auth_headers()
+    project = client.post("/api/projects/", json={"name": "Önbellek Projesi"}, headers=headers).json()
+    url = f"/api/projects/{project['id']}/analyze"
+
+    assert client.post(url, headers=headers).json()["cached"] is False
+    assert client.post(url, headers=headers).json()["cached"] is True
+    assert len(calls) == 1
+
+    assert client.post(f"{url}?force_refresh=true", headers=headers).json()["cached"] is False
+    client.post(f"/api/projects/{project['id']}/tasks", json={"title": "Yeni iş"}, headers=headers)
+    assert client.post(url, headers=headers).json()["cached"] is False
+    assert len(calls) == 3
+
+def test_analysis_stats_are_admin_only(monkeypatch):
+    """Süreç geneli analiz önbelleği ve prompt boyutu metrikleri sadece sistem yöneticilerine mi açık?"""
+    headers = _auth_headers()
+    urls = ("/api/analysis/cache-stats", "/api/analysis/prompt-stats")
+    assert [client.get(url, headers=headers).status_code for url in urls] == [403, 403]
+    _make_system_admin(monkeypatch, headers)
+    assert [client.get(url, headers=headers).status_code for url in urls] == [200, 200]
+
+def test_analysis_jobs_share_inflight_call(monkeypatch):
+    """Aynı proje için eşzamanlı işler tek bir AI çağrısını paylaşıyor mu?"""
+    import threading
+    from app.services.ai_service import ai_service
+    from app.schemas.analysis_schemas import ProjectNarrative
+
+    release = threading.Event()
+    calls = []
+    def slow_generate(prompt, project_id=None):
+        calls.append(prompt)
+        release.wait(5)
+        return ProjectNarrative(summary="ok", recommendations=[], sentiment="Pozitif"), True
+    monkeypatch.setattr(ai_service, "_generate_narrative", slow_generate)
+
+    headers = _auth_headers()
+    project = client.post("/api/projects/", json={"name": "İş Projesi"}, headers=headers).json()
+    url = f"/api/projects/{project['id']}/analysis-jobs"
+
+    first = client.post(url, headers=headers)
+    second = client.post(url, headers=headers)
+    assert first.status_code == 202
+    assert first.json()["job_id"] == second.json()["job_id"]
+
+    release.set()
+    done = client.get(f"/api/analysis-jobs/{first.json()['job_id']}?wait=5", headers=headers).json()
+    assert done["status"] == "done"
+    assert done["result"]["analysis"]["summary"] == "ok"
+    assert len(calls) == 1
+
+    # Başka bir kullanıcı bu işi göremez
+    assert client.get(f"/api/analysis-jobs/{first.json()['job_id']}", headers=_auth_headers()).status_code == 403
+
+def test_project_snapshot_is_compact_and_budgeted():
+    """Proje verisi kompakt formatta mı ve token bütçesi aşılınca düşük öncelikli görevler özetleniyor mu?"""
+    import json
+    from datetime import datetime, timedelta
+    from app.database import SessionLocal
+    from app.services.project_snapshot import ProjectSnapshotBuilder
+
+    headers = _auth_headers()
+    project = client.post("/api/projects/", json={"name": "Snapshot Projesi"}, headers=headers).json()
+    yesterday = (datetime.now() - timedelta(days=3)).isoformat()
+    client.post(f"/api/projects/{project['id']}/tasks", json={"title": "Acil iş", "priority": "Kritik", "due_date": yesterday}, headers=headers)
+    for i in range(30):
+        client.post(f"/api/projects/{project['id']}/tasks", json={"title": f"Rutin iş {i}", "priority": "Düşük"}, headers=headers)
+
+    db = SessionLocal()
+    try:
+        full = json.loads(ProjectSnapshotBuilder(token_budget=100000).build(db, project["id"]))
+        assert len(full["gorevler"]) == 31
+        assert full["gorevler"][0][full["gorev_kolonlari"].index("gecikme_gun")] == 3
+
+        builder = ProjectSnapshotBuilder(token_budget=250)
+        small = json.loads(builder.build(db, project["id"]))
+        assert small["gorevler"][0][0] == "Acil iş"
+        assert small["ozetlenen_gorevler"]["adet"] == 31 - len(small["gorevler"])
+        stats = builder.stats.snapshot()
+        assert stats["last_final_chars"] < stats["last_compact_chars"] < stats["last_legacy_chars"]
+    finally:
+        db.close()
+
+def test_local_scores_and_fallback():
+    """Yerel skorlar gecikmiş kritik işleri riske yansıtıyor mu, AI erişilemezken de kullanılıyor mu?"""
+    from datetime import datetime, timedelta
+    headers = _auth_headers()
+    project = client.post("/api/projects/", json={"name": "Skor Projesi"}, headers=headers).json()
+    url = f"/api/projects/{project['id']}"
+
+    empty = client.get(f"{url}/scores", headers=headers).json()
+    assert empty["risk_score"] == 0
+
+    late = (datetime.now() - timedelta(days=5)).isoformat()
+    client.post(f"{url}/tasks", json={"title": "Geciken", "priority": "Kritik", "category": "Backend", "story_points": 8, "due_date": late}, headers=headers)
+    client.post(f"{url}/tasks", json={"title": "Normal", "category": "Frontend"}, headers=headers)
+
+    scores = client.get(f"{url}/scores", headers=headers).json()
+    assert scores["risk_score"] > 50
+    assert scores["overdue_tasks"] == 1
+    assert scores["bottlenecks"][0]["category"] == "Backend"
+
+    # Yorum AI sağlayıcısından (veya yedekten) gelse de skorlar her zaman yereldir
+    analysis = client.post(f"{url}/analyze", headers=headers).json()
+    assert analysis["analysis"]["risk_score"] == scores["risk_score"]
+
+def test_portfolio_analysis_streams_ranked_results(monkeypatch):
+    """Portföy analizi tüm projeleri sıralıyor ve değişmeyen projeleri tekrar analiz etmiyor mu?"""
+    import json
+    from datetime import datetime, timedelta
+    from app.services.ai_service import ai_service
+    from app.schemas.analysis_schemas import ProjectNarrative
+
+    calls = []
+    def fake_generate(prompt, project_id=None):
+        calls.append(prompt)
+        return ProjectNarrative(summary="ok", recommendations=[], sentiment="Nötr"), True
+    monkeypatch.setattr(ai_service, "_generate_narrative", fake_generate)
+
+    headers = _auth_headers()
+    calm = client.post("/api/projects/", json={"name": "Sakin"}, headers=headers).json()
+    risky = client.post("/api/projects/", json={"name": "Riskli"}, headers=headers).json()
+    late = (datetime.now() - timedelta(days=2)).isoformat()
+    client.post(f"/api/projects/{risky['id']}/tasks", json={"title": "Geciken", "priority": "Kritik", "due_date": late}, headers=headers)
+
+    lines = [json.loads(line) for line in client.post("/api/analysis/portfolio", headers=headers).text.splitlines()]
+    assert lines[0]["type"] == "overview"
+    assert [p["name"] for p in lines[0]["projects"]] == ["Riskli", "Sakin"]
+    assert lines[-1]["type"] == "done" and lines[-1]["analyzed"] == 2
+    assert len(calls) == 2
+
+    again = [json.loads(line) for line in client.post("/api/analysis/portfolio", headers=headers).text.splitlines()]
+    assert again[-1]["unchanged"] == 2
+    assert len(calls) == 2
+
+def test_analyze_endpoint_times_out_with_504(monkeypatch):
+    """Analiz işi gateway süresini aşarsa senkron istek süresiz beklemek yerine 504 dönüyor mu?"""
+    import threading
+    from app.routers import analysis as analysis_router
+    from app.services import analysis_jobs as analysis_jobs_module
+    from app.services.ai_gateway import ai_gateway
+    from app.services.ai_service import ai_service
+    from app.schemas.analysis_schemas import ProjectNarrative
+
+    release = threading.Event()
+    def slow_generate(prompt, project_id=None):
+        release.wait(5)
+        return ProjectNarrative(summary="geç", recommendations=[], sentiment="Nötr"), True
+    monkeypatch.setattr(ai_service, "_generate_narrative", slow_generate)
+    monkeypatch.setattr(ai_gateway, "max_call_seconds", lambda: 0.1)
+    monkeypatch.setattr(analysis_router, "AI_JOB_WAIT_MARGIN_SECONDS", 0.1)
+
+    headers = _auth_headers()
+    project = client.post("/api/projects/", json={"name": "Zaman Aşımı"}, headers=headers).json()
+    try:
+        response = client.post(f"/api/projects/{project['id']}/analyze", headers=headers)
+    finally:
+        release.set()
+    assert response.status_code == 504
+    assert "/api/analysis-jobs/" in response.json()["detail"]
+
+    # Birden fazla worker'da iş başka bir süreçte olabilir; sorgulanamayacak adres verilmez
+    monkeypatch.setattr(analysis_router, "WEB_CONCURRENCY", 2)
+    assert "/api/analysis-jobs/" not in analysis_router._timeout_detail(analysis_jobs_module.AnalysisJob(1, "x"))
+
+def test_portfolio_reports_timed_out_analyses(monkeypatch):
+    """Bekleme süresinde bitmeyen analizler 'analyzed' yerine 'timed_out' olarak raporlanıyor mu?"""
+    import json
+    import threading
+    from app.services import portfolio_service
+    from app.services.ai_service import ai_service
+    from app.schemas.analysis_schemas import ProjectNarrative
+
+    release = threading.Event()
+    def slow_generate(prompt, project_id=None):
+        release.wait(5)
+        return ProjectNarrative(summary="geç", recommendations=[], sentiment="Nötr"), True
+    monkeypatch.setattr(ai_service, "_generate_narrative", slow_generate)
+    monkeypatch.setattr(portfolio_service, "RESULT_WAIT_SECONDS", 0.2)
+
+    headers = _auth_headers()
+    client.post("/api/projects/", json={"name": "Yavaş"}, headers=headers)
+    try:
+        lines = [json.loads(line) for line in client.post("/api/analysis/portfolio", headers=headers).text.splitlines()]
+    finally:
+        release.set()
+    done = lines[-1]
+    assert (done["analyzed"], done["failed"], done["timed_out"]) == (0, 0, 1)
+    assert [p["status"] for p in done["ranking"]] == ["timed_out"]
+
+def test_ai_provider_is_lazy_and_stub_is_deterministic():
+    """Uygulama açılışı Gemini SDK'sını yüklemiyor mu? Stub sağlayıcı aynı prompt'a aynı yanıtı veriyor mu?"""
+    import subprocess
+    from app.schemas.analysis_schemas import ProjectNarrative
+    from app.services.ai_providers import StubProvider
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {k: v for k, v in os.environ.items() if k != "GEMINI_API_KEY"}
+    env["AI_PROVIDER"] = "gemini"
+    out = subprocess.run(
+        [sys.executable, "-c", "import sys, app.main; print('google.genai' in sys.modules)"],
+        cwd=backend_dir, env=env, capture_output=True, text=True
+    )
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "False"
+
+    stub = StubProvider()
+    first = stub.generate("aynı prompt", ProjectNarrative)
+    assert first == stub.generate("aynı prompt", ProjectNarrative)
+    assert len(first.recommendations) == 3
+
+def test_analysis_stream_sends_partial_summary():
+    """Akışlı analiz önce skorları, sonra özet parçalarını, en sonda tam sonucu gönderiyor mu?"""
+    import json
+    from app.services.ai_service import ai_service
+    from app.services.ai_providers import StubProvider
+    from app.services.json_stream import JsonStringFieldReader
+
+    reader = JsonStringFieldReader("summary")
+    parts = [reader.feed(piece) for piece in ['{"summ', 'ary": "a\\', '"b \\u00e7', '\\ud83d\\ude00"', ',"x":1}']]
+    assert "".join(parts) == 'a"b ç😀'
+
+    ai_service.set_provider(StubProvider())
+    try:
+        headers = _auth_headers()
+        project = client.post("/api/projects/", json={"name": "Akış Projesi"}, headers=headers).json()
+        body = client.post(f"/api/projects/{project['id']}/analyze/stream", headers=headers).text
+    finally:
+        ai_service.set_provider(None)
+
+    events = [(block.split("\n")[0][7:], json.loads(block.split("\n")[1][6:])) for block in body.strip().split("\n\n")]
+    names = [name for name, _ in events]
+    assert names[0] == "scores" and names[-1] == "result"
+    assert names.count("summary") > 1
+    streamed = "".join(data["text"] for name, data in events if name == "summary")
+    assert streamed == events[-1][1]["analysis"]["summary"]
+
+def test_reanalysis_sends_only_changed_tasks_and_keeps_history(monkeypatch):
+    """Yeniden analiz sadece değişen görevleri ve önceki özeti gönderiyor mu? Geçmiş ve trend saklanıyor mu?"""
+    from app.services.ai_service import ai_service
+    from app.schemas.analysis_schemas import ProjectNarrative
+
+    from app.database import SessionLocal
+    from app.models.task_model import Task
+
+    prompts = []
+    def fake_generate(prompt, project_id=None):
+        prompts.append(prompt)
+        if len(prompts) == 1:
+            # AI çağrısı sürerken yapılan değişiklik bir sonraki artımlı analizde kaybolmamalı
+            db = SessionLocal()
+            try:
+                db.query(Task).filter(Task.id == tasks[3]["id"]).update({"title": "Çağrı Sırasında"})
+                db.commit()
+            finally:
+                db.close()
+        return ProjectNarrative(summary=f"özet {len(prompts)}", recommendations=["a"], sentiment="Nötr"), True
+    monkeypatch.setattr(ai_service, "_generate_narrative", fake_generate)
+
+    headers = _auth_headers()
+    project = client.post("/api/projects/", json={"name": "Geçmiş Projesi"}, headers=headers).json()
+    url = f"/api/projects/{project['id']}"
+    tasks = [client.post(f"{url}/tasks", json={"title": f"Görev {i}"}, headers=headers).json() for i in range(4)]
+
+    first = client.post(f"{url}/analyze", headers=headers).json()
+    assert first["incremental"] is False
+
+    client.put(f"/api/tasks/{tasks[0]['id']}", json={"title": "Değişen Görev"}, headers=headers)
+    second = client.post(f"{url}/analyze", headers=headers).json()
+    assert second["incremental"] is True
+    assert "Değişen Görev" in prompts[-1] and "özet 1" in prompts[-1]
+    assert "Çağrı Sırasında" in prompts[-1]
+    assert "Görev 2" not in prompts[-1]
+
+    history = client.get(f"{url}/analysis/history", headers=headers).json()
+    assert [item["summary"] for item in history] == ["özet 2", "özet 1"]
+
+    trend = client.get(f"{url}/analysis/trends", headers=headers).json()
+    assert len(trend["points"]) == 2
+    assert trend["points"][-1]["risk_score"] == second["analysis"]["risk_score"]
+
+    # Artımlı veri de token bütçesine sığdırılır
+    from app.services.project_snapshot import project_snapshot_builder
+    monkeypatch.setattr(project_snapshot_builder, "token_budget", 1)
+    client.put(f"/api/tasks/{tasks[1]['id']}", json={"title": "Bütçe Dışı"}, headers=headers)
+    third = client.post(f"{url}/analyze", headers=headers).json()
+    assert third["incremental"] is True
+    assert "ozetlenen_gorevler" in prompts[-1] and "Bütçe Dışı" not in prompts[-1]
+
+def test_ai_gateway_rate_limit_breaker_and_timeout(monkeypatch):
+    """Gateway proje başına hız sınırı, zaman aşımı ve art arda hatada devre kesmeyi uyguluyor mu?"""
+    import time
+    import pytest
+    from app.schemas.analysis_schemas import ProjectNarrative
+    from app.services.ai_gateway import AIGateway, CircuitOpenError, RateLimitedError
+    from app.services.ai_providers import StubProvider
+
+    def make_gateway(**overrides):
+        options = dict(max_concurrent=2, timeout_seconds=1, global_per_minute=100, project_per_minute=1,
+                       max_wait_seconds=0, failure_threshold=2, reset_seconds=60,
+                       max_attempts=2, retry_ratio=0.2, backoff_seconds=0)
+        options.update(overrides)
+        return AIGateway(**options)
+
+    gateway = make_gateway()
+    assert make_gateway(max_wait_seconds=5, backoff_seconds=0.5).max_call_seconds() == 5 + 2 * 1 + 0.5
+    gateway.generate(StubProvider(), "p", ProjectNarrative, project_id=1)
+    gateway.generate(StubProvider(), "p", ProjectNarrative, project_id=2)
+    with pytest.raises(RateLimitedError):
+        gateway.generate(StubProvider(), "p", ProjectNarrative, project_id=1)
+
+    gateway = make_gateway(timeout_seconds=0.05, project_per_minute=100)
+    slow = StubProvider(latency_ms=2000)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        gateway.generate(slow, "p", ProjectNarrative, project_id=1)
+    assert time.monotonic() - started < 1
+    # İlk çağrı + bir tekrar deneme iki hata sayılır ve devre açılır; sağlayıcı artık çağrılmaz
+    with pytest.raises(CircuitOpenError):
+        gateway.generate(slow, "p", ProjectNarrative, project_id=1)
+    stats = gateway.stats()
+    assert stats["breaker"]["state"] == "open"
+    assert stats["timeouts"] == 2 and stats["retries"] == 1 and stats["short_circuited"] == 1
+
+    # Akışta slot, istemci parçaları okumayı bitirmeden sağlayıcı bitince bırakılır
+    gateway = make_gateway(max_concurrent=1, project_per_minute=100)
+    chunks = gateway.stream(StubProvider(), "p", ProjectNarrative, project_id=1)
+    first_chunk = next(chunks)
+    assert gateway.slots.acquire(timeout=1)
+    gateway.slots.release()
+    assert first_chunk + "".join(chunks) == StubProvider().generate("p", ProjectNarrative).model_dump_json()
+    assert gateway.stats()["successes"] == 1
+
+    headers = _auth_headers()
+    assert client.get("/api/analysis/gateway-stats", headers=headers).status_code == 403
+    _make_system_admin(monkeypatch, headers)
+    assert client.get("/api/analysis/gateway-stats", headers=headers).json()["breaker"]["state"] in ("closed", "open", "half_open")
+
+def test_conditional_get_returns_304_until_resource_changes():
+    """Okuma endpoint'leri ETag veriyor, değişmeyen kaynak için 304, değişince yeni ETag dönüyor mu?"""
+    headers = _auth_headers()
+    project = client.post("/api/projects/", json={"name": "ETag Projesi"}, headers=headers).json()
+    tasks_url = f"/api/projects/{project['id']}/tasks"
+
+    for url in (f"/api/projects/{project['id']}", tasks_url, "/api/users/me", "/api/notes/"):
+        first = client.get(url, headers=headers)
+        etag = first.headers["etag"]
+        again = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert again.status_code == 304, url
+        assert again.content == b""
+
+    etag = client.get(tasks_url, headers=headers).headers["etag"]
+    client.post(tasks_url, json={"title": "Yeni"}, headers=headers)
+    changed = client.get(tasks_url, headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert [t["title"] for t in changed.json()] == ["Yeni"]
+
+    # Üye olmayan kullanıcı geçerli bir ETag ile bile 403 alır
+    stranger = _auth_headers()
+    assert client.get(tasks_url, headers={**stranger, "If-None-Match": changed.headers["etag"]}).status_code == 403
+
+    # Başka kullanıcının ETag'i (aynı sürümde olsa bile) 304 üretmez
+    other = _auth_headers()
+    for url in ("/api/users/me", "/api/notes/"):
+        first = client.get(url, headers=headers)
+        assert "Authorization" in first.headers["vary"]
+        response = client.get(url, headers={**other, "If-None-Match": first.headers["etag"]})
+        assert response.status_code == 200, url
+        assert response.headers["etag"] != first.headers["etag"]
+
+    note = client.post("/api/notes/", json={"title": "Not"}, headers=headers).json()
+    etag = client.get("/api/notes/", headers=headers).headers["etag"]
+    client.patch(f"/api/notes/{note['id']}", json={"base_version": 1, "ops": [{"position": 0, "insert": "x"}]}, headers=headers)
+    assert client.get("/api/notes/", headers={**headers, "If-None-Match": etag}).status_code == 200
+
+def test_service_cache_reuses_project_name_and_invalidates_on_commit(monkeypatch):
+    """Proje adı önbellekten okunuyor ve proje güncellenince (commit sonrası) geçersiz kılınıyor mu?"""
+    from app.services.cache import MemoryBackend, _MISSING
+
+    lru = MemoryBackend(max_entries=2)
+    for key in ("a", "b", "c"):
+        lru.set(key, key, ttl_seconds=60)
+    assert lru.get("a") is _MISSING and lru.get("c") == "c"
+
+    headers = _auth_headers()
+    project = client.post("/api/projects/", json={"name": "Önbellek"}, headers=headers).json()
+    me = client.get("/api/users/me", headers=headers).json()
+    url = f"/api/projects/{project['id']}/tasks"
+
+    # Sistem metrikleri sadece yöneticilere açık
+    assert client.get("/api/system/cache-stats", headers=headers).status_code == 403
+    _make_system_admin(monkeypatch, headers)
+
+    def namespace_stats():
+        return client.get("/api/system/cache-stats", headers=headers).json()["namespaces"]["project_names"]
+
+    client.post(url, json={"title": "Bir", "assignee_id": me["id"]}, headers=headers)
+    before = namespace_stats()
+    client.post(url, json={"title": "İki", "assignee_id": me["id"]}, headers=headers)
+    assert namespace_stats()["hits"] == before["hits"] + 1
+
+    client.put(f"/api/projects/{project['id']}", json={"name": "Yeni Ad"}, headers=headers)
+    client.post(url, json={"title": "Üç", "assignee_id": me["id"]}, headers=headers)
+    messages = [n["message"] for n in client.get("/api/notifications/", headers=headers).json()]
+    assert any("'Yeni Ad' projesinde 'Üç'" in m for m in messages)
+
+def test_invalidation_bus_propagates_changes_between_workers():
+    """Bir worker'daki commit diğer worker'ın ETag sürümünü ve önbelleğini güncelliyor mu (döngü olmadan)?"""
+    from app.events import ChangeRegistry
+    from app.services.invalidation_bus import InvalidationBus, LocalHub, LocalTransport
+
+    hub = LocalHub()
+    registries = [ChangeRegistry(), ChangeRegistry()]
+    buses = [InvalidationBus(registry, LocalTransport(hub)) for registry in registries]
+    dropped = []
+    registries[1].subscribe(dropped.append)
+    for bus in buses:
+        bus.start()
+    try:
+        registries[0].bump([("project", 7), ("project_tasks", 7)])
+        # Alıcı aynı sürümü alır: bir worker'ın ETag'i diğerinde de eşleşir
+        assert registries[1].version(("project", 7)) == registries[0].version(("project", 7))
+        assert dropped == [{("project", 7), ("project_tasks", 7)}]
+        # Uzaktan uygulanan değişiklik tekrar yayınlanmaz
+        assert buses[0].stats()["published"] == 1 and buses[1].stats()["published"] == 0
+        assert buses[1].stats()["received"] == 1
+
+        # Eski (sırasız gelen) sürüm yenisini ezmez
+        current = registries[1].version(("project", 7))
+        registries[1].apply([(("project", 7), current[0] - 1, 0.0)])
+        assert registries[1].version(("project", 7)) == current
+
+        buses[1]._on_message(None)
+        assert registries[1].version(("project", 7))[0] != current[0]
+    finally:
+        for bus in buses:
+            bus.stop()
+
+    # Süreç içi transport diğer worker'lara ulaşmaz
+    import pytest
+    from app.services.invalidation_bus import create_transport
+    with pytest.raises(ValueError):
+        create_transport("local", "sqlite:///x.db", workers=2)
+    assert create_transport("auto", "sqlite:///x.db", workers=2).name == "local"
+
+def test_fast_json_matches_pydantic_output(monkeypatch):
+    """Hızlı JSON yolu (kolon satırları + orjson) response_model çıktısıyla birebir aynı mı?"""
+    from app import fast_json
+
+    headers = _auth_headers()
+    other = _auth_headers()
+    other_me = client.get("/api/users/me", headers=other).json()
+    me = client.get("/api/users/me", headers=headers).json()
+
+    project = client.post("/api/projects/", json={"name": "Hızlı JSON", "description": "Açıklama"}, headers=headers).json()
+    client.post("/api/projects/", json={"name": "Boş Proje"}, headers=headers)
+    client.post(f"/api/projects/{project['id']}/members", json={"email": other_me["email"]}, headers=headers)
+    url = f"/api/projects/{project['id']}/tasks"
+    client.post(url, json={"title": "Tarihli", "due_date": "2030-01-02T03:04:05.123456", "assignee_id": me["id"]}, headers=headers)
+    done = client.post(url, json={"title": "Biten", "priority": "Yüksek", "assignee_id": me["id"]}, headers=headers).json()
+    client.put(f"/api/tasks/{done['id']}/status", json={"status": "tamamlandı"}, headers=headers)
+    client.post(url, json={"title": "Atanmamış"}, headers=headers)
+
+    urls = ["/api/projects/", url, "/api/tasks/my-tasks"]
+    fast = [client.get(u, headers=headers) for u in urls]
+    monkeypatch.setattr(fast_json, "enabled", False)
+    slow = [client.get(u, headers=headers) for u in urls]
+
+    for f, s in zip(fast, slow):
+        assert f.status_code == s.status_code == 200
+        assert f.content == s.content
+    assert fast[1].headers["etag"] == slow[1].headers["etag"]
+
+def test_compression_middleware(monkeypatch):
+    """Büyük JSON sıkıştırılıyor, ETag'li yanıt önbellekten geliyor, küçük yanıtlar ve akışlar dokunulmadan mı geçiyor?"""
+    headers = _auth_headers()
+    _make_system_admin(monkeypatch, headers)
+    project = client.post("/api/projects/", json={"name": "Sıkıştırma"}, headers=headers).json()
+    url = f"/api/projects/{project['id']}/tasks"
+    for i in range(30):
+        client.post(url, json={"title": f"Görev {i}", "description": "Uzun açıklama " * 10}, headers=headers)
+
+    gz = {**headers, "Accept-Encoding": "gzip"}
+    cache_before = client.get("/api/system/compression", headers=headers).json()["cache"]
+    first = client.get(url, headers=gz)
+    second = client.get(url, headers=gz)
+    assert first.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert int(first.headers["content-length"]) < len(first.content)
+    assert len(first.json()) == 30 and first.content == second.content
+    cache_after = client.get("/api/system/compression", headers=headers).json()["cache"]
+    assert cache_after["hits"] >= cache_before["hits"] + 1
+
+    # İstemci sıkıştırma istemiyorsa ham gövde
+    plain = client.get(url, headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.content == first.content
+
+    # Eşik altındaki yanıtlar sıkıştırılmaz
+    small = client.get("/api/users/me", headers=gz)
+    assert "content-encoding" not in small.headers
+
+    # 304 yanıtları gövdesiz kalır
+    not_modified = client.get(url, headers={**gz, "If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304 and "content-encoding" not in not_modified.headers
+
+    # Parça parça gelen akışlar (izinli içerik tipinde bile) tamponlanmadan ham iletilir
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+    from fastapi.testclient import TestClient
+    from app.middleware.compression import CompressionMiddleware, ResponseCompressor
+
+    compressor = ResponseCompressor(enabled=True, minimum_size=10)
+    mini = FastAPI()
+    mini.add_middleware(CompressionMiddleware, compressor=compressor)
+
+    @mini.get("/stream")
+    def stream():
+        return StreamingResponse((b'{"n": %d}\n' % i * 50 for i in range(3)), media_type="application/json")
+
+    streamed = TestClient(mini).get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in streamed.headers and streamed.content.count(b"\n") == 150
+    assert compressor.stats()["streamed"] == 1
+
+def test_metrics_endpoint(monkeypatch):
+    """/metrics HTTP, DB, bcrypt, bildirim ve LLM metriklerini Prometheus formatında veriyor mu?"""
+    from app.services.ai_service import ai_service
+    from app.services.ai_providers import StubProvider
+
+    headers = _auth_headers()
+    me = client.get("/api/users/me", headers=headers).json()
+    project = client.post("/api/projects/", json={"name": "Metrik"}, headers=headers).json()
+    client.post(f"/api/projects/{project['id']}/tasks", json={"title": "Atanan", "assignee_id": me["id"]}, headers=headers)
+    ai_service.set_provider(StubProvider())
+    try:
+        client.post(f"/api/projects/{project['id']}/analyze", headers=headers)
+    finally:
+        ai_service.set_provider(None)
+
+    # Token tanımlı değilken metrikler herkese açık değildir
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers=headers).status_code == 403
+    _make_system_admin(monkeypatch, headers)
+
+    response = client.get("/metrics", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'pm_http_request_duration_seconds_count{method="POST",route="/api/projects/{project_id}/tasks",status="201"}' in body
+    assert 'pm_http_requests_in_flight{method="GET"}' in body
+    assert 'pm_db_statements_total{operation="SELECT"}' in body
+    assert 'pm_auth_password_hash_duration_seconds_count{operation="hash"}' in body
+    assert 'pm_auth_password_hash_duration_seconds_count{operation="verify"}' in body
+    assert "pm_notifications_created_total " in body
+    assert 'pm_llm_calls_total{provider="stub",outcome="success"}' in body
+    assert 'pm_db_pool_connections{state="checkedout"}' in body
+    assert "pm_llm_circuit_state 0" in body
+
+def test_metric_shards_of_finished_threads_are_folded():
+    """Kısa ömürlü thread'lerin shard'ları thread bitince ortak tabana ekleniyor mu (sınırsız büyüme yok)?"""
+    import gc
+    import threading
+    from app.metrics import MetricsRegistry
+
+    registry = MetricsRegistry(prefix="shard_test_")
+    counter = registry.counter("events_total", "Test sayacı.")
+    histogram = registry.histogram("latency_seconds", "Test histogramı.", buckets=(0.1, 1.0))
+
+    def work():
+        counter.inc()
+        histogram.observe(0.5)
+    for _ in range(200):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    counter_child, histogram_child = counter.labels(), histogram.labels()
+    assert len(counter_child._shards) <= 1 and len(histogram_child._shards) <= 1
+    assert counter_child.get() == 200
+    counts, total = histogram_child.snapshot()
+    assert counts == [0, 200, 0] and total == 100.0
+
+def test_request_profiling_writes_folded_stacks(monkeypatch, tmp_path):
+    """X-Profile başlıklı istek profilleniyor mu, profil yönetici endpoint'lerinden listelenip indirilebiliyor mu?"""
+    import time
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.middleware.profiling import ProfilingMiddleware, profile_store
+    from app.services import auth_service
+
+    monkeypatch.setattr(profile_store, "directory", str(tmp_path))
+    mini = FastAPI()
+    mini.add_middleware(ProfilingMiddleware, store=profile_store, token="gizli", sample_rate=0, interval_ms=1)
+
+    def busy_work():
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            pass
+
+    @mini.get("/items/{item_id}")
+    def slow_endpoint(item_id: int):
+        busy_work()
+        return {"id": item_id}
+
+    mini_client = TestClient(mini)
+    assert "x-profile-id" not in mini_client.get("/items/1").headers
+    assert "x-profile-id" not in mini_client.get("/items/1", headers={"X-Profile": "yanlis"}).headers
+    profiled = mini_client.get("/items/2", headers={"X-Profile": "gizli", "X-Request-ID": "istek-42"})
+    profile_id = profiled.headers["x-profile-id"]
+
+    headers = _auth_headers()
+    assert client.get("/api/system/profiles", headers=headers).status_code == 403
+    me = client.get("/api/users/me", headers=headers).json()
+    monkeypatch.setattr(auth_service, "ADMIN_EMAILS", [me["email"].lower()])
+
+    profiles = client.get("/api/system/profiles", headers=headers).json()
+    assert profiles[0]["id"] == profile_id
+    assert profiles[0]["route"] == "/items/{item_id}" and profiles[0]["request_id"] == "istek-42"
+    assert profiles[0]["samples"] > 0
+
+    folded = client.get(f"/api/system/profiles/{profile_id}", headers=headers).text
+    lines = folded.strip().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("busy_work (test_api.py:" in line for line in lines)
+    assert client.get("/api/system/profiles/..%2Fsecret", headers=headers).status_code == 404
+
+
+def test_seed_database_is_reproducible():
+    """Sentetik veri üretici aynı seed ile aynı veriyi üretir; görevler proje üyelerine atanır."""
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+    from app.database import Base
+    from app.models import Task, ProjectMember
+    from app.seed import SeedConfig, seed_database
+
+    config = SeedConfig(users=40, projects=6, tasks_per_project=15, notifications_per_user=3, seed=7, batch_size=50)
+    snapshots = []
+    for _ in range(2):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        result = seed_database(engine, config)
+        assert result.counts["users"] == 40 and result.counts["projects"] == 6
+        assert result.counts["tasks"] > 0 and result.counts["notifications"] > 0
+        with engine.connect() as conn:
+            snapshots.append(conn.execute(text(
+                "SELECT id, title, status, priority, category, story_points, due_date, assignee_id FROM tasks ORDER BY id"
+            )).all())
+        with Session(engine) as db:
+            tasks = db.query(Task).all()
+            members = {(m.project_id, m.user_id) for m in db.query(ProjectMember).all()}
+            # Enum'lar ORM üzerinden okunabilir, atananlar projenin üyesidir
+            assert {t.status.value for t in tasks} <= {"beklemede", "yapılıyor", "tamamlandı"}
+            assert all((t.project_id, t.assignee_id) in members for t in tasks if t.assignee_id)
+            assert all(t.completed_at for t in tasks if t.status.value == "tamamlandı")
+    assert snapshots[0] == snapshots[1]
+
+
+def test_rate_limit_middleware():
+    """Kural başına IP/kullanıcı kovası dolunca 429 + Retry-After döner; diğer yollar etkilenmez."""
+    import time
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.middleware.rate_limit import (
+        RateLimiter, RateLimitMiddleware, MemoryRateLimitBackend, parse_rules,
+    )
+    from app.services.auth_service import create_access_token
+
+    rules = parse_rules("POST /login ip=3/60; WRITE /items/* user=2/60 ip=100/60")
+    assert [r.name for r in rules] == ["POST /login", "WRITE /items/*"]
+    backend = MemoryRateLimitBackend(max_keys=100, sweep_seconds=60)
+    limiter = RateLimiter(rules, backend=backend, enabled=True, exempt_clients=())
+
+    mini = FastAPI()
+    mini.add_middleware(RateLimitMiddleware, limiter=limiter)
+
+    @mini.post("/login")
+    def login():
+        return {"ok": True}
+
+    @mini.post("/items/{item_id}")
+    def write_item(item_id: int):
+        return {"id": item_id}
+
+    @mini.get("/items/{item_id}")
+    def read_item(item_id: int):
+        return {"id": item_id}
+
+    mini_client = TestClient(mini)
+    assert [mini_client.post("/login").status_code for _ in range(4)] == [200, 200, 200, 429]
+    limited = mini_client.post("/login")
+    assert limited.status_code == 429 and int(limited.headers["retry-after"]) >= 1
+
+    alice = {"Authorization": f"Bearer {create_access_token({'sub': 'alice@example.com'})}"}
+    bob = {"Authorization": f"Bearer {create_access_token({'sub': 'bob@example.com'})}"}
+    assert [mini_client.post("/items/1", headers=alice).status_code for _ in range(3)] == [200, 200, 429]
+    # Kullanıcı kovası ayrı; okuma istekleri kurala uymaz
+    assert mini_client.post("/items/1", headers=bob).status_code == 200
+    assert all(mini_client.get("/items/1", headers=alice).status_code == 200 for _ in range(5))
+
+    stats = limiter.stats()
+    assert stats["limited"] == 3 and stats["tracked_keys"] == backend.size() > 0
+
+    # Dolmuş kovalar süpürmede silinir
+    backend._sweep(time.monotonic() + 3600)
+    assert backend.size() == 0 and backend.evictions > 0
+
+    # Sınıra ulaşınca en uzun süredir kullanılmayan kovalar alt seviyeye kadar toplu atılır
+    lru = MemoryRateLimitBackend(max_keys=4, sweep_seconds=3600, low_water_ratio=0.5)
+    for key in ("a", "b", "c", "a", "d", "e"):
+        lru.hit([(key, 1 / 60, 10.0)])
+    assert list(lru._buckets) == ["a", "d", "e"] and lru.evictions == 2
+
+
+def test_project_activity_feed():
+    """Görev/üye olayları aynı commit'te kaydediliyor ve akış keyset sayfalı dönüyor mu?"""
+    owner = _auth_headers()
+    other = _auth_headers()
+    other_email = client.get("/api/users/me", headers=other).json()["email"]
+    project_id = client.post("/api/projects/", json={"name": "Aktivite"}, headers=owner).json()["id"]
+    client.post(f"/api/projects/{project_id}/members", json={"email": other_email}, headers=owner)
+
+    task = client.post(f"/api/projects/{project_id}/tasks", json={"title": "İlk görev"}, headers=owner).json()
+    client.put(f"/api/tasks/{task['id']}/status", json={"status": "tamamlandı"}, headers=other)
+    # Değişiklik içermeyen güncelleme olay üretmez
+    client.put(f"/api/tasks/{task['id']}", json={"title": "İlk görev"}, headers=owner)
+    client.delete(f"/api/tasks/{task['id']}", headers=owner)
+
+    feed = client.get(f"/api/projects/{project_id}/activity", headers=owner)
+    assert feed.status_code == 200
+    events = [item["event"] for item in feed.json()["items"]]
+    assert events == ["task.deleted", "task.updated", "task.created", "member.added", "project.created"]
+    updated = feed.json()["items"][1]
+    assert updated["details"]["changes"]["status"] == ["beklemede", "tamamlandı"]
+    assert updated["actor"]["email"] == other_email
+
+    # Yeni olay yoksa 304
+    assert client.get(f"/api/projects/{project_id}/activity", headers={
+        **owner, "If-None-Match": feed.headers["etag"]}).status_code == 304
+
+    # Keyset sayfalama: sayfalar örtüşmeden tüm olayları kapsar
+    first = client.get(f"/api/projects/{project_id}/activity?limit=2", headers=owner).json()
+    second = client.get(f"/api/projects/{project_id}/activity?limit=2&before_id={first['next_cursor']}", headers=owner).json()
+    third = client.get(f"/api/projects/{project_id}/activity?limit=2&before_id={second['next_cursor']}", headers=owner).json()
+    assert [i["event"] for i in first["items"] + second["items"] + third["items"]] == events
+    assert third["next_cursor"] is None
+
+    # Üye olmayan kullanıcı akışı göremez
+    assert client.get(f"/api/projects/{project_id}/activity", headers=_auth_headers()).status_code in (403, 404)
+
+
+def test_project_overview_single_request():
+    """Özet endpoint'i ayrı proje/görev/skor yanıtlarıyla aynı veriyi sabit sayıda sorguyla döndürüyor mu?"""
+    from sqlalchemy import event
+    from app.database import engine
+
+    headers = _auth_headers()
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def overview_queries(project_id):
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            response = client.get(f"/api/projects/{project_id}/overview", headers=headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        assert response.status_code == 200
+        return response.json(), len(statements)
+
+    small = client.post("/api/projects/", json={"name": "Küçük"}, headers=headers).json()["id"]
+    large = client.post("/api/projects/", json={"name": "Büyük"}, headers=headers).json()["id"]
+    client.post(f"/api/projects/{small}/tasks", json={"title": "Tek"}, headers=headers)
+    for i in range(12):
+        client.post(f"/api/projects/{large}/tasks", json={
+            "title": f"Görev {i}", "story_points": 1 + i % 5, "priority": "Yüksek",
+            "due_date": "2020-01-01T00:00:00",
+        }, headers=headers)
+
+    overview, large_queries = overview_queries(large)
+    _, small_queries = overview_queries(small)
+    # kullanıcı + üyelik kontrolü + proje/üyeler + görevler
+    assert large_queries == small_queries == 4
+
+    assert overview["my_role"] == "admin"
+    assert overview["project"] == client.get(f"/api/projects/{large}", headers=headers).json()
+    assert overview["tasks"] == client.get(f"/api/projects/{large}/tasks", headers=headers).json()
+    assert overview["stats"] == client.get(f"/api/projects/{large}/scores", headers=headers).json()
+    assert overview["stats"]["overdue_tasks"] == 12
+
+    assert client.get(f"/api/projects/{large}/overview", headers=_auth_headers()).status_code == 403
+
+
+def test_sparse_fieldsets():
+    """fields= parametresi hem SELECT kolonlarını hem yanıtı istenen alanlarla sınırlıyor mu?"""
+    from sqlalchemy import event
+    from app.database import engine
+
+    headers = _auth_headers()
+    project_id = client.post("/api/projects/", json={"name": "Alanlar"}, headers=headers).json()["id"]
+    me = client.get("/api/users/me", headers=headers).json()
+    client.post(f"/api/projects/{project_id}/tasks", json={
+        "title": "Seçici", "description": "uzun açıklama " * 50, "assignee_id": me["id"]}, headers=headers)
+    client.post("/api/notes/", json={"title": "Not", "content": "içerik " * 100}, headers=headers)
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        tasks = client.get(f"/api/projects/{project_id}/tasks?fields=title,status", headers=headers).json()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    # 'id' her zaman eklenir; açıklama kolonu SQL'e hiç girmez
+    assert tasks == [{"id": tasks[0]["id"], "title": "Seçici", "status": "beklemede"}]
+    assert not any("tasks.description" in s for s in statements)
+
+    my_tasks = client.get("/api/tasks/my-tasks?fields=title,project", headers=headers).json()
+    assert my_tasks[0]["project"] == {"id": project_id, "name": "Alanlar"}
+    assert set(my_tasks[0]) == {"id", "title", "project"}
+    assert set(client.get("/api/tasks/my-tasks?fields=title", headers=headers).json()[0]) == {"id", "title"}
+
+    projects = client.get("/api/projects/?fields=name", headers=headers).json()
+    assert {"id": project_id, "name": "Alanlar"} in projects
+    with_members = client.get("/api/projects/?fields=name,memberships", headers=headers).json()
+    assert next(p for p in with_members if p["id"] == project_id)["memberships"][0]["user"]["id"] == me["id"]
+
+    notes = client.get("/api/notes/?fields=title,version", headers=headers).json()
+    assert notes == [{"id": notes[0]["id"], "title": "Not", "version": 1}]
+
+    notifications = client.get("/api/notifications/?fields=title,is_read", headers=headers).json()
+    assert notifications and set(notifications[0]) == {"id", "title", "is_read"}
+
+    # Alan verilmezse tam şema, bilinmeyen alanda 400
+    assert "description" in client.get(f"/api/projects/{project_id}/tasks", headers=headers).json()[0]
+    bad = client.get(f"/api/projects/{project_id}/tasks?fields=title,password", headers=headers)
+    assert bad.status_code == 400 and "password" in bad.json()["detail"]
@@ -5,7 +5,6 @@ import {
     BarChart, Bar, XAxis, YAxis, CartesianGrid 
 } from 'recharts';
 import projectService from '@/services/projectService';
-import taskService from '@/services/taskService';
 import userService from '@/services/userService';
 import MainLayout from '@/components/MainLayout';
 
@@ -37,10 +36,8 @@ function ProjectAnalysisPage() {
         const loadData = async () => {
             setIsLoading(true);
             try {
-                const [projectData, tasksData] = await Promise.all([
-                    projectService.getProjectById(projectId),
-                    taskService.getTasksForProject(projectId)
-                ]);
+                // Proje ve görevler tek istekte (tek yetki kontrolü)
+                const { project: projectData, tasks: tasksData } = await projectService.getProjectOverview(projectId);
 
                 setProject(projectData);
 
@@ -112,37 +112,25 @@ function ProjectDetailPage() {
 
     useEffect(() => {
         if (!projectId) return; 
-        const fetchProjectDetails = async () => {
+        // Proje ve görevler tek istekte (tek yetki kontrolü, tek sorgu turu)
+        const fetchOverview = async () => {
             setIsLoadingProject(true); 
+            setIsLoadingTasks(true);
             setError(null);
             try {
-                const projectData = await projectService.getProjectById(projectId);
-                setProject(projectData);
+                const overview = await projectService.getProjectOverview(projectId);
+                setProject(overview.project);
+                setTasks(overview.tasks);
             } catch (err) {
                  console.error("Proje Detay hatası:", err);
                  if (err.response && err.response.status === 403) setError("Bu projeyi görüntüleme yetkiniz yok.");
                  else setError("Proje yüklenirken bir hata oluştu.");
             } finally {
                 setIsLoadingProject(false); 
-            }
-        };
-        fetchProjectDetails(); 
-    }, [projectId, navigate, refreshTrigger]); 
-    
-    useEffect(() => {
-        if (!projectId) return; 
-        const fetchTasks = async () => {
-            setIsLoadingTasks(true);
-            try {
-                const tasksData = await taskService.getTasksForProject(projectId);
-                setTasks(tasksData);
-            } catch (err) {
-                 console.error("Görev hatası:", err);
-            } finally {
                 setIsLoadingTasks(false);
             }
         };
-        fetchTasks();
+        fetchOverview(); 
     }, [projectId, navigate, refreshTrigger]); 
 
     const handleDataChanged = () => { setRefreshTrigger(prev => prev + 1); };
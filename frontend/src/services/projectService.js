@@ -17,6 +17,12 @@ const getProjectById = async (projectId) => {
     return response.data;
 };
 
+// Proje + üyeler + pano görevleri + skorlar tek istekte
+const getProjectOverview = async (projectId) => {
+    const response = await api.get(`/api/projects/${projectId}/overview`);
+    return response.data;
+};
+
 const addMemberToProject = async (projectId, inviteData) => {
     const response = await api.post(`/api/projects/${projectId}/members`, inviteData);
     return response.data; 
@@ -51,6 +57,7 @@ export default {
     getProjects,
     createProject,
     getProjectById,
+    getProjectOverview,
     addMemberToProject,
     updateProject, 
     deleteProject,